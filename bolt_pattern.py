@@ -0,0 +1,50 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+bolt_pattern.py — Hole centres of an N-bolt pattern in the P1 half plate
+
+Rows are along the load (x) direction, myPitch apart, the first row at the
+hole of the single-bolt model (myEndLength from the loaded end). Gauge lines
+are myGauge apart and symmetric about y = 0, the plate's symmetry plane:
+with an odd myBoltGauges one line lies on y = 0 (half holes, as in the
+single-bolt model), with an even count the innermost lines are at +-myGauge/2.
+Only the lines with y >= 0 are in the model.
+
+Run with:
+python bolt_pattern.py
+"""
+
+#------------------------------------------------------------------------------
+
+def Bolt_Pattern(rows, gauges, pitch, gauge, ax=0.0, ay=0.0):
+    # [(x, y)] hole centres in the half model, row by row
+    rows, gauges = int(rows), int(gauges)
+    if rows < 1 or gauges < 1:
+        raise ValueError("Bolt pattern needs at least one row and one gauge line")
+    if gauges % 2:
+        lines = [k*gauge for k in range((gauges + 1)//2)]
+    else:
+        lines = [(k + 0.5)*gauge for k in range(gauges//2)]
+    return [(ax + i*pitch, ay + y) for i in range(rows) for y in lines]
+
+#------------------------------------------------------------------------------
+
+def Check_Bolt_Pattern(holes, adia, endL, phalfheight, plength, ay=0.0):
+    # Holes must stay inside the plate and apart from each other and y = 0
+    r = adia/2.0
+    for x, y in holes:
+        if x - r <= -endL or x + r >= plength - endL or y + r >= ay + phalfheight:
+            raise ValueError("Bolt hole at (%g, %g) does not fit in the plate" % (x, y))
+        if y != ay and y - r <= ay:
+            raise ValueError("Bolt hole at (%g, %g) cuts the symmetry plane" % (x, y))
+    for i, (x1, y1) in enumerate(holes):
+        for x2, y2 in holes[i + 1:]:
+            if (x1 - x2)**2 + (y1 - y2)**2 <= adia**2:
+                raise ValueError("Bolt holes at (%g, %g) and (%g, %g) overlap" % (x1, y1, x2, y2))
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    from p1_core import Default_Inputs, Model_Holes
+    for myHole in Model_Holes(Default_Inputs()):
+        print('%g %g' % myHole)
@@ -0,0 +1,120 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+curve_capacity.py — Yield / ultimate load and deformation capacity of many curves
+
+Works on a batch of load–displacement curves stored as NaN-padded 2-D arrays
+(one curve per row) and evaluates every curve at once:
+
+  stiffness      secant stiffness between 10% and 40% of the ultimate load
+                 (the toe is removed by shifting the line through 10%)
+  yield          first crossing of the curve below the initial-stiffness line
+                 offset by myYieldOffset
+  ultimate       maximum load and its displacement
+  capacity       displacement where the load has dropped myPostPeakDrop below
+                 the ultimate (last point if it never does)
+  ductility      capacity displacement / yield displacement
+
+Run with:
+python curve_capacity.py P1_00001_rp1.npz P1_00002_rp1.npz ... > capacity.csv
+"""
+
+import csv
+import os
+import sys
+
+import numpy as np
+
+#------------------------------------------------------------------------------
+
+myYieldOffset = 0.2           #mm, offset of the initial-stiffness line
+myStiffnessRange = (0.1, 0.4) #fractions of the ultimate load
+myPostPeakDrop = 0.2          #load drop that defines the deformation capacity
+
+myCapacityColumns = ('stiffness', 'yield_load', 'yield_disp', 'ultimate_load',
+    'ultimate_disp', 'capacity_disp', 'ductility')
+
+#------------------------------------------------------------------------------
+
+def Pad_Curves(curves):
+    # [(disp, load), ...] of any lengths -> NaN-padded (m, n) arrays
+    n = max(len(d) for d, p in curves)
+    D = np.full((len(curves), n), np.nan)
+    P = np.full((len(curves), n), np.nan)
+    for i, (d, p) in enumerate(curves):
+        D[i, :len(d)] = d
+        P[i, :len(p)] = p
+    return D, P
+
+#------------------------------------------------------------------------------
+
+def First_Crossing(D, F, mask):
+    # Displacement where F first becomes >= 0 inside mask, linearly
+    # interpolated from the previous point; NaN where it never does
+    hit = mask & (F >= 0)
+    found = hit.any(axis=1)
+    i = np.argmax(hit, axis=1)
+    rows = np.arange(D.shape[0])
+    j = np.maximum(i - 1, 0)
+    f0, f1 = F[rows, j], F[rows, i]
+    d0, d1 = D[rows, j], D[rows, i]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.where((i > 0) & (f1 != f0), -f0/(f1 - f0), 1.0)
+    t = np.clip(np.where(f0 >= 0, 1.0, t), 0.0, 1.0)
+    return np.where(found, d0 + t*(d1 - d0), np.nan), i, t, found
+
+#------------------------------------------------------------------------------
+
+def Curve_Capacity(D, P, offset=myYieldOffset, stiffness_range=myStiffnessRange, post_peak_drop=myPostPeakDrop):
+    """Evaluate a batch of curves; D, P are (m, n) arrays padded with NaN.
+
+    offset may be a scalar or one value per curve. Returns a dict of (m,)
+    arrays keyed by myCapacityColumns.
+    """
+    D = np.asarray(D, dtype=float)
+    P = np.asarray(P, dtype=float)
+    valid = ~(np.isnan(D) | np.isnan(P))
+    Pz = np.where(valid, P, -np.inf)
+    rows = np.arange(D.shape[0])
+    col = np.arange(D.shape[1])[np.newaxis, :]
+
+    iu = np.argmax(Pz, axis=1)
+    Pu = P[rows, iu]
+    du = D[rows, iu]
+    before = valid & (col <= iu[:, np.newaxis])
+    after = valid & (col >= iu[:, np.newaxis])
+
+    lo, hi = stiffness_range
+    d_lo = First_Crossing(D, P - lo*Pu[:, np.newaxis], before)[0]
+    d_hi = First_Crossing(D, P - hi*Pu[:, np.newaxis], before)[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        K = (hi - lo)*Pu/(d_hi - d_lo)
+    d0 = d_lo - lo*Pu/K
+
+    # offset line K*(d - d0 - offset) overtakes the curve at the yield point
+    offset = np.asarray(offset, dtype=float)*np.ones(D.shape[0])
+    F = K[:, np.newaxis]*(D - d0[:, np.newaxis] - offset[:, np.newaxis]) - P
+    dy, iy, ty, found = First_Crossing(D, F, before)
+    j = np.maximum(iy - 1, 0)
+    Py = np.where(found, P[rows, j] + ty*(P[rows, iy] - P[rows, j]), np.nan)
+
+    dc, ic, tc, dropped = First_Crossing(D, (1.0 - post_peak_drop)*Pu[:, np.newaxis] - P, after)
+    last = valid.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    dc = np.where(dropped, dc, D[rows, last])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ductility = dc/dy
+    return {'stiffness': K, 'yield_load': Py, 'yield_disp': dy, 'ultimate_load': Pu,
+        'ultimate_disp': du, 'capacity_disp': dc, 'ductility': ductility}
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    from odb_extract import Load_Displacement, Read_Curve
+    myFiles = sys.argv[1:]
+    myCurves = [Load_Displacement(Read_Curve(f)[0]) for f in myFiles]
+    myResult = Curve_Capacity(*Pad_Curves(myCurves))
+    myWriter = csv.writer(sys.stdout, lineterminator='\n')
+    myWriter.writerow(('curve',) + myCapacityColumns)
+    for myIndex, myFile in enumerate(myFiles):
+        myWriter.writerow([os.path.basename(myFile)] + ['%.6g' % myResult[c][myIndex] for c in myCapacityColumns])
@@ -0,0 +1,175 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+damage_locus.py — Ductile and shear damage-initiation tables from fracture loci
+
+The plate's *Damage Initiation tables, for one material or a batch:
+
+  ductile  fracture strain against stress triaxiality η = -p/q, from a
+           Johnson–Cook locus  D1 + D2 exp(D3 η)  or a Rice–Tracey locus
+           exp(-1.5 η)
+  shear    fracture strain against the shear stress ratio
+           θs = (q + ks p)/τmax, from the Hooputra locus between
+           equibiaxial compression and tension
+
+              ε(θs) = [ε+ sinh(f (θs - θ-)) + ε- sinh(f (θ+ - θs))]
+                      / sinh(f (θ+ - θ-)),   θ± = (1 ∓ ks 2/3)/φ, φ = 0.5
+
+Each locus gives the shape; its level follows the material: the ductile
+locus is scaled so the fracture strain in uniaxial tension (η = 1/3) is the
+true strain at rupture ln(1 + Ɛr/100), and the shear locus so its value in
+pure shear (θs = √3) is the ductile one at η = 0. Every argument may be a
+scalar or an array; the tables have shape broadcast(arguments) + (points, 3),
+rows (fracture strain, η or θs, strain rate) in ascending η or θs.
+
+myDamageLocus selects the tables of a model: 0 keeps the fixed tables below
+(or a grade's stored tables, see material_library.py, which are these loci
+at the grade's Ɛr), 1 Johnson–Cook and 2 Rice–Tracey, each with the
+Hooputra shear table, at myDamagePoints rows.
+
+Run with:
+python damage_locus.py
+python damage_locus.py --benchmark
+"""
+
+import math
+import sys
+import time
+
+import numpy as np
+
+#------------------------------------------------------------------------------
+
+# Plate damage initiation (fracture strain, stress triaxiality, strain rate)
+myDuctileDamageTable = (
+    (4.0, -0.33, 0.0),
+    (2.4, 0.05, 0.0),
+    (1.6, 0.1, 0.0),
+    (0.402277608, 0.15, 0.0))
+
+# Plate shear damage initiation (fracture strain, shear stress ratio, strain rate)
+myShearDamageKs = -0.2
+myShearDamageTable = (
+    (3.0, 1.65, 0.0),
+    (0.901, 1.731, 0.0),
+    (0.9, 1.732, 0.0),
+    (0.901, 1.733, 0.0),
+    (3.0, 1.8, 0.0))
+
+# Locus shapes (the level is set by the material's rupture strain)
+myJohnsonCook = (0.0705, 1.732, -0.54)   #D1, D2, D3 (Weldox 460E)
+myHooputra = (1.0, 1.0, 4.5, 0.3)        #ε+, ε-, f, ks
+myTriaxialityRange = (-1.0/3.0, 1.0)     #η of the ductile table
+myDamageLoci = {1: 'johnson_cook', 2: 'rice_tracey'}
+
+#------------------------------------------------------------------------------
+
+def Johnson_Cook_Locus(eta, d1, d2, d3):
+    return d1 + d2*np.exp(d3*eta)
+
+#------------------------------------------------------------------------------
+
+def Rice_Tracey_Locus(eta):
+    return np.exp(-1.5*eta)
+
+#------------------------------------------------------------------------------
+
+def Rupture_Strain(sr):
+    # true strain at rupture from Ɛr (%)
+    return np.log1p(np.asarray(sr, dtype=float)/100.0)
+
+#------------------------------------------------------------------------------
+
+def Ductile_Locus(eta, locus='johnson_cook', params=myJohnsonCook):
+    if locus == 'johnson_cook':
+        return Johnson_Cook_Locus(eta, *[np.asarray(p, dtype=float)[..., np.newaxis] for p in params])
+    if locus == 'rice_tracey':
+        return Rice_Tracey_Locus(eta)
+    raise ValueError("Unknown ductile fracture locus: %r" % locus)
+
+#------------------------------------------------------------------------------
+
+def Ductile_Damage_Tables(fracture_strain, locus='johnson_cook', params=myJohnsonCook, points=8,
+        eta_range=myTriaxialityRange, strain_rate=0.0):
+    # fracture_strain is the level in uniaxial tension (η = 1/3)
+    fracture_strain = np.asarray(fracture_strain, dtype=float)[..., np.newaxis]
+    eta = np.linspace(eta_range[0], eta_range[1], int(points))
+    shape = Ductile_Locus(eta, locus, params)/Ductile_Locus(np.array([1.0/3.0]), locus, params)
+    strain = fracture_strain*shape
+    table = np.empty(strain.shape + (3,))
+    table[..., 0] = strain
+    table[..., 1] = eta
+    table[..., 2] = strain_rate
+    return table
+
+#------------------------------------------------------------------------------
+
+def Hooputra_Locus(theta, eps_plus, eps_minus, f, theta_plus, theta_minus):
+    return (eps_plus*np.sinh(f*(theta - theta_minus)) + eps_minus*np.sinh(f*(theta_plus - theta)))/np.sinh(f*(theta_plus - theta_minus))
+
+#------------------------------------------------------------------------------
+
+def Shear_Damage_Tables(shear_strain, params=myHooputra, points=8, phi=0.5, strain_rate=0.0):
+    # shear_strain is the level in pure shear (θs = √3); returns (tables, ks)
+    eps_plus, eps_minus, f, ks = [np.asarray(p, dtype=float)[..., np.newaxis] for p in params]
+    theta_plus = (1.0 - ks*2.0/3.0)/phi
+    theta_minus = (1.0 + ks*2.0/3.0)/phi
+    u = np.linspace(0.0, 1.0, int(points))
+    theta = np.minimum(theta_plus, theta_minus) + u*np.abs(theta_plus - theta_minus)
+    shape = Hooputra_Locus(theta, eps_plus, eps_minus, f, theta_plus, theta_minus)
+    shape /= Hooputra_Locus(math.sqrt(3.0), eps_plus, eps_minus, f, theta_plus, theta_minus)
+    strain = np.asarray(shear_strain, dtype=float)[..., np.newaxis]*shape
+    table = np.empty(np.broadcast(strain, theta).shape + (3,))
+    table[..., 0] = strain
+    table[..., 1] = theta
+    table[..., 2] = strain_rate
+    return table, np.asarray(params[3], dtype=float)
+
+#------------------------------------------------------------------------------
+
+def Damage_Tables(sr, locus='johnson_cook', points=8, ductile_params=myJohnsonCook, shear_params=myHooputra):
+    # (ductile tables, shear ks, shear tables) of materials with rupture strain Ɛr (%)
+    fracture_strain = Rupture_Strain(sr)
+    ductile = Ductile_Damage_Tables(fracture_strain, locus, ductile_params, points)
+    level_0 = fracture_strain*(Ductile_Locus(np.array([0.0]), locus, ductile_params)
+        /Ductile_Locus(np.array([1.0/3.0]), locus, ductile_params))[..., 0]
+    shear, ks = Shear_Damage_Tables(level_0, shear_params, points)
+    return ductile, ks, shear
+
+#------------------------------------------------------------------------------
+
+def Damage_Table_Rows(table):
+    # One material's table as the tuple of tuples expected by *DamageInitiation
+    return tuple((round(float(e), 9), round(float(x), 9), float(r)) for e, x, r in table)
+
+#------------------------------------------------------------------------------
+
+def Model_Damage_Tables(myInputs):
+    # (ductile rows, shear ks, shear rows) of a model, or None for the fixed
+    # or stored tables (myDamageLocus = 0)
+    locus = int(myInputs['myDamageLocus'])
+    if locus == 0:
+        return None
+    if locus not in myDamageLoci:
+        raise ValueError("Unknown myDamageLocus %d (0, %s)" % (locus, ', '.join(
+            '%d: %s' % kv for kv in sorted(myDamageLoci.items()))))
+    ductile, ks, shear = Damage_Tables(myInputs['MySr'], myDamageLoci[locus], int(myInputs['myDamagePoints']))
+    return Damage_Table_Rows(ductile), float(ks), Damage_Table_Rows(shear)
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        mySr = np.random.RandomState(0).uniform(5.0, 30.0, 200000)
+        myStart = time.time()
+        myDuctile, myKs, myShear = Damage_Tables(mySr)
+        print('%d ductile and shear tables of %d rows in %.3f s' % (len(mySr), myDuctile.shape[-2], time.time() - myStart))
+        sys.exit(0)
+    from p1_core import Default_Inputs
+    myInputs = Default_Inputs()
+    for myLocus in sorted(myDamageLoci):
+        myInputs['myDamageLocus'] = myLocus
+        myDuctile, myKs, myShear = Model_Damage_Tables(myInputs)
+        print('%s (Ɛr = %g%%)' % (myDamageLoci[myLocus], myInputs['MySr']))
+        print('  ductile: ' + ', '.join('(%.4g, %.3g)' % r[:2] for r in myDuctile))
+        print('  shear (ks = %g): ' % myKs + ', '.join('(%.4g, %.4g)' % r[:2] for r in myShear))
@@ -0,0 +1,223 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+deck_cache.py — Content-addressed cache of written .inp decks
+
+A deck is keyed on a SHA-256 of everything that goes into it: every input in
+sweep.myInputNames (geometry, material, friction, mesh sizes, step settings),
+the plastic and damage tables actually written (and the bolt's, with a
+bolt grade from material_library.py), and the writer that made it.
+Hits are copied out without rebuilding the model; the cache directory is kept
+under a size cap by evicting the least recently used decks.
+
+Sizes and last uses are kept in <cache>/index.log, one appended line per
+store, hit or eviction, so a store costs the same with 5 or 5,000 decks in
+the cache. Each process replays the log once and then reads only the lines
+other processes appended since. The cache tree is walked only to rebuild a
+missing log. A log of mostly superseded lines is rewritten with one line per
+deck under a new header line; a process whose log was rewritten under it
+sees the header change and replays the new log from the start.
+
+Run with:
+abaqus cae noGUI=P1.py -- --sweep sweep.csv --cache deck_cache
+python native_inp.py --sweep sweep.csv --cache deck_cache --cache-max-gb 20
+"""
+
+import hashlib
+import heapq
+import io
+import json
+import os
+import shutil
+import time
+
+from output_profile import myOutputProfiles
+from material_library import Bolt_Tables, Plate_Tables
+from sweep import myInputNames
+
+#------------------------------------------------------------------------------
+
+myDeckFormatVersion = 5            #bump when a writer changes its output
+myCacheMaxBytes = 10*1024**3       #default LRU size cap (10 GB)
+myCacheIndexFile = 'index.log'
+myCacheIndexes = {}                #cache directory -> this process's index
+
+#------------------------------------------------------------------------------
+
+def Deck_Key(myInputs, writer, output=None):
+    myPlastic, myDuctileDamage, myShearKs, myShearDamage = Plate_Tables(myInputs)
+    record = {
+        'version': myDeckFormatVersion,
+        'writer': writer,
+        'output': output or myOutputProfiles['full'],
+        'inputs': dict((n, float(myInputs[n])) for n in myInputNames),
+        'plastic': myPlastic,
+        'ductile_damage': myDuctileDamage,
+        'shear_damage': (myShearKs, myShearDamage)}
+    if myInputs.get('bolt_material'):
+        record['bolt'] = Bolt_Tables(myInputs)
+    text = json.dumps(record, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+#------------------------------------------------------------------------------
+
+def Cache_Path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key + '.inp')
+
+#------------------------------------------------------------------------------
+
+def Cache_Fetch(cache_dir, key, deck_path):
+    # Copy a cached deck to deck_path; returns False on a miss
+    path = Cache_Path(cache_dir, key)
+    if not os.path.isfile(path):
+        return False
+    shutil.copyfile(path, deck_path)
+    os.utime(path, None)   #mark as recently used
+    Append_Index(cache_dir, key, os.path.getsize(path))
+    return True
+
+#------------------------------------------------------------------------------
+
+def Cache_Store(cache_dir, key, deck_path, max_bytes=myCacheMaxBytes):
+    path = Cache_Path(cache_dir, key)
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    shutil.copyfile(deck_path, tmp)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(tmp, path)
+    Append_Index(cache_dir, key, os.path.getsize(path))
+    Cache_Evict(cache_dir, max_bytes)
+
+#------------------------------------------------------------------------------
+
+def Append_Index(cache_dir, key, size, used=None):
+    # One index.log line: last use, size (-1: evicted), key; a cache without
+    # a log gets one from its decks first
+    if cache_dir not in myCacheIndexes:
+        Cache_Index(cache_dir)
+    with open(os.path.join(cache_dir, myCacheIndexFile), 'a') as f:
+        f.write('%.6f %d %s\n' % (time.time() if used is None else used, size, key))
+
+#------------------------------------------------------------------------------
+
+def Write_Index(cache_dir, entries):
+    # Replace index.log with [(last use, size, key)] under a header line that
+    # tells other processes the log was rewritten
+    path = os.path.join(cache_dir, myCacheIndexFile)
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'w') as f:
+        f.write('# index.log written %.6f by process %d\n' % (time.time(), os.getpid()))
+        f.writelines('%.6f %d %s\n' % e for e in entries)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(tmp, path)
+
+#------------------------------------------------------------------------------
+
+def Scan_Cache(cache_dir):
+    # (last use, size, key) of every deck on disk, for a missing index.log
+    entries = []
+    for root, dirs, files in os.walk(cache_dir):
+        for name in files:
+            if name.endswith('.inp'):
+                st = os.stat(os.path.join(root, name))
+                entries.append((st.st_mtime, st.st_size, name[:-len('.inp')]))
+    return sorted(entries)
+
+#------------------------------------------------------------------------------
+
+def Read_Index_Lines(index, path):
+    # Apply the index.log lines appended since the last call; a log rewritten
+    # since (new header, or shorter than what was read) is replayed whole
+    with io.open(path, 'rb') as f:
+        header = f.readline()
+        header = header if header.startswith(b'#') else b''
+        f.seek(0, 2)
+        if header != index['header'] or f.tell() < index['offset']:
+            index.update({'entries': {}, 'total': 0, 'heap': [], 'offset': 0, 'lines': 0, 'header': header})
+        f.seek(index['offset'])
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    index['offset'] += end
+    for line in data[:end].decode('ascii').splitlines():
+        if line.startswith('#'):
+            continue
+        used, size, key = line.split()
+        used, size = float(used), int(size)
+        old = index['entries'].pop(key, None)
+        if old is not None:
+            index['total'] -= old[1]
+        if size >= 0:
+            index['entries'][key] = (used, size)
+            index['total'] += size
+            heapq.heappush(index['heap'], (used, key))
+        index['lines'] += 1
+
+#------------------------------------------------------------------------------
+
+def Cache_Index(cache_dir):
+    # {'entries': {key: (last use, size)}, 'total', 'heap', ...} of the cache,
+    # up to date with every line appended so far
+    path = os.path.join(cache_dir, myCacheIndexFile)
+    index = myCacheIndexes.get(cache_dir)
+    if index is None:
+        if not os.path.isfile(path):
+            Write_Index(cache_dir, Scan_Cache(cache_dir))
+        index = {'entries': {}, 'total': 0, 'heap': [], 'offset': 0, 'lines': 0, 'header': None}
+        Read_Index_Lines(index, path)
+        if index['lines'] > 4*len(index['entries']) + 10000:
+            # mostly superseded lines: keep one per deck
+            Write_Index(cache_dir, sorted((u, s, k) for k, (u, s) in index['entries'].items()))
+            Read_Index_Lines(index, path)
+        myCacheIndexes[cache_dir] = index
+    else:
+        Read_Index_Lines(index, path)
+    return index
+
+#------------------------------------------------------------------------------
+
+def Cache_Evict(cache_dir, max_bytes=myCacheMaxBytes):
+    # Remove least recently used decks until the cache fits max_bytes
+    index = Cache_Index(cache_dir)
+    while index['total'] > max_bytes and index['heap']:
+        used, key = heapq.heappop(index['heap'])
+        if index['entries'].get(key, (None,))[0] != used:
+            continue   #used again since, or already evicted
+        try:
+            os.remove(Cache_Path(cache_dir, key))
+        except OSError:
+            pass       #evicted by another process
+        Append_Index(cache_dir, key, -1, used)
+        Read_Index_Lines(index, os.path.join(cache_dir, myCacheIndexFile))
+
+#------------------------------------------------------------------------------
+
+def Cache_Max_Bytes_From_Argv(argv):
+    # --cache-max-gb <size>
+    if '--cache-max-gb' in argv:
+        return int(float(argv[argv.index('--cache-max-gb') + 1])*1024**3)
+    return myCacheMaxBytes
+
+#------------------------------------------------------------------------------
+
+def Cache_Dir_From_Argv(argv):
+    # --cache <directory>
+    if '--cache' in argv:
+        return argv[argv.index('--cache') + 1]
+    return None
+
+#------------------------------------------------------------------------------
+
+def Write_Cached_Deck(cache_dir, key, deck_path, write_deck, max_bytes=myCacheMaxBytes):
+    # write_deck() builds the model and writes deck_path; it is only called on
+    # a miss. Returns True on a hit.
+    if cache_dir is not None and Cache_Fetch(cache_dir, key, deck_path):
+        return True
+    write_deck()
+    if cache_dir is not None:
+        Cache_Store(cache_dir, key, deck_path, max_bytes)
+    return False
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,163 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+deck_patch.py — Sweep variants patched into a template deck instead of rebuilt
+
+Rows of a sweep that differ only in material (MyFty, MyFtu, MySr, MyScu, myE,
+myPoisonRatio, myDensity, the damage locus and the material/bolt_material
+grades), friction (myFriction) or bolt displacement (myDisplacement) share
+the mesh, sets and surfaces. With --patch the first deck of each such group
+is built as usual and becomes the group's template; the other rows are
+copied from it byte range by byte range, replacing only
+
+  the *Material blocks         (written by native_inp.Material_Text)
+  the *Friction data line      (myFriction)
+  the RP-k, 1, 1 lines         (-myDisplacement, every bolt, Loading step)
+  the "** Job name" line       (the row's model name)
+
+so the node and element blocks stream through unchanged. The template is
+scanned once for the byte offsets of these lines. Works on decks from both
+writers (P1.py and native_inp.py).
+
+Run with:
+abaqus cae noGUI=P1.py -- --sweep sweep.csv --patch
+python native_inp.py --sweep sweep.csv --patch
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from native_inp import Material_Text
+from output_profile import myOutputProfiles
+from sweep import myInputNames
+
+#------------------------------------------------------------------------------
+
+# Inputs a variant may change without a new mesh
+myPatchInputs = ('myDensity', 'myE', 'myPoisonRatio', 'MyFtu', 'MyFty', 'MySr', 'MyScu',
+    'myFriction', 'myDisplacement', 'myDamageLocus', 'myDamagePoints')
+
+# Keywords that continue a *Material definition
+myMaterialKeywords = ('material', 'density', 'elastic', 'plastic', 'damage initiation', 'damage evolution')
+
+myCopyChunk = 16*1024**2
+
+myDisplacementLine = re.compile(br'^\s*(RP-\d+)\s*,\s*1\s*,\s*1\s*,\s*\S+\s*$')
+
+#------------------------------------------------------------------------------
+
+def Patch_From_Argv(argv):
+    # --patch
+    return '--patch' in argv
+
+#------------------------------------------------------------------------------
+
+def Template_Key(myInputs, writer, output=None):
+    # Rows with the same key differ only in patchable inputs
+    record = {
+        'writer': writer,
+        'output': output or myOutputProfiles['full'],
+        'inputs': dict((n, float(myInputs[n])) for n in myInputNames if n not in myPatchInputs)}
+    text = json.dumps(record, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+#------------------------------------------------------------------------------
+
+def Keyword(line):
+    # b'*Damage Initiation, criterion=DUCTILE' -> 'damage initiation'
+    if not line.startswith(b'*') or line.startswith(b'**'):
+        return None
+    return line[1:].split(b',')[0].strip().lower().decode('ascii', 'replace')
+
+#------------------------------------------------------------------------------
+
+def Template_Index(template_path):
+    # [(start, end, kind, line)] byte ranges to replace, in file order:
+    # 'heading', 'materials' (first *Material to the last of its data lines),
+    # 'friction' (the data line after *Friction) and 'displacement' (in the
+    # Loading step; a Closure step keeps its own)
+    index = []
+    material_start = material_end = None
+    in_materials = False
+    previous = None
+    step = None
+    offset = 0
+    with open(template_path, 'rb') as f:
+        for line in f:
+            start, offset = offset, offset + len(line)
+            key = Keyword(line)
+            if in_materials:
+                if key is not None and key not in myMaterialKeywords:
+                    index.append((material_start, material_end, 'materials', None))
+                    in_materials = False
+                elif not line.startswith(b'**'):
+                    material_end = offset
+            if key == 'step':
+                match = re.search(br'name\s*=\s*([^,\s]+)', line, re.I)
+                step = match.group(1).decode('ascii') if match else None
+            if key == 'material' and material_start is None:
+                material_start, material_end, in_materials = start, offset, True
+            elif previous == 'friction' and key is None and not line.startswith(b'**'):
+                index.append((start, offset, 'friction', line))
+            elif key is None and step == 'Loading' and myDisplacementLine.match(line):
+                index.append((start, offset, 'displacement', line))
+            elif line.startswith(b'** Job name:') and not index:
+                index.append((start, offset, 'heading', line))
+            if key is not None:
+                previous = key
+    kinds = set(i[2] for i in index)
+    for kind in ('materials', 'friction', 'displacement'):
+        if kind not in kinds:
+            raise ValueError("No %s to patch in %s" % (kind, template_path))
+    return index
+
+#------------------------------------------------------------------------------
+
+def Patch_Text(kind, line, model, myInputs):
+    if kind == 'heading':
+        return '** Job name: %s Model name: %s\n' % (model, model)
+    if kind == 'materials':
+        return Material_Text(myInputs)
+    if kind == 'friction':
+        return '%.9g,\n' % myInputs['myFriction']
+    rp = myDisplacementLine.match(line).group(1).decode('ascii')
+    return '%s, 1, 1, %.9g\n' % (rp, -myInputs['myDisplacement'])
+
+#------------------------------------------------------------------------------
+
+def Copy_Range(src, dst, start, end):
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(myCopyChunk, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+#------------------------------------------------------------------------------
+
+def Write_Patched_Deck(template_path, index, deck_path, model, myInputs):
+    with open(template_path, 'rb') as src, open(deck_path, 'wb') as dst:
+        position = 0
+        for start, end, kind, line in index:
+            Copy_Range(src, dst, position, start)
+            dst.write(Patch_Text(kind, line, model, myInputs).encode('utf-8'))
+            position = end
+        Copy_Range(src, dst, position, os.path.getsize(template_path))
+
+#------------------------------------------------------------------------------
+
+def Write_Deck_From_Template(templates, key, deck_path, model, myInputs, write_deck):
+    # Patch the group's template if there is one, else write_deck() and make
+    # the new deck the template. Returns True if the deck was patched.
+    # templates is {key: (template path, index)}, kept for the whole sweep.
+    if key in templates:
+        template_path, index = templates[key]
+        Write_Patched_Deck(template_path, index, deck_path, model, myInputs)
+        return True
+    write_deck()
+    templates[key] = (deck_path, Template_Index(deck_path))
+    return False
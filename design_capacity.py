@@ -0,0 +1,146 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+design_capacity.py — Closed-form plate capacities for pre-screening sweep rows
+
+Nominal (unfactored) resistances of the connection plate, for the full plate
+width 2 myPlateHalfHeight and thickness myPlateThickness, with d = myBoltDia,
+d0 = myArcDia, e1 = myEndLength, p1 = myPitch, p2 = myGauge, n = rows x gauges:
+
+  bearing       n 3.0 d t Ftu                          (AISC J3.10, deformation
+                                                         not a design consideration)
+  tear_out      gauges 1.5 lc t Ftu, lc = (e1 - d0/2) + (rows - 1)(p1 - d0)
+                                                        (AISC J3.10, clear distance)
+  net_section   Ftu (2 myPlateHalfHeight - gauges d0) t (AISC J4.1, EN 1993-1-1 6.2.3)
+  block_shear   Ftu Ant + Fty Anv/√3                   (EN 1993-1-8 3.10.2)
+                Ant = (gauges - 1)(p2 - d0) t
+                Anv = 2 (e1 + (rows - 1) p1 - (rows - 0.5) d0) t
+
+The governing mode has the lowest capacity; the margin is the second lowest
+over the lowest. A row with a large margin is far from a mode boundary and
+its mode is not in doubt, so the sweep drivers (P1.py, native_inp.py) can
+run only a sample of such rows with --prescreen <margin>: every row with a
+smaller margin is run, and of the others only every 1/<fraction>-th row of
+each governing mode with --prescreen-keep <fraction> (none by default).
+The rows not run are listed, with their capacities, in
+<job>_prescreen.csv. All modes are evaluated for the whole table at once.
+
+Run with:
+python design_capacity.py sweep.csv
+python native_inp.py --sweep sweep.csv --prescreen 1.3 --prescreen-keep 0.1
+abaqus cae noGUI=P1.py -- --sweep sweep.csv --prescreen 1.3
+"""
+
+import csv
+import math
+import sys
+
+import numpy as np
+
+#------------------------------------------------------------------------------
+
+myCapacityModes = ('bearing', 'tear_out', 'net_section', 'block_shear')
+myCapacityInputs = ('myBoltDia', 'myClearance', 'myEndLength', 'myPlateHalfHeight', 'myPlateThickness',
+    'MyFtu', 'MyFty', 'myBoltRows', 'myBoltGauges', 'myPitch', 'myGauge')
+
+myBearingFactor = 3.0     #Rn = 3.0 d t Fu
+myTearOutFactor = 1.5     #Rn = 1.5 lc t Fu
+
+#------------------------------------------------------------------------------
+
+def Input_Arrays(rows):
+    # {input: array over the rows} of the inputs the capacities need
+    return dict((n, np.array([float(r[n]) for r in rows])) for n in myCapacityInputs)
+
+#------------------------------------------------------------------------------
+
+def Capacities(x):
+    # {mode: capacity array} (N) of input arrays x (mm, MPa)
+    d, t, fu, fy = x['myBoltDia'], x['myPlateThickness'], x['MyFtu'], x['MyFty']
+    d0 = x['myBoltDia'] + x['myClearance']
+    rows, gauges = np.floor(x['myBoltRows']), np.floor(x['myBoltGauges'])
+    e1, p1, p2 = x['myEndLength'], x['myPitch'], x['myGauge']
+    lc = (e1 - d0/2.0) + (rows - 1.0)*(p1 - d0)
+    ant = (gauges - 1.0)*(p2 - d0)*t
+    anv = 2.0*(e1 + (rows - 1.0)*p1 - (rows - 0.5)*d0)*t
+    return {'bearing': rows*gauges*myBearingFactor*d*t*fu,
+        'tear_out': gauges*myTearOutFactor*lc*t*fu,
+        'net_section': fu*(2.0*x['myPlateHalfHeight'] - gauges*d0)*t,
+        'block_shear': fu*ant + fy*anv/math.sqrt(3.0)}
+
+#------------------------------------------------------------------------------
+
+def Governing_Mode(capacities):
+    # (mode index into myCapacityModes, governing capacity, margin) arrays
+    c = np.vstack([capacities[m] for m in myCapacityModes])
+    ranked = np.sort(c, axis=0)
+    return np.argmin(c, axis=0), ranked[0], ranked[1]/ranked[0]
+
+#------------------------------------------------------------------------------
+
+def Prescreen(rows, margin, keep=0.0):
+    # Boolean array of the rows to run: all with a governing margin below
+    # margin, and every round(1/keep)-th of the others per governing mode
+    mode, capacity, ratio = Governing_Mode(Capacities(Input_Arrays(rows)))
+    run = ratio < margin
+    if keep > 0:
+        stride = max(1, int(round(1.0/keep)))
+        for m in range(len(myCapacityModes)):
+            certain = np.nonzero(~run & (mode == m))[0]
+            run[certain[::stride]] = True
+    return run
+
+#------------------------------------------------------------------------------
+
+def Write_Prescreen_Report(path, names, rows):
+    # One line per row with its capacities, governing mode and margin
+    capacities = Capacities(Input_Arrays(rows))
+    mode, capacity, ratio = Governing_Mode(capacities)
+    with open(path, 'w') as f:
+        w = csv.writer(f, lineterminator='\n')
+        w.writerow(('name',) + myCapacityModes + ('mode', 'margin'))
+        for i, name in enumerate(names):
+            w.writerow([name] + ['%.6g' % capacities[m][i] for m in myCapacityModes]
+                + [myCapacityModes[mode[i]], '%.4g' % ratio[i]])
+
+#------------------------------------------------------------------------------
+
+def Prescreen_From_Argv(argv):
+    # --prescreen <margin> [--prescreen-keep <fraction>] -> (margin, keep) or None
+    if '--prescreen' not in argv:
+        return None
+    keep = float(argv[argv.index('--prescreen-keep') + 1]) if '--prescreen-keep' in argv else 0.0
+    return float(argv[argv.index('--prescreen') + 1]), keep
+
+#------------------------------------------------------------------------------
+
+def Prescreen_Sweep(prescreen, names, rows, report_path):
+    # The (names, rows) to run; the others go to report_path
+    if prescreen is None or not rows:
+        return names, rows
+    run = Prescreen(rows, *prescreen)
+    skipped = np.nonzero(~run)[0]
+    Write_Prescreen_Report(report_path, [names[i] for i in skipped], [rows[i] for i in skipped])
+    print('Prescreen: %d of %d rows run, %d skipped (see %s)' % (run.sum(), len(rows), len(skipped), report_path))
+    keep = np.nonzero(run)[0]
+    return [names[i] for i in keep], [rows[i] for i in keep]
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    from p1_core import Default_Inputs
+    from sweep import Read_Sweep_Spec
+    myRows = []
+    for myRow in (Read_Sweep_Spec(sys.argv[1]) if len(sys.argv) > 1 else [{}]):
+        myRowInputs = Default_Inputs()
+        myRowInputs.update(myRow)
+        myRows.append(myRowInputs)
+    myCapacities = Capacities(Input_Arrays(myRows))
+    myMode, myCapacity, myMargin = Governing_Mode(myCapacities)
+    for m, myName in enumerate(myCapacityModes):
+        mySelected = myMode == m
+        if mySelected.any():
+            print('%-12s %6d rows  margin %.3g-%.3g' % (myName, mySelected.sum(), myMargin[mySelected].min(),
+                myMargin[mySelected].max()))
+    if len(myRows) == 1:
+        print(', '.join('%s %.4g kN' % (m, myCapacities[m][0]/1000.0) for m in myCapacityModes))
@@ -0,0 +1,129 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+explicit_check.py — Stable increment, mass scaling and quasi-static check of Explicit runs
+
+With myExplicit = 1 the Loading step is an Abaqus/Explicit step of
+myExplicitTime with semi-automatic mass scaling to the target stable
+increment myTargetStableInc, so a run takes a known number of increments
+(myExplicitTime/myTargetStableInc) however the plate tears.
+
+Before a run, --plan estimates the unscaled stable increment (smallest
+element length over the dilatational wave speed), the mass-scaling factor the
+target implies and the increment count. After a run, the whole-model kinetic
+energy (ALLKE) must stay below myKineticRatioLimit of the internal energy
+(ALLIE) once the load is established (after myRatioStartFraction of the
+step); otherwise inertia is part of the answer and the run is not
+quasi-static. One <job>_energy.json is written per job and the exit status
+is 1 if any job fails the check.
+
+Run with:
+python explicit_check.py --plan
+abaqus python explicit_check.py P1 [P1_00002 ...]
+"""
+
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+#------------------------------------------------------------------------------
+
+myKineticRatioLimit = 0.05      #ALLKE/ALLIE above this is not quasi-static
+myRatioStartFraction = 0.1      #skip the start of the step, where ALLIE ~ 0
+myEnergyVariables = ('ALLKE', 'ALLIE', 'ALLSE', 'ALLPD', 'ALLAE', 'ALLWK', 'ALLMW', 'ETOTAL')
+
+#------------------------------------------------------------------------------
+
+def Wave_Speed(E, nu, rho):
+    # dilatational wave speed
+    return math.sqrt(E*(1.0 - nu)/(rho*(1.0 + nu)*(1.0 - 2.0*nu)))
+
+#------------------------------------------------------------------------------
+
+def Stable_Increment(myInputs):
+    # Smallest element length (hole-edge seed, global seed or a thickness
+    # layer of the half plate) over the wave speed, as Abaqus estimates it
+    half_thickness = myInputs['myPlateThickness']/2.0
+    layer = half_thickness/max(1, int(math.ceil(half_thickness/myInputs['myMeshSize'] - 1e-9)))
+    length = min(myInputs['myEdgeSize'], myInputs['myMeshSize'], layer)
+    return length/Wave_Speed(myInputs['myE'], myInputs['myPoisonRatio'], myInputs['myDensity'])
+
+#------------------------------------------------------------------------------
+
+def Mass_Scaling_Factor(myInputs):
+    return max(1.0, (myInputs['myTargetStableInc']/Stable_Increment(myInputs))**2)
+
+#------------------------------------------------------------------------------
+
+def Explicit_Increments(myInputs):
+    # mass scaling only raises increments below the target up to it
+    return int(math.ceil(myInputs['myExplicitTime']/max(myInputs['myTargetStableInc'], Stable_Increment(myInputs))))
+
+#------------------------------------------------------------------------------
+
+def Check_Quasi_Static(time, allke, allie, limit=myKineticRatioLimit, start_fraction=myRatioStartFraction):
+    time = np.asarray(time, dtype=float)
+    allke = np.asarray(allke, dtype=float)
+    allie = np.asarray(allie, dtype=float)
+    late = (time >= time[0] + start_fraction*(time[-1] - time[0])) & (allie > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = np.where(late, allke/allie, np.nan)
+    worst = int(np.nanargmax(ratio)) if late.any() else None
+    max_ratio = float(ratio[worst]) if worst is not None else None
+    return {'max_ratio': max_ratio, 'time_of_max': None if worst is None else float(time[worst]),
+        'final_ratio': float(ratio[-1]) if late[-1] else None, 'limit': limit,
+        'quasi_static': max_ratio is not None and max_ratio <= limit}
+
+#------------------------------------------------------------------------------
+
+def Read_Energy_History(odb, steps=None, region='Assembly ASSEMBLY'):
+    # {time, ALLKE, ALLIE, ...} arrays of the whole-model energy history
+    columns = {}
+    for step_name in (steps or odb.steps.keys()):
+        step = odb.steps[step_name]
+        outputs = step.historyRegions[region].historyOutputs
+        for n in myEnergyVariables:
+            if n in outputs.keys():
+                data = np.asarray(outputs[n].data, dtype=float)
+                columns.setdefault(n, []).extend(data[:, 1])
+                if n == 'ALLKE':
+                    columns.setdefault('time', []).extend(step.totalTime + data[:, 0])
+    return dict((n, np.asarray(v)) for n, v in columns.items())
+
+#------------------------------------------------------------------------------
+
+def Check_Job(job, directory='.', limit=myKineticRatioLimit):
+    from odb_extract import Open_Odb
+    odb = Open_Odb(os.path.join(directory, job + '.odb'))
+    try:
+        energy = Read_Energy_History(odb)
+    finally:
+        odb.close()
+    result = Check_Quasi_Static(energy['time'], energy['ALLKE'], energy['ALLIE'], limit)
+    result['job'] = job
+    if 'ALLMW' in energy and len(energy['ALLMW']):
+        # work of the added mass relative to the final internal energy
+        result['mass_work_ratio'] = float(abs(energy['ALLMW'][-1])/max(abs(energy['ALLIE'][-1]), 1e-30))
+    with open(os.path.join(directory, job + '_energy.json'), 'w') as f:
+        json.dump(result, f, indent=1, sort_keys=True)
+    return result
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    if '--plan' in sys.argv:
+        from p1_core import Default_Inputs
+        myInputs = Default_Inputs()
+        print('stable increment %.3g, target %.3g, mass scaling x%.3g, %d increments' % (Stable_Increment(myInputs),
+            myInputs['myTargetStableInc'], Mass_Scaling_Factor(myInputs), Explicit_Increments(myInputs)))
+        sys.exit(0)
+    myFailed = 0
+    for myJob in [a for a in sys.argv[1:] if not a.startswith('--')]:
+        myResult = Check_Job(myJob)
+        myFailed += not myResult['quasi_static']
+        print('%s: max ALLKE/ALLIE %s at t=%s -> %s' % (myJob, myResult['max_ratio'], myResult['time_of_max'],
+            'quasi-static' if myResult['quasi_static'] else 'NOT quasi-static'))
+    sys.exit(1 if myFailed else 0)
@@ -0,0 +1,91 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+geometry_index.py — Select faces and edges by geometry instead of topology masks
+
+An index is built once per instance from plain records (index, point on the
+entity, normal, centroid or end points), so the selection does not depend on the
+face/edge numbering that getSequenceFromMask masks rely on and which changes
+with the clearance, end length or partitions. Entries are kept sorted by
+plane coordinate or radius about a given axis centre, so each named query is
+a bisection:
+
+  Faces_On_Plane     planar faces with normal along an axis at a coordinate
+                     (symmetry faces, the fixed plate edge)
+  Faces_On_Cylinder  faces of a z-axis cylinder of a radius (hole, bolt shank)
+  Arcs_On_Cylinder   circular edges of such a cylinder (hole-edge seeds)
+
+Pure Python, so it runs inside Abaqus/CAE and can be tried outside it.
+"""
+
+import bisect
+import math
+
+#------------------------------------------------------------------------------
+
+myGeometryTol = 1e-6
+
+#------------------------------------------------------------------------------
+
+def Build_Face_Index(records, center=(0.0, 0.0), tol=myGeometryTol):
+    # records: [(index, (x, y, z) point on the face, (nx, ny, nz) unit normal,
+    # (x, y, z) centroid)]; the centroid tells a plane from a cylinder whose
+    # point happens to have an axis-aligned normal (it lies off a curved face)
+    planes = dict((axis, []) for axis in range(3))
+    cylinders = []
+    for index, point, normal, centroid in records:
+        for axis in range(3):
+            if abs(abs(normal[axis]) - 1.0) < tol and abs(centroid[axis] - point[axis]) < tol*max(abs(point[axis]), 1.0):
+                planes[axis].append((point[axis], index))
+                break
+        else:
+            dx, dy = point[0] - center[0], point[1] - center[1]
+            r = math.hypot(dx, dy)
+            # radial normal with no z component: a face of a z-axis cylinder
+            if r > tol and abs(normal[2]) < tol and abs(abs(dx*normal[0] + dy*normal[1]) - r) < tol*max(r, 1.0):
+                cylinders.append((r, index))
+    for axis in planes:
+        planes[axis].sort()
+    cylinders.sort()
+    return {'planes': planes, 'cylinders': cylinders, 'center': center}
+
+#------------------------------------------------------------------------------
+
+def Build_Edge_Index(records, center=(0.0, 0.0), tol=myGeometryTol):
+    # records: [(index, (x, y, z) point on the edge, ((x, y, z), (x, y, z)) end points)]
+    arcs = []
+    for index, point, ends in records:
+        if len(ends) == 1:
+            ends = (ends[0], ends[0])   #closed circle: one vertex
+        radii = [math.hypot(p[0] - center[0], p[1] - center[1]) for p in (point,) + tuple(ends)]
+        if len(ends) != 2 or abs(ends[0][2] - ends[1][2]) > tol or abs(point[2] - ends[0][2]) > tol:
+            continue
+        if max(radii) - min(radii) < tol*max(radii[0], 1.0):
+            arcs.append((radii[0], index))
+    arcs.sort()
+    return {'arcs': arcs, 'center': center}
+
+#------------------------------------------------------------------------------
+
+def Sorted_Range(entries, value, tol):
+    lo = bisect.bisect_left(entries, (value - tol, -1))
+    hi = bisect.bisect_right(entries, (value + tol, float('inf')))
+    return sorted(index for key, index in entries[lo:hi])
+
+#------------------------------------------------------------------------------
+
+def Faces_On_Plane(face_index, axis, value, tol=myGeometryTol):
+    # axis 0, 1, 2 for planes x = value, y = value, z = value
+    return Sorted_Range(face_index['planes'][axis], value, tol*max(abs(value), 1.0))
+
+#------------------------------------------------------------------------------
+
+def Faces_On_Cylinder(face_index, radius, tol=myGeometryTol):
+    return Sorted_Range(face_index['cylinders'], radius, tol*max(radius, 1.0))
+
+#------------------------------------------------------------------------------
+
+def Arcs_On_Cylinder(edge_index, radius, tol=myGeometryTol):
+    return Sorted_Range(edge_index['arcs'], radius, tol*max(radius, 1.0))
+
+#------------------------------------------------------------------------------
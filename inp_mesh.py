@@ -0,0 +1,330 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+inp_mesh.py — Node and element arrays of an existing .inp deck, with box and radius sets
+
+Create_Node_Set_ByBoundingBox and Create_Element_Set_ByBoundingBox need a
+CAE model; this module adds sets to a deck that is already written (by
+P1.py, native_inp.py or a refined study). The deck is memory-mapped and only
+its keyword lines are visited: each *Node / *Element data block is handed
+to NumPy as one byte string and parsed into a contiguous array, without a
+Python object per line, so a deck of millions of lines loads in seconds.
+
+Nodes and elements belong to their *Part (part labels); *Instance blocks
+give each part's translation in the assembly. Queries take assembly
+coordinates, as the CAE functions do, and use a uniform grid over the node
+coordinates and element centroids of each part (about myGridPerCell points
+per cell): a box query visits only the cells it overlaps, a radius query
+the cells of its bounding box.
+
+New *Nset / *Elset blocks are inserted before *End Assembly (before the
+first *Step in a deck without an assembly): only the bytes after that point,
+the materials and steps, are moved; the node and element blocks are not
+rewritten.
+
+Run with:
+python inp_mesh.py info P1.inp
+python inp_mesh.py elset P1.inp Net_Section --instance Plate --box -1 0 0 1 50 2
+python inp_mesh.py nset P1.inp Hole_Edge --instance Plate --radius 0 0 0 9.5
+"""
+
+import argparse
+import io
+import mmap
+import re
+import sys
+import time
+
+import numpy as np
+
+#------------------------------------------------------------------------------
+
+myGridPerCell = 8
+myContinuation = re.compile(br',[ \t]*\r?\n')
+
+#------------------------------------------------------------------------------
+
+def Keyword_Params(line):
+    # b'*Element, type=C3D8R, elset=X' -> ('element', {'type': 'C3D8R', 'elset': 'X'})
+    fields = [p.strip() for p in line.decode('latin-1').lstrip('*').split(',')]
+    params = {}
+    for p in fields[1:]:
+        if p:
+            key, _, value = p.partition('=')
+            params[key.strip().lower()] = value.strip().strip('"')
+    return fields[0].lower(), params
+
+#------------------------------------------------------------------------------
+
+def Keyword_Lines(mm):
+    # [(start, end)] byte ranges of the keyword lines (not comments), in order
+    lines = []
+    start = 0 if mm[:1] == b'*' else mm.find(b'\n*') + 1
+    while start > 0 or (start == 0 and mm[:1] == b'*'):
+        end = mm.find(b'\n', start)
+        end = len(mm) if end < 0 else end + 1
+        if mm[start + 1:start + 2] != b'*':
+            lines.append((start, end))
+        start = mm.find(b'\n*', end - 1) + 1
+        if start == 0:
+            break
+    return lines
+
+#------------------------------------------------------------------------------
+
+def Block_Array(data, dtype, continued=False):
+    # (rows, columns) array of a block of comma-separated data lines
+    if continued:
+        data = myContinuation.sub(b',', data)
+    data = data.replace(b'\r', b'').strip().rstrip(b',')
+    if not data:
+        return np.zeros((0, 0), dtype=dtype)
+    columns = data[:data.find(b'\n')].count(b',') + 1 if b'\n' in data else data.count(b',') + 1
+    values = np.fromstring(data.replace(b'\n', b','), dtype=dtype, sep=',')
+    return values.reshape(-1, columns)
+
+#------------------------------------------------------------------------------
+
+def New_Part():
+    return {'labels': [], 'coords': [], 'elements': []}
+
+#------------------------------------------------------------------------------
+
+def Read_Inp_Mesh(path):
+    # {'path', 'parts': {part: {labels, coords, elements: [(type, labels, nodes)]}},
+    #  'instances': {instance: {'part', 'translation'}}, 'insert_at': offset}
+    parts, instances = {}, {}
+    owner = None
+    insert_at = None
+    with io.open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            keywords = Keyword_Lines(mm)
+            for k, (start, end) in enumerate(keywords):
+                data_end = keywords[k + 1][0] if k + 1 < len(keywords) else len(mm)
+                name, params = Keyword_Params(mm[start:end].rstrip())
+                if name == 'part':
+                    owner = params['name']
+                elif name == 'end part' or name == 'end instance':
+                    owner = None if name == 'end part' else 'Assembly'
+                elif name == 'assembly':
+                    owner = 'Assembly'
+                elif name == 'instance':
+                    rows = [r for r in mm[end:data_end].decode('latin-1').splitlines() if r.strip() and not r.startswith('**')]
+                    if len(rows) > 1:
+                        raise ValueError("Rotated instance %s in %s is not supported" % (params['name'], path))
+                    translation = [float(v) for v in rows[0].split(',') if v.strip()] if rows else [0.0, 0.0, 0.0]
+                    instances[params['name']] = {'part': params.get('part', params['name']),
+                        'translation': np.array(translation + [0.0]*(3 - len(translation)))}
+                    # an independent instance carries its own mesh
+                    owner = params['name']
+                elif name == 'end assembly' and insert_at is None:
+                    insert_at = start
+                elif name == 'step' and insert_at is None:
+                    insert_at = start
+                elif name == 'node':
+                    block = Block_Array(mm[end:data_end], float)
+                    if len(block):
+                        part = parts.setdefault(owner, New_Part())
+                        part['labels'].append(block[:, 0].astype(np.int64))
+                        part['coords'].append(np.pad(block[:, 1:4], ((0, 0), (0, 4 - block.shape[1])), 'constant'))
+                elif name == 'element':
+                    block = Block_Array(mm[end:data_end], np.int64, continued=True)
+                    if len(block):
+                        parts.setdefault(owner, New_Part())['elements'].append((params.get('type'), block[:, 0], block[:, 1:]))
+        finally:
+            mm.close()
+    for part in parts.values():
+        part['labels'] = np.concatenate(part['labels']) if part['labels'] else np.zeros(0, dtype=np.int64)
+        part['coords'] = np.concatenate(part['coords']) if part['coords'] else np.zeros((0, 3))
+    return {'path': path, 'parts': parts, 'instances': instances,
+        'insert_at': insert_at if insert_at is not None else len(open(path, 'rb').read())}
+
+#------------------------------------------------------------------------------
+
+def Grid_Index(points, per_cell=myGridPerCell):
+    # Uniform grid over points: cell keys sorted, with the point order
+    points = np.asarray(points, dtype=float)
+    if not len(points):
+        return {'points': points, 'origin': np.zeros(3), 'size': 1.0, 'shape': np.ones(3, dtype=int),
+            'order': np.zeros(0, dtype=int), 'keys': np.zeros(0, dtype=int)}
+    origin = points.min(axis=0)
+    span = points.max(axis=0) - origin
+    active = span > 1e-9*max(span.max(), 1e-30)
+    cells = max(1, len(points)//per_cell)
+    size = (np.prod(span[active])/cells)**(1.0/active.sum()) if active.any() else 1.0
+    shape = np.maximum(1, np.ceil(span/size).astype(int))
+    cell = np.minimum(((points - origin)/size).astype(int), shape - 1)
+    keys = np.ravel_multi_index(cell.T, shape)
+    order = np.argsort(keys, kind='mergesort')
+    return {'points': points, 'origin': origin, 'size': size, 'shape': shape, 'order': order, 'keys': keys[order]}
+
+#------------------------------------------------------------------------------
+
+def Grid_Box(index, lo, hi):
+    # Indices of the points inside the box [lo, hi]
+    lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+    top = index['origin'] + index['shape']*index['size']
+    if not len(index['order']) or np.any(hi < index['origin']) or np.any(lo > top):
+        return np.zeros(0, dtype=int)
+    c0 = np.clip(np.floor((lo - index['origin'])/index['size']).astype(int), 0, index['shape'] - 1)
+    c1 = np.clip(np.floor((hi - index['origin'])/index['size']).astype(int), 0, index['shape'] - 1)
+    grids = np.meshgrid(*[np.arange(a, b + 1) for a, b in zip(c0, c1)], indexing='ij')
+    cells = np.ravel_multi_index([g.ravel() for g in grids], index['shape'])
+    starts = np.searchsorted(index['keys'], cells, 'left')
+    counts = np.searchsorted(index['keys'], cells, 'right') - starts
+    offsets = np.cumsum(counts) - counts
+    positions = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+    candidates = index['order'][positions]
+    p = index['points'][candidates]
+    return np.sort(candidates[np.all((p >= lo) & (p <= hi), axis=1)])
+
+#------------------------------------------------------------------------------
+
+def Grid_Radius(index, centre, radius):
+    centre = np.asarray(centre, dtype=float)
+    candidates = Grid_Box(index, centre - radius, centre + radius)
+    d2 = ((index['points'][candidates] - centre)**2).sum(axis=1)
+    return candidates[d2 <= radius**2]
+
+#------------------------------------------------------------------------------
+
+def Instance_Part(mesh, instance):
+    # (part dict, translation) of an instance; None for the deck's own nodes
+    # (a deck without parts) or the assembly-level nodes
+    if instance is None:
+        return mesh['parts'].get(None, mesh['parts'].get('Assembly', New_Part())), np.zeros(3)
+    if instance in mesh['parts']:
+        return mesh['parts'][instance], mesh['instances'][instance]['translation']
+    entry = mesh['instances'][instance]
+    return mesh['parts'][entry['part']], entry['translation']
+
+#------------------------------------------------------------------------------
+
+def Node_Index(part):
+    if 'node_index' not in part:
+        part['node_index'] = Grid_Index(part['coords'])
+    return part['node_index']
+
+#------------------------------------------------------------------------------
+
+def Element_Index(part):
+    # Grid over the element centroids; element labels in the same order
+    if 'element_index' not in part:
+        order = np.argsort(part['labels'])
+        sorted_labels = part['labels'][order]
+        labels, centroids = [], []
+        for etype, element_labels, nodes in part['elements']:
+            rows = order[np.searchsorted(sorted_labels, nodes)]
+            labels.append(element_labels)
+            centroids.append(part['coords'][rows].mean(axis=1))
+        part['element_labels'] = np.concatenate(labels) if labels else np.zeros(0, dtype=np.int64)
+        part['element_index'] = Grid_Index(np.concatenate(centroids) if centroids else np.zeros((0, 3)))
+    return part['element_index']
+
+#------------------------------------------------------------------------------
+
+def Nodes_In_Box(mesh, instance, lo, hi):
+    # Labels of the instance's nodes in the box (assembly coordinates)
+    part, shift = Instance_Part(mesh, instance)
+    rows = Grid_Box(Node_Index(part), np.asarray(lo) - shift, np.asarray(hi) - shift)
+    return part['labels'][rows]
+
+#------------------------------------------------------------------------------
+
+def Elements_In_Box(mesh, instance, lo, hi):
+    # Labels of the instance's elements with their centroid in the box
+    part, shift = Instance_Part(mesh, instance)
+    rows = Grid_Box(Element_Index(part), np.asarray(lo) - shift, np.asarray(hi) - shift)
+    return part['element_labels'][rows]
+
+#------------------------------------------------------------------------------
+
+def Nodes_In_Radius(mesh, instance, centre, radius):
+    part, shift = Instance_Part(mesh, instance)
+    rows = Grid_Radius(Node_Index(part), np.asarray(centre) - shift, radius)
+    return part['labels'][rows]
+
+#------------------------------------------------------------------------------
+
+def Elements_In_Radius(mesh, instance, centre, radius):
+    # Labels of the instance's elements with their centroid within radius
+    part, shift = Instance_Part(mesh, instance)
+    rows = Grid_Radius(Element_Index(part), np.asarray(centre) - shift, radius)
+    return part['element_labels'][rows]
+
+#------------------------------------------------------------------------------
+
+def Set_Text(kind, name, instance, labels):
+    # *Nset / *Elset block, 16 labels a line
+    name = '"%s"' % name if ' ' in name else name
+    lines = ['*%s, %s=%s%s' % (kind.capitalize(), kind, name, ', instance=%s' % instance if instance else '')]
+    labels = np.sort(np.asarray(labels, dtype=np.int64))
+    lines.extend(', '.join(str(v) for v in labels[i:i + 16]) for i in range(0, len(labels), 16))
+    return ''.join(line + '\n' for line in lines)
+
+#------------------------------------------------------------------------------
+
+def Append_Sets(mesh, sets):
+    # Insert [(kind 'nset'|'elset', name, instance, labels)] at the deck's
+    # insertion point, moving only the bytes after it
+    text = ''.join(Set_Text(kind, name, instance, labels) for kind, name, instance, labels in sets).encode('ascii')
+    with io.open(mesh['path'], 'r+b') as f:
+        f.seek(mesh['insert_at'])
+        tail = f.read()
+        f.seek(mesh['insert_at'])
+        f.write(text)
+        f.write(tail)
+    mesh['insert_at'] += len(text)
+    return len(text)
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Node and element sets of an existing .inp deck.')
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('info')
+    p.add_argument('inp')
+    for kind in ('nset', 'elset'):
+        p = sub.add_parser(kind)
+        p.add_argument('inp')
+        p.add_argument('name')
+        p.add_argument('--instance')
+        p.add_argument('--box', type=float, nargs=6, metavar=('X0', 'Y0', 'Z0', 'X1', 'Y1', 'Z1'))
+        p.add_argument('--radius', type=float, nargs=4, metavar=('X', 'Y', 'Z', 'R'))
+    args = parser.parse_args(argv[1:])
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    start = time.time()
+    mesh = Read_Inp_Mesh(args.inp)
+    if args.command == 'info':
+        print('%s read in %.2f s' % (args.inp, time.time() - start))
+        for name in sorted(mesh['parts'], key=str):
+            part = mesh['parts'][name]
+            print('  %-12s %9d nodes %9d elements (%s)' % (name, len(part['labels']),
+                sum(len(e[1]) for e in part['elements']), ', '.join(sorted(set(str(e[0]) for e in part['elements'])))))
+        for name in sorted(mesh['instances']):
+            print('  instance %-8s part %-8s at %s' % (name, mesh['instances'][name]['part'],
+                ', '.join('%g' % v for v in mesh['instances'][name]['translation'])))
+        return 0
+    if (args.box is None) == (args.radius is None):
+        parser.error('give one of --box or --radius')
+    if args.box is not None:
+        query = Nodes_In_Box if args.command == 'nset' else Elements_In_Box
+        labels = query(mesh, args.instance, args.box[:3], args.box[3:])
+    else:
+        query = Nodes_In_Radius if args.command == 'nset' else Elements_In_Radius
+        labels = query(mesh, args.instance, args.radius[:3], args.radius[3])
+    if not len(labels):
+        print('No %s found; %s not changed' % ('nodes' if args.command == 'nset' else 'elements', args.inp))
+        return 1
+    Append_Sets(mesh, [(args.command, args.name, args.instance, labels)])
+    print('%s %s: %d labels added to %s in %.2f s' % (args.command, args.name, len(labels), args.inp, time.time() - start))
+    return 0
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
@@ -0,0 +1,170 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+job_monitor.py — Stop running jobs once the load drop after the ultimate is captured
+
+The capacity procedure needs the RP-1 curve only up to a load drop past the
+ultimate, but the Bolt_Displacement boundary condition drives the bolt the
+full myDisplacement. The monitor follows each running Abaqus/Standard job
+through the lines its files gain (read from byte offsets, as step_tuner.py
+does):
+
+  <job>.sta  converged increments and step time
+  <job>.dat  U1 and RF1 of RP-1, printed every increment by the "monitor"
+             output profile (--output-profile monitor)
+
+and stops a job with the terminate command once
+
+  drop   the load -RF1 has fallen myMonitorDrop (a fraction) below its peak
+  stall  the step time advanced less than myStallProgress over the last
+         myStallIncrements increments
+
+A drop, or a stall after the peak, leaves the curve the procedure needs:
+<job>_monitor.json records status "captured" with the peak, and
+scheduler.py counts the job as completed; a stall before any drop is
+recorded as "stalled" and counts as failed. The ODB holds every increment
+up to the stop, so odb_extract.py reads the curve as usual.
+
+scheduler.py runs the monitor with --monitor-drop; standin_solver.py
+--stream writes the same files increment by increment and stops at
+"standin_solver.py <job> --terminate", to test it without Abaqus.
+
+Run with:
+python job_monitor.py P1_00001 P1_00002 --drop 0.2
+python scheduler.py decks --cpus 8 --monitor-drop 0.2
+python scheduler.py decks --cpus 8 --monitor-drop 0.2 --command "python /path/to/standin_solver.py {job} --curve --stream" --terminate-command "python /path/to/standin_solver.py {job} --terminate"
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from step_tuner import New_Stats, Poll_Run_Stats, Read_New_Lines
+
+#------------------------------------------------------------------------------
+
+myMonitorDrop = 0.2            #stop at this fraction below the peak load
+myMonitorMinPoints = 5         #printed increments before a peak counts
+myStallIncrements = 50         #increments over which the step must advance
+myStallProgress = 1e-4         #by at least this step time
+myTerminateCommand = 'abaqus terminate job={job}'
+myMonitorSuffix = '_monitor.json'
+
+#------------------------------------------------------------------------------
+
+def New_Monitor():
+    return {'stats': New_Stats(), 'dat_offset': 0, 'variables': None, 'step_time': 0.0,
+        'time': [], 'U1': [], 'RF1': [], 'peak': 0.0, 'peak_index': None, 'recent': []}
+
+#------------------------------------------------------------------------------
+
+def Update_Dat_Rows(state, lines):
+    # Add the RP-1 rows of new .dat lines; each table's first node row after
+    # its "NODE FOOT-" header is RP-1's
+    for line in lines:
+        fields = line.split()
+        if 'STEP TIME COMPLETED' in line:
+            try:
+                state['step_time'] = float(line.split('STEP TIME COMPLETED')[1].split(',')[0])
+            except ValueError:
+                pass
+        elif len(fields) > 2 and fields[0] == 'NODE' and fields[1].startswith('FOOT'):
+            state['variables'] = fields[2:]
+        elif state['variables'] and len(fields) > len(state['variables']):
+            try:
+                values = [float(v) for v in fields[-len(state['variables']):]]
+            except ValueError:
+                continue
+            row = dict(zip(state['variables'], values))
+            state['variables'] = None
+            if 'U1' in row and 'RF1' in row:
+                state['time'].append(state['step_time'])
+                state['U1'].append(row['U1'])
+                state['RF1'].append(row['RF1'])
+                if -row['RF1'] > state['peak']:
+                    state['peak'], state['peak_index'] = -row['RF1'], len(state['RF1']) - 1
+
+#------------------------------------------------------------------------------
+
+def Check_Stop(state, drop=myMonitorDrop):
+    # ('captured' | 'stalled', 'drop' | 'stall') once the job should stop, else None
+    if len(state['RF1']) >= myMonitorMinPoints and state['peak'] > 0 and state['peak_index'] < len(state['RF1']) - 1:
+        if -state['RF1'][-1] <= (1.0 - drop)*state['peak']:
+            return 'captured', 'drop'
+    recent = state['recent']
+    if len(recent) >= myStallIncrements and recent[-1] - recent[0] < myStallProgress:
+        past_peak = state['peak_index'] is not None and state['peak_index'] < len(state['RF1']) - 1
+        return ('captured' if past_peak else 'stalled'), 'stall'
+    return None
+
+#------------------------------------------------------------------------------
+
+def Poll_Job(state, directory, job, drop=myMonitorDrop):
+    # Read what the job's files gained; returns Check_Stop()
+    for inc in Poll_Run_Stats(state['stats'], directory, job):
+        if inc['step'] != state.get('step'):
+            state['step'], state['recent'] = inc['step'], []
+        state['recent'] = (state['recent'] + [inc['step_time']])[-myStallIncrements:]
+    lines, state['dat_offset'] = Read_New_Lines(os.path.join(directory, job + '.dat'), state['dat_offset'])
+    Update_Dat_Rows(state, lines)
+    return Check_Stop(state, drop)
+
+#------------------------------------------------------------------------------
+
+def Stop_Job(directory, job, state, stop, command=myTerminateCommand):
+    # Record why the job stops, then terminate it
+    status, reason = stop
+    peak = state['peak_index']
+    result = {'job': job, 'status': status, 'reason': reason, 'step_time': state['stats']['step_time'],
+        'increments': state['stats']['increments'], 'points': len(state['RF1']),
+        'peak_load': state['peak'] if peak is not None else None,
+        'peak_displacement': -state['U1'][peak] if peak is not None else None,
+        'last_load': -state['RF1'][-1] if state['RF1'] else None}
+    with open(os.path.join(directory, job + myMonitorSuffix), 'w') as f:
+        json.dump(result, f, indent=1, sort_keys=True)
+    subprocess.call(command.format(job=job), shell=True, cwd=directory)
+    return result
+
+#------------------------------------------------------------------------------
+
+def Monitor_Jobs(directory, jobs, drop=myMonitorDrop, command=myTerminateCommand, poll_interval=1.0):
+    # Follow the jobs until each has finished or been stopped; {job: result}
+    states = dict((j, New_Monitor()) for j in jobs)
+    results = {}
+    while len(results) < len(jobs):
+        for job in jobs:
+            if job in results:
+                continue
+            stop = Poll_Job(states[job], directory, job, drop)
+            if stop is not None:
+                results[job] = Stop_Job(directory, job, states[job], stop, command)
+            elif states[job]['stats']['status'] is not None:
+                results[job] = {'job': job, 'status': states[job]['stats']['status'], 'reason': 'finished'}
+        if len(results) < len(jobs):
+            time.sleep(poll_interval)
+    return results
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Stop P1 jobs once the post-peak load drop is captured.')
+    parser.add_argument('jobs', nargs='+')
+    parser.add_argument('--directory', default='.')
+    parser.add_argument('--drop', type=float, default=myMonitorDrop)
+    parser.add_argument('--terminate-command', default=myTerminateCommand)
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    args = parser.parse_args(argv[1:])
+    results = Monitor_Jobs(args.directory, args.jobs, args.drop, args.terminate_command, args.poll_interval)
+    for job in args.jobs:
+        r = results[job]
+        print('%s: %s (%s)%s' % (job, r['status'], r['reason'], ', peak %.6g at U1 %.4g, step time %.4g' % (
+            r['peak_load'], r['peak_displacement'], r['step_time']) if r.get('peak_load') is not None else ''))
+    return 0 if all(r['status'] in ('captured', 'completed') for r in results.values()) else 1
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
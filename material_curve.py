@@ -0,0 +1,72 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+material_curve.py — Vectorized Ramberg–Osgood material curves for P1.py
+
+Builds the plate's true stress / true plastic strain table for one or many
+materials at once. Every input may be a scalar or an array; all inputs are
+broadcast against each other and one table row is returned per material.
+
+The default resolution (num_hardening=10) reproduces the 13-row plastic table
+that P1.py used to build from the Engg_Stress_1..20 globals. The damage
+initiation tables are built by damage_locus.py.
+"""
+
+import numpy as np
+
+#------------------------------------------------------------------------------
+
+def Strain_Hardening_Exponent(fty, ftu, sr, e):
+    # Uniform strain at rupture, Ɛus (%) and strain hardening exponent, n
+    fty, ftu, sr, e = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (fty, ftu, sr, e)])
+    sus = 100.0*((sr/100.0) - (ftu/e))
+    return np.log(sus/0.2)/np.log(ftu/fty)
+
+#------------------------------------------------------------------------------
+
+def Engg_Stress_Points(fty, ftu, num_hardening=10):
+    # Engineering stresses of the plastic table, shape (..., num_hardening + 3):
+    # 0.95*Fty, Fty, num_hardening equal steps up to Ftu, and Ftu again for the
+    # point at the ultimate compressive strain.
+    fty, ftu = np.broadcast_arrays(np.asarray(fty, dtype=float), np.asarray(ftu, dtype=float))
+    fty = fty[..., np.newaxis]
+    ftu = ftu[..., np.newaxis]
+    k = np.arange(1, num_hardening + 1, dtype=float)/num_hardening
+    return np.concatenate((0.95*fty, fty, fty + k*(ftu - fty), ftu), axis=-1)
+
+#------------------------------------------------------------------------------
+
+def Plastic_Table(fty, ftu, sr, scu, e, num_hardening=10):
+    """Return (true_stress, true_plastic_strain) arrays for the plate material.
+
+    fty, ftu -- yield and ultimate strength (MPa)
+    sr       -- strain at rupture, Ɛr (%)
+    scu      -- ultimate compressive strain (%)
+    e        -- Young's modulus (MPa)
+
+    Both arrays have shape broadcast(inputs) + (num_hardening + 3,). The first
+    row carries zero plastic strain so the table can go straight to *Plastic.
+    """
+    fty, ftu, sr, scu, e = np.broadcast_arrays(
+        *[np.asarray(v, dtype=float) for v in (fty, ftu, sr, scu, e)])
+    n = Strain_Hardening_Exponent(fty, ftu, sr, e)[..., np.newaxis]
+    fty_ = fty[..., np.newaxis]
+    e_ = e[..., np.newaxis]
+
+    engg_stress = Engg_Stress_Points(fty, ftu, num_hardening)
+    engg_strain = engg_stress/e_ + 0.002*(engg_stress/fty_)**n
+    engg_strain[..., -1] = scu/100.0
+
+    true_stress = engg_stress*(1.0 + engg_strain)
+    true_plastic_strain = np.log1p(engg_strain) - true_stress/e_
+    true_plastic_strain[..., 0] = 0.0
+    return true_stress, true_plastic_strain
+
+#------------------------------------------------------------------------------
+
+def Plastic_Table_Rows(true_stress, true_plastic_strain):
+    # One material's table as the tuple of tuples expected by Material.Plastic
+    return tuple((round(float(s), 6), round(float(p), 9))
+        for s, p in zip(true_stress, true_plastic_strain))
+
+#------------------------------------------------------------------------------
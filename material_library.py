@@ -0,0 +1,291 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+material_library.py — SQLite store of material grades with precomputed tables
+
+One row per grade: Fty, Ftu, Ɛr (%), the ultimate compressive strain, E,
+Poisson's ratio and density, and the tables the deck writers need, computed
+once at import: the true stress / true plastic strain table (material_curve.py)
+and the ductile and shear damage-initiation tables (damage_locus.py: the
+Johnson–Cook and Hooputra loci at the grade's own Ɛr). Grades are looked up by
+name (primary key) or by Fty/Ftu range (indexed).
+
+A model takes its plate material from a grade with --material <grade> or a
+"material" sweep column, and the bolt from --bolt-material <grade> or a
+"bolt_material" column (elastic-plastic instead of elastic with the plate's
+E). The grade's values replace MyFty, MyFtu, MySr, MyScu, myE, myPoisonRatio
+and myDensity of the row. Each grade is read from the database once per
+process, so a sweep of thousands of rows costs one query per grade.
+
+Bulk import reads a CSV with the columns grade, fty, ftu, sr, scu, e, nu,
+density (and optionally plastic, ductile_damage, shear_ks, shear_damage as
+JSON, as written by export); missing tables are computed for all rows at once.
+Grades imported before the damage tables were computed per grade hold the
+fixed tables of damage_locus.py; export and import them without the
+ductile_damage, shear_ks and shear_damage columns to recompute them.
+
+Run with:
+python material_library.py import grades.csv
+python material_library.py add S355 --fty 355 --ftu 510 --sr 22
+python material_library.py find --fty 300 400
+python material_library.py export grades.csv
+python native_inp.py --sweep sweep.csv --materials materials.db --material S355
+abaqus cae noGUI=P1.py -- --sweep sweep.csv --bolt-material Grade8.8
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+from material_curve import Plastic_Table, Plastic_Table_Rows
+from damage_locus import Damage_Table_Rows, Damage_Tables, Model_Damage_Tables, myDuctileDamageTable, myShearDamageKs, myShearDamageTable
+
+#------------------------------------------------------------------------------
+
+myMaterialLibraryFile = 'materials.db'
+myMaterialLibrary = {'path': myMaterialLibraryFile, 'connection': None, 'cache': {}}
+
+myMaterialColumns = ('grade', 'fty', 'ftu', 'sr', 'scu', 'e', 'nu', 'density',
+    'plastic', 'ductile_damage', 'shear_ks', 'shear_damage')
+myTableColumns = ('plastic', 'ductile_damage', 'shear_damage')
+myGradeDamageLocus = 'johnson_cook'   #locus of the damage tables computed for a grade
+myGradeDamagePoints = 8               #and their rows
+
+# Row inputs set from a plate grade
+myMaterialInputs = (('MyFty', 'fty'), ('MyFtu', 'ftu'), ('MySr', 'sr'), ('MyScu', 'scu'),
+    ('myE', 'e'), ('myPoisonRatio', 'nu'), ('myDensity', 'density'))
+
+#------------------------------------------------------------------------------
+
+def Connect(path):
+    con = sqlite3.connect(path)
+    con.execute('CREATE TABLE IF NOT EXISTS materials (grade TEXT PRIMARY KEY, fty REAL NOT NULL, '
+        'ftu REAL NOT NULL, sr REAL NOT NULL, scu REAL NOT NULL, e REAL NOT NULL, nu REAL NOT NULL, '
+        'density REAL NOT NULL, plastic TEXT NOT NULL, ductile_damage TEXT NOT NULL, '
+        'shear_ks REAL NOT NULL, shear_damage TEXT NOT NULL)')
+    con.execute('CREATE INDEX IF NOT EXISTS materials_fty ON materials (fty, ftu)')
+    con.execute('CREATE INDEX IF NOT EXISTS materials_ftu ON materials (ftu)')
+    return con
+
+#------------------------------------------------------------------------------
+
+def Open_Material_Library(path):
+    if myMaterialLibrary['connection'] is not None:
+        myMaterialLibrary['connection'].close()
+    myMaterialLibrary.update({'path': path, 'connection': None, 'cache': {}})
+
+#------------------------------------------------------------------------------
+
+def Library_Connection():
+    if myMaterialLibrary['connection'] is None:
+        if not os.path.isfile(myMaterialLibrary['path']):
+            raise ValueError("No material library at %s (see material_library.py)" % myMaterialLibrary['path'])
+        myMaterialLibrary['connection'] = Connect(myMaterialLibrary['path'])
+    return myMaterialLibrary['connection']
+
+#------------------------------------------------------------------------------
+
+def Material_Record(row):
+    # database row -> dict with the tables as tuples of tuples
+    record = dict(zip(myMaterialColumns, row))
+    for n in myTableColumns:
+        record[n] = tuple(tuple(r) for r in json.loads(record[n]))
+    return record
+
+#------------------------------------------------------------------------------
+
+def Get_Material(grade):
+    # One query per grade and process
+    cache = myMaterialLibrary['cache']
+    if grade not in cache:
+        row = Library_Connection().execute('SELECT %s FROM materials WHERE grade = ?'
+            % ', '.join(myMaterialColumns), (grade,)).fetchone()
+        if row is None:
+            raise ValueError("Unknown material grade %r in %s" % (grade, myMaterialLibrary['path']))
+        cache[grade] = Material_Record(row)
+    return cache[grade]
+
+#------------------------------------------------------------------------------
+
+def Find_Materials(con, fty=None, ftu=None):
+    # Grades with Fty and Ftu in the given (low, high) ranges, by Fty
+    where, args = [], []
+    for column, bounds in (('fty', fty), ('ftu', ftu)):
+        if bounds is not None:
+            where.append('%s BETWEEN ? AND ?' % column)
+            args.extend(bounds)
+    sql = 'SELECT %s FROM materials' % ', '.join(myMaterialColumns)
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    return [Material_Record(r) for r in con.execute(sql + ' ORDER BY fty, ftu, grade', args)]
+
+#------------------------------------------------------------------------------
+
+def Material_Rows(records):
+    # Database rows of material dicts; plastic and damage tables that are
+    # missing are computed for all of them in one vectorized call each
+    missing = [r for r in records if not r.get('plastic')]
+    if missing:
+        true_stress, true_plastic_strain = Plastic_Table(*[[float(r[n]) for r in missing]
+            for n in ('fty', 'ftu', 'sr', 'scu', 'e')])
+        for r, s, p in zip(missing, true_stress, true_plastic_strain):
+            r['plastic'] = Plastic_Table_Rows(s, p)
+    missing = [r for r in records if not r.get('ductile_damage') or not r.get('shear_damage')]
+    if missing:
+        ductile, ks, shear = Damage_Tables([float(r['sr']) for r in missing], myGradeDamageLocus, myGradeDamagePoints)
+        for r, d, s in zip(missing, ductile, shear):
+            if not r.get('ductile_damage'):
+                r['ductile_damage'] = Damage_Table_Rows(d)
+            if not r.get('shear_damage'):
+                r['shear_ks'], r['shear_damage'] = float(ks), Damage_Table_Rows(s)
+    rows = []
+    for r in records:
+        rows.append((str(r['grade']), float(r['fty']), float(r['ftu']), float(r['sr']), float(r['scu']),
+            float(r['e']), float(r['nu']), float(r['density']), json.dumps(r['plastic']),
+            json.dumps(r['ductile_damage']),
+            float(myShearDamageKs if r.get('shear_ks') in (None, '') else r['shear_ks']),
+            json.dumps(r['shear_damage'])))
+    return rows
+
+#------------------------------------------------------------------------------
+
+def Import_Materials(con, records):
+    # Insert or replace the grades in one transaction
+    with con:
+        con.executemany('INSERT OR REPLACE INTO materials (%s) VALUES (%s)' % (', '.join(myMaterialColumns),
+            ', '.join('?'*len(myMaterialColumns))), Material_Rows(records))
+    myMaterialLibrary['cache'].clear()
+    return len(records)
+
+#------------------------------------------------------------------------------
+
+def Read_Material_Csv(csv_path):
+    records = []
+    with open(csv_path) as f:
+        for r in csv.DictReader(f):
+            r = dict((k, v) for k, v in r.items() if v not in (None, ''))
+            for n in myTableColumns:
+                if n in r:
+                    r[n] = json.loads(r[n])
+            records.append(r)
+    return records
+
+#------------------------------------------------------------------------------
+
+def Export_Materials(con, csv_path):
+    records = Find_Materials(con)
+    with open(csv_path, 'w') as f:
+        w = csv.writer(f, lineterminator='\n')
+        w.writerow(myMaterialColumns)
+        for r in records:
+            w.writerow([json.dumps(r[n]) if n in myTableColumns else r[n] for n in myMaterialColumns])
+    return len(records)
+
+#------------------------------------------------------------------------------
+
+def Material_Library_From_Argv(argv):
+    # --materials <db>; materials.db by default
+    if '--materials' in argv:
+        Open_Material_Library(argv[argv.index('--materials') + 1])
+
+#------------------------------------------------------------------------------
+
+def Material_From_Argv(argv):
+    # --material <grade> and --bolt-material <grade> for every row
+    grades = {}
+    for option, key in (('--material', 'material'), ('--bolt-material', 'bolt_material')):
+        if option in argv:
+            grades[key] = argv[argv.index(option) + 1]
+    return grades
+
+#------------------------------------------------------------------------------
+
+def Resolve_Material(myInputs):
+    # The row's inputs with the plate grade's values in place of its own
+    if not myInputs.get('material'):
+        return myInputs
+    m = Get_Material(myInputs['material'])
+    myInputs = dict(myInputs)
+    myInputs.update((n, m[column]) for n, column in myMaterialInputs)
+    return myInputs
+
+#------------------------------------------------------------------------------
+
+def Plate_Tables(myInputs):
+    # (plastic, ductile damage, shear ks, shear damage) tables of the plate:
+    # stored with the grade, or computed from the row's inputs; a damage
+    # locus (myDamageLocus > 0) replaces the fixed or stored damage tables
+    if myInputs.get('material'):
+        m = Get_Material(myInputs['material'])
+        tables = m['plastic'], m['ductile_damage'], m['shear_ks'], m['shear_damage']
+    else:
+        myTrue_Stress, myTrue_Plastic_Strain = Plastic_Table(myInputs['MyFty'], myInputs['MyFtu'],
+            myInputs['MySr'], myInputs['MyScu'], myInputs['myE'])
+        tables = Plastic_Table_Rows(myTrue_Stress, myTrue_Plastic_Strain), myDuctileDamageTable, myShearDamageKs, myShearDamageTable
+    damage = Model_Damage_Tables(myInputs)
+    if damage is not None:
+        tables = (tables[0],) + damage
+    return tables
+
+#------------------------------------------------------------------------------
+
+def Bolt_Tables(myInputs):
+    # (density, E, Poisson's ratio, plastic table or None) of the bolt; without
+    # a bolt grade it is elastic with the plate's constants
+    if myInputs.get('bolt_material'):
+        m = Get_Material(myInputs['bolt_material'])
+        return m['density'], m['e'], m['nu'], m['plastic']
+    return myInputs['myDensity'], myInputs['myE'], myInputs['myPoisonRatio'], None
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Material grades with precomputed plastic and damage tables.')
+    parser.add_argument('--db', default=myMaterialLibraryFile)
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('import')
+    p.add_argument('csv')
+    p = sub.add_parser('export')
+    p.add_argument('csv')
+    p = sub.add_parser('add')
+    p.add_argument('grade')
+    for n in ('fty', 'ftu', 'sr', 'scu', 'e', 'nu', 'density'):
+        p.add_argument('--' + n, type=float)
+    p = sub.add_parser('show')
+    p.add_argument('grade')
+    p = sub.add_parser('find')
+    p.add_argument('--fty', type=float, nargs=2)
+    p.add_argument('--ftu', type=float, nargs=2)
+    args = parser.parse_args(argv[1:])
+
+    con = Connect(args.db)
+    if args.command == 'import':
+        print('%d grades imported into %s' % (Import_Materials(con, Read_Material_Csv(args.csv)), args.db))
+    elif args.command == 'export':
+        print('%d grades written to %s' % (Export_Materials(con, args.csv), args.csv))
+    elif args.command == 'add':
+        # unspecified values are those at the top of p1_core.py
+        from p1_core import Default_Inputs
+        record = dict((column, Default_Inputs()[n]) for n, column in myMaterialInputs)
+        record.update((n, getattr(args, n)) for n in record if getattr(args, n) is not None)
+        record['grade'] = args.grade
+        Import_Materials(con, [record])
+    elif args.command == 'show':
+        Open_Material_Library(args.db)
+        print(json.dumps(Get_Material(args.grade), indent=1, sort_keys=True))
+    elif args.command == 'find':
+        for r in Find_Materials(con, args.fty, args.ftu):
+            print('%-16s Fty %7.1f  Ftu %7.1f  er %5.1f%%  E %9.0f' % (r['grade'], r['fty'], r['ftu'], r['sr'], r['e']))
+    else:
+        parser.print_help()
+        return 2
+    con.close()
+    return 0
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
@@ -0,0 +1,125 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+mesh_convergence.py — Find the cheapest converged mesh for each geometry class
+
+Starts from a coarse global seed (myMeshSize) and hole-edge seed (myEdgeSize)
+and refines both by a fixed ratio. Every level is written with native_inp.py,
+run with the solver command and reduced to ultimate load and initial
+stiffness with curve_capacity.py. Refinement stops once both change by less
+than the tolerance; the coarser of the two agreeing levels is recorded.
+
+Meshes are recorded per geometry class (end distance, half height,
+thickness and clearance relative to the hole diameter) with seed sizes as
+fractions of the hole diameter, so one study covers every geometry of the
+same proportions. The levels are native_inp.py meshes, so each entry
+records writer "native" and only native_inp.py picks it up with
+'--mesh-record <file>'; P1.py meshes with CAE seeding and partitions and
+ignores it.
+
+The solver command must leave <job>_rp1.npz behind, e.g.
+"abaqus job={job} interactive && abaqus python /path/to/odb_extract.py {job}"
+or "python /path/to/standin_solver.py {job} --curve".
+
+Run with:
+python mesh_convergence.py --command "..." [--sweep sweep.csv] [--tol 0.02]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from curve_capacity import Curve_Capacity, Pad_Curves
+from native_inp import Write_Native_Inp
+from output_profile import myOutputProfiles
+from odb_extract import Load_Displacement, Read_Curve
+from scheduler import Sta_Status
+from sweep import Geometry_Class, myMeshRecordFile, Read_Mesh_Record, Read_Sweep_Spec
+from p1_core import Default_Inputs
+
+#------------------------------------------------------------------------------
+
+myMeshWriter = 'native'    #writer whose meshes the recorded sizes are valid for
+
+#------------------------------------------------------------------------------
+
+def Run_Level(directory, job, myInputs, command):
+    # (ultimate load, initial stiffness, elements) of one run; only the RP-1
+    # curve is needed, so keep the ODB lean
+    parts = Write_Native_Inp(os.path.join(directory, job + '.inp'), job, myInputs, output=myOutputProfiles['lean'])
+    cmd = command.format(job=job, input=job + '.inp', cpus=1, memory_mb=4096)
+    returncode = subprocess.call(cmd, shell=True, cwd=directory)
+    if returncode != 0 or Sta_Status(directory, job) == 'failed':
+        raise RuntimeError("Mesh convergence run %s failed" % job)
+    columns, metadata = Read_Curve(os.path.join(directory, job + '_rp1.npz'))
+    result = Curve_Capacity(*Pad_Curves([Load_Displacement(columns)]))
+    return float(result['ultimate_load'][0]), float(result['stiffness'][0]), sum(len(p['elements']) for p in parts.values())
+
+#------------------------------------------------------------------------------
+
+def Run_Convergence(directory, name, myInputs, command, start_mesh_size=4.0, start_edge_size=3.0,
+        refine_ratio=1.5, max_levels=6, tol=0.02):
+    levels = []
+    for level in range(max_levels):
+        myLevelInputs = dict(myInputs)
+        myLevelInputs['myMeshSize'] = start_mesh_size/refine_ratio**level
+        myLevelInputs['myEdgeSize'] = start_edge_size/refine_ratio**level
+        ultimate, stiffness, elements = Run_Level(directory, '%s_mesh%d' % (name, level), myLevelInputs, command)
+        levels.append({'level': level, 'myMeshSize': myLevelInputs['myMeshSize'],
+            'myEdgeSize': myLevelInputs['myEdgeSize'], 'elements': elements,
+            'ultimate_load': ultimate, 'stiffness': stiffness})
+        if len(levels) > 1:
+            prev = levels[-2]
+            if (abs(ultimate - prev['ultimate_load']) <= tol*abs(ultimate) and
+                    abs(stiffness - prev['stiffness']) <= tol*abs(stiffness)):
+                return prev, levels
+    return None, levels
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Mesh convergence study per geometry class.')
+    parser.add_argument('--command', required=True)
+    parser.add_argument('--sweep')
+    parser.add_argument('--directory', default='mesh_convergence')
+    parser.add_argument('--record', default=myMeshRecordFile)
+    parser.add_argument('--tol', type=float, default=0.02)
+    parser.add_argument('--levels', type=int, default=6)
+    parser.add_argument('--start-mesh', type=float, default=4.0)
+    parser.add_argument('--start-edge', type=float, default=3.0)
+    parser.add_argument('--ratio', type=float, default=1.5)
+    args = parser.parse_args(argv[1:])
+
+    myInputs = Default_Inputs()
+    myRows = Read_Sweep_Spec(args.sweep) if args.sweep else [{}]
+    if not os.path.isdir(args.directory):
+        os.makedirs(args.directory)
+    record = Read_Mesh_Record(args.record)
+    for myRow in myRows:
+        myRowInputs = dict(myInputs)
+        myRowInputs.update(myRow)
+        myRowInputs.pop('name', None)
+        myClass = Geometry_Class(myRowInputs)
+        if myClass in record:
+            continue
+        converged, levels = Run_Convergence(args.directory, myClass.replace('.', 'p'), myRowInputs,
+            args.command, args.start_mesh, args.start_edge, args.ratio, args.levels, args.tol)
+        for l in levels:
+            print('%s level %d: mesh %.3g edge %.3g, %d elements, Pu %.6g, K %.6g' % (myClass,
+                l['level'], l['myMeshSize'], l['myEdgeSize'], l['elements'], l['ultimate_load'], l['stiffness']))
+        if converged is None:
+            print('%s did not converge within %d levels' % (myClass, args.levels))
+            continue
+        myArcDia = myRowInputs['myBoltDia'] + myRowInputs['myClearance']
+        record[myClass] = {'writer': myMeshWriter, 'mesh_size_ratio': converged['myMeshSize']/myArcDia,
+            'edge_size_ratio': converged['myEdgeSize']/myArcDia, 'elements': converged['elements'],
+            'levels': levels}
+        with open(args.record, 'w') as f:
+            json.dump(record, f, indent=1, sort_keys=True)
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    Main(sys.argv)
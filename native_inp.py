@@ -0,0 +1,417 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+native_inp.py — CAE-free .inp writer for the P1 plate-with-hole and bolt
+
+Builds the same model as P1.py (quarter plate with a half hole, half-length
+bolt, C3D8R hex mesh) with NumPy only and writes it as an Abaqus input deck
+with the sets, surfaces, contact, material and Loading step P1.py creates:
+RP-1, Plate_Edge, Plate_B_Symmetry, "Z sym surf", Element_NodeSet_1,
+Element_ElementSet_1, BS-1 / PS-1 and Int-1.
+
+The mesh is block structured: an O-grid around the hole (seeded with
+myEdgeSize along the hole edge) and mapped rectangles elsewhere (myMeshSize).
+
+Run with:
+python native_inp.py
+python native_inp.py --sweep sweep.csv
+python native_inp.py --sweep sweep.csv --cache deck_cache
+python native_inp.py --sweep sweep.csv --mesh-record mesh_convergence.json
+python native_inp.py --sweep sweep.csv --patch
+python native_inp.py --sweep sweep.csv --prescreen 1.3
+python native_inp.py --sweep sweep.csv --step-record solver_record.jsonl
+"""
+
+import math
+import sys
+
+import numpy as np
+
+from design_capacity import Prescreen_From_Argv, Prescreen_Sweep
+from step_tuner import Step_Record_From_Argv, Tune_Sweep
+from deck_cache import Cache_Dir_From_Argv, Cache_Max_Bytes_From_Argv, Deck_Key, Write_Cached_Deck
+from stage_profile import End_Model_Profile, Profile_From_Argv, Profiled, Start_Model_Profile
+from explicit_check import myEnergyVariables
+from output_profile import myOutputProfiles, Output_Profile_From_Argv, Output_Request_Lines, Print_Request_Lines
+from material_library import Bolt_Tables, Material_From_Argv, Material_Library_From_Argv, Plate_Tables, Resolve_Material
+from sweep import Converged_Mesh, Mesh_Record_From_Argv, Read_Sweep_Spec, Sweep_File_From_Argv, Sweep_Model_Name, Write_Sweep_Manifest
+from p1_core import Bolt_Offset, Closure_Displacement, Default_Inputs, Gap_Closure, myClosureInitialInc, myClosureMaxNumInc, myJobmodelname
+
+#------------------------------------------------------------------------------
+
+def Divisions(length, size):
+    return max(1, int(math.ceil(length/size - 1e-9)))
+
+#------------------------------------------------------------------------------
+
+def Arc_Points(radius, start_deg, end_deg, n):
+    t = np.radians(np.linspace(start_deg, end_deg, n + 1))
+    return np.column_stack((radius*np.cos(t), radius*np.sin(t)))
+
+#------------------------------------------------------------------------------
+
+def Line_Points(p1, p2, n):
+    t = np.linspace(0.0, 1.0, n + 1)[:, np.newaxis]
+    return (1.0 - t)*np.asarray(p1, dtype=float) + t*np.asarray(p2, dtype=float)
+
+#------------------------------------------------------------------------------
+
+def Map_Block(side_0, side_1, n):
+    # Structured block between two opposite sides with the same number of
+    # points; the grid is (len(side), n + 1, 2) and reproduces both sides exactly
+    eta = (np.arange(n + 1, dtype=float)/n)[np.newaxis, :, np.newaxis]
+    return (1.0 - eta)*side_0[:, np.newaxis, :] + eta*side_1[:, np.newaxis, :]
+
+#------------------------------------------------------------------------------
+
+def Merge_Blocks(blocks):
+    # Shared block edges are built from the same arrays, so coincident nodes
+    # are bitwise equal and can be merged exactly
+    points, quads, offset = [], [], 0
+    for g in blocks:
+        ni, nj = g.shape[0], g.shape[1]
+        ids = offset + np.arange(ni*nj).reshape(ni, nj)
+        quads.append(np.column_stack((ids[:-1, :-1].ravel(), ids[1:, :-1].ravel(),
+            ids[1:, 1:].ravel(), ids[:-1, 1:].ravel())))
+        points.append(g.reshape(-1, 2))
+        offset += ni*nj
+    points = np.vstack(points)
+    quads = np.vstack(quads)
+    coords, inverse = np.unique(np.round(points, 9) + 0.0, axis=0, return_inverse=True)
+    quads = inverse.ravel()[quads]
+    # counter-clockwise seen from +z so the extruded hexes have positive volume
+    x, y = coords[quads, 0], coords[quads, 1]
+    area = (x*np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1)*y).sum(axis=1)
+    quads[area < 0] = quads[area < 0][:, ::-1]
+    return coords, quads
+
+#------------------------------------------------------------------------------
+
+def Plate_Mesh_2D(adia, endL, phalfheight, plength, mesh_size, edge_size_1):
+    r = adia/2.0
+    xr = plength - endL
+    s = min(endL, phalfheight, xr)
+    if s <= r:
+        raise ValueError("Plate is too small around the hole (end length %g, half height %g, hole dia %g)" % (endL, phalfheight, adia))
+    nc = max(Divisions(s, mesh_size), Divisions(r*math.pi/4.0, edge_size_1))
+    nr = Divisions(s - r, mesh_size)
+
+    left_top = Line_Points((0.0, s), (-s, s), nc)
+    left_side = Line_Points((-s, s), (-s, 0.0), nc)
+    right_top = Line_Points((0.0, s), (s, s), nc)
+    right_side = Line_Points((s, s), (s, 0.0), nc)
+    blocks = [
+        Map_Block(Arc_Points(r, 90.0, 135.0, nc), left_top, nr),
+        Map_Block(Arc_Points(r, 135.0, 180.0, nc), left_side, nr),
+        Map_Block(Arc_Points(r, 90.0, 45.0, nc), right_top, nr),
+        Map_Block(Arc_Points(r, 45.0, 0.0, nc), right_side, nr)]
+
+    top_row = [left_top[::-1], right_top[1:]]
+    if endL > s:
+        b = Map_Block(left_side, left_side + (s - endL, 0.0), Divisions(endL - s, mesh_size))
+        blocks.append(b)
+        top_row.insert(0, b[0, ::-1][:-1])
+    if xr > s:
+        b = Map_Block(right_side, right_side + (xr - s, 0.0), Divisions(xr - s, mesh_size))
+        blocks.append(b)
+        top_row.append(b[0, 1:])
+    if phalfheight > s:
+        bottom = np.vstack(top_row)
+        blocks.append(Map_Block(bottom, bottom + (0.0, phalfheight - s), Divisions(phalfheight - s, mesh_size)))
+    return Merge_Blocks(blocks)
+
+#------------------------------------------------------------------------------
+
+def Bolt_Mesh_2D(bdia, mesh_size):
+    # Butterfly O-grid: inner square plus four ring blocks, with node lines on
+    # x = 0 and y = 0 like the two datum-plane partitions of the CAE part
+    r = bdia/2.0
+    a = r/2.0
+    m = max(Divisions(r*math.pi/4.0, mesh_size), Divisions(a, mesh_size))
+    nr = Divisions(r - a, mesh_size)
+    g = Map_Block(Line_Points((-a, -a), (a, -a), 2*m), Line_Points((-a, a), (a, a), 2*m), 2*m)
+    blocks = [g,
+        Map_Block(g[:, -1], Arc_Points(r, 135.0, 45.0, 2*m), nr),
+        Map_Block(g[-1, :], Arc_Points(r, -45.0, 45.0, 2*m), nr),
+        Map_Block(g[:, 0], Arc_Points(r, 225.0, 315.0, 2*m), nr),
+        Map_Block(g[0, :], Arc_Points(r, 225.0, 135.0, 2*m), nr)]
+    return Merge_Blocks(blocks)
+
+#------------------------------------------------------------------------------
+
+def Extrude_Mesh(coords, quads, depth, mesh_size):
+    nz = Divisions(depth, mesh_size)
+    n2 = len(coords)
+    z = np.linspace(0.0, depth, nz + 1)
+    nodes = np.column_stack((np.tile(coords, (nz + 1, 1)), np.repeat(z, n2)))
+    layers = (np.arange(nz)*n2)[:, np.newaxis, np.newaxis]
+    hexes = np.concatenate((quads[np.newaxis] + layers, quads[np.newaxis] + layers + n2), axis=2)
+    return nodes, hexes.reshape(-1, 8), nz
+
+#------------------------------------------------------------------------------
+
+def Side_Faces(coords, quads, nz, on_face):
+    # Element faces S3..S6 (quad edges 1-2, 2-3, 3-4, 4-1) whose two corner
+    # nodes satisfy on_face, for every layer; returns {face label: element ids}
+    hit = on_face(coords)
+    faces = {}
+    for k in range(4):
+        mask = hit[quads[:, k]] & hit[quads[:, (k + 1) % 4]]
+        if mask.any():
+            q = np.nonzero(mask)[0]
+            faces['S%d' % (k + 3)] = (q[np.newaxis, :] + (np.arange(nz)*len(quads))[:, np.newaxis]).ravel() + 1
+    return faces
+
+#------------------------------------------------------------------------------
+
+def Build_Native_Mesh(myInputs):
+    if int(myInputs['myBoltRows']) != 1 or int(myInputs['myBoltGauges']) != 1:
+        raise ValueError("native_inp.py writes single-bolt decks only; use P1.py for bolt patterns")
+    mesh_size = myInputs['myMeshSize']
+    edge_size_1 = myInputs['myEdgeSize']
+    myArcDia = myInputs['myBoltDia'] + myInputs['myClearance']
+    myPlateHalfThickness = myInputs['myPlateThickness']/2.0
+    myEndLength = myInputs['myEndLength']
+    xr = myInputs['myPlateLength'] - myEndLength
+    tol = 1e-6*max(myInputs['myPlateLength'], 1.0)
+
+    c2, q2 = Plate_Mesh_2D(myArcDia, myEndLength, myInputs['myPlateHalfHeight'],
+        myInputs['myPlateLength'], mesh_size, edge_size_1)
+    nodes, elements, nz = Extrude_Mesh(c2, q2, myPlateHalfThickness, mesh_size)
+    left = nodes[:, 0] <= tol
+    plate = {
+        'nodes': nodes, 'elements': elements,
+        'nsets': {
+            'Plate_Edge': np.nonzero(np.abs(nodes[:, 0] - xr) < tol)[0] + 1,
+            'Plate_B_Symmetry': np.nonzero(np.abs(nodes[:, 1]) < tol)[0] + 1,
+            'Z sym surf': np.nonzero(np.abs(nodes[:, 2]) < tol)[0] + 1,
+            'Element_NodeSet_1': np.nonzero(left)[0] + 1},
+        'elsets': {
+            'Element_ElementSet_1': np.nonzero(left[elements].all(axis=1))[0] + 1},
+        'faces': {
+            'PS-1': Side_Faces(c2, q2, nz, lambda c: np.abs(np.hypot(c[:, 0], c[:, 1]) - myArcDia/2.0) < tol)}}
+
+    c2, q2 = Bolt_Mesh_2D(myInputs['myBoltDia'], mesh_size)
+    nodes, elements, nz = Extrude_Mesh(c2, q2, myInputs['myBoltHalfLength'], mesh_size)
+    bolt = {
+        'nodes': nodes, 'elements': elements,
+        'nsets': {'Z sym surf': np.nonzero(np.abs(nodes[:, 2]) < tol)[0] + 1},
+        'elsets': {},
+        'faces': {
+            'BS-1': Side_Faces(c2, q2, nz, lambda c: np.abs(np.hypot(c[:, 0], c[:, 1]) - myInputs['myBoltDia']/2.0) < tol)}}
+    return {'Plate': plate, 'Bolt': bolt}
+
+#------------------------------------------------------------------------------
+
+def Inp_Name(name):
+    return '"%s"' % name if ' ' in name else name
+
+#------------------------------------------------------------------------------
+
+def Write_Ids(f, ids):
+    ids = np.asarray(ids, dtype=int)
+    for i in range(0, len(ids), 16):
+        f.write(', '.join(str(v) for v in ids[i:i + 16]) + '\n')
+
+#------------------------------------------------------------------------------
+
+def Write_Part(f, name, part, section, material, element_del):
+    f.write('**\n*Part, name=%s\n*Node\n' % name)
+    ids = np.arange(1, len(part['nodes']) + 1)
+    np.savetxt(f, np.column_stack((ids, part['nodes'])), fmt=('%d', '%.9g', '%.9g', '%.9g'), delimiter=', ')
+    f.write('*Element, type=C3D8R\n')
+    ids = np.arange(1, len(part['elements']) + 1)
+    np.savetxt(f, np.column_stack((ids, part['elements'] + 1)), fmt='%d', delimiter=', ')
+    f.write('*Nset, nset=%s_1, generate\n 1, %d, 1\n' % (name, len(part['nodes'])))
+    f.write('*Elset, elset=%s_1, generate\n 1, %d, 1\n' % (name, len(part['elements'])))
+    f.write('** Section: %s\n' % section)
+    if element_del:
+        f.write('*Solid Section, elset=%s_1, controls=EC-1, material=%s\n,\n' % (name, material))
+    else:
+        f.write('*Solid Section, elset=%s_1, material=%s\n,\n' % (name, material))
+    f.write('*End Part\n')
+
+#------------------------------------------------------------------------------
+
+def Material_Text(myInputs):
+    # *Material blocks of the bolt and the plate (also patched into decks by
+    # deck_patch.py)
+    myPlastic, myDuctileDamage, myShearKs, myShearDamage = Plate_Tables(myInputs)
+    myBoltDensity, myBoltE, myBoltNu, myBoltPlastic = Bolt_Tables(myInputs)
+    myExplicit = int(myInputs['myExplicit'])
+    lines = ['*Material, name=Bolt\n*Density\n%.9g,\n*Elastic\n%.9g, %.9g\n' % (myBoltDensity, myBoltE, myBoltNu)]
+    if myBoltPlastic:
+        lines.append('*Plastic\n' + ''.join('%.6f, %.9f\n' % row for row in myBoltPlastic))
+    lines.append('*Material, name=Plate\n*Damage Initiation, criterion=DUCTILE\n')
+    lines.append(''.join('%.9g, %.9g, %.9g\n' % tuple(row) for row in myDuctileDamage))
+    if myExplicit:
+        lines.append('*Damage Evolution, type=DISPLACEMENT\n1.,\n')
+    lines.append('*Damage Initiation, criterion=SHEAR, ks=%.9g\n' % myShearKs)
+    lines.append(''.join('%.9g, %.9g, %.9g\n' % tuple(row) for row in myShearDamage))
+    if myExplicit:
+        lines.append('*Damage Evolution, type=DISPLACEMENT\n0.1,\n')
+    lines.append('*Density\n%.9g,\n*Elastic\n%.9g, %.9g\n*Plastic\n' % (myInputs['myDensity'], myInputs['myE'], myInputs['myPoisonRatio']))
+    lines.append(''.join('%.6f, %.9f\n' % row for row in myPlastic))
+    return ''.join(lines)
+
+#------------------------------------------------------------------------------
+
+def Boundary_Text(u1, amplitude=None):
+    # Step boundary conditions with RP-1 moved u1 along x
+    return ('**\n** BOUNDARY CONDITIONS\n**\n** Name: Bolt_Displacement Type: Displacement/Rotation\n*Boundary%s\n'
+        % (', amplitude=%s' % amplitude if amplitude else '')
+        + 'RP-1, 1, 1, %.9g\nRP-1, 2, 2\nRP-1, 3, 3\nRP-1, 4, 4\nRP-1, 5, 5\nRP-1, 6, 6\n' % u1
+        + '** Name: Plate_Edge_Fixed Type: Symmetry/Antisymmetry/Encastre\n*Boundary\nPlate_Edge, ENCASTRE\n'
+        + '** Name: Z Symmetry Type: Symmetry/Antisymmetry/Encastre\n*Boundary\n"Z sym surf", ZSYMM\n')
+
+#------------------------------------------------------------------------------
+
+def Write_Native_Inp(path, model, myInputs, element_del=False, maxdeg=0.99, output=None):
+    parts = Build_Native_Mesh(myInputs)
+    # Explicit: elements are deleted once damaged, so damage evolves
+    myExplicit = int(myInputs['myExplicit'])
+    element_del = element_del or myExplicit
+    output = output or myOutputProfiles['full']
+
+    with open(path, 'w') as f:
+        f.write('*Heading\n** Job name: %s Model name: %s\n** Generated by native_inp.py\n' % (model, model))
+        f.write('*Preprint, echo=NO, model=NO, history=NO, contact=NO\n')
+        f.write('**\n** PARTS\n')
+        Write_Part(f, 'Plate', parts['Plate'], 'Plate CS', 'Plate', element_del)
+        Write_Part(f, 'Bolt', parts['Bolt'], 'Bolt CS', 'Bolt', element_del)
+
+        f.write('**\n** ASSEMBLY\n**\n*Assembly, name=Assembly\n**\n')
+        f.write('*Instance, name=Plate, part=Plate\n*End Instance\n**\n')
+        f.write('*Instance, name=Bolt, part=Bolt\n%.9g, 0., 0.\n*End Instance\n**\n' % Bolt_Offset(myInputs))
+        f.write('*Node\n      1, %.9g, 0., 0.\n*Nset, nset=RP-1\n 1,\n' % Bolt_Offset(myInputs))
+        for instance in ('Plate', 'Bolt'):
+            part = parts[instance]
+            for name in sorted(part['nsets']):
+                f.write('*Nset, nset=%s, instance=%s\n' % (Inp_Name(name), instance))
+                Write_Ids(f, part['nsets'][name])
+            for name in sorted(part['elsets']):
+                f.write('*Elset, elset=%s, instance=%s\n' % (Inp_Name(name), instance))
+                Write_Ids(f, part['elsets'][name])
+            for name in sorted(part['faces']):
+                for face in sorted(part['faces'][name]):
+                    f.write('*Elset, elset=_%s_%s, internal, instance=%s\n' % (name, face, instance))
+                    Write_Ids(f, part['faces'][name][face])
+                f.write('*Surface, type=ELEMENT, name=%s\n' % name)
+                for face in sorted(part['faces'][name]):
+                    f.write('_%s_%s, %s\n' % (name, face, face))
+        f.write('** Constraint: RP_to_Bolt\n*Rigid Body, ref node=RP-1, elset=Bolt.Bolt_1\n')
+        f.write('*End Assembly\n')
+        if element_del:
+            # model-level, shared by both sections
+            f.write('*Section Controls, name=EC-1, ELEMENT DELETION=YES, MAX DEGRADATION=%g%s\n'
+                % (maxdeg, ', hourglass=ENHANCED' if myExplicit else ''))
+
+        f.write('**\n** MATERIALS\n**\n')
+        f.write(Material_Text(myInputs))
+
+        f.write('**\n** INTERACTION PROPERTIES\n**\n*Surface Interaction, name=Intprop-1\n1.,\n')
+        f.write('*Friction%s\n%.9g,\n*Surface Behavior, pressure-overclosure=HARD\n'
+            % ('' if myExplicit else ', slip tolerance=0.005', myInputs['myFriction']))
+        f.write('**\n** BOUNDARY CONDITIONS\n**\n** Name: BC_Symmetry Type: Symmetry/Antisymmetry/Encastre\n')
+        f.write('*Boundary\nPlate_B_Symmetry, YSYMM\n')
+        if myExplicit:
+            f.write('*Amplitude, name=Smooth, definition=SMOOTH STEP\n0., 0., %g, 1.\n' % myInputs['myExplicitTime'])
+        else:
+            f.write('**\n** INTERACTIONS\n**\n** Interaction: Int-1\n')
+            f.write('*Contact Pair, interaction=Intprop-1, type=SURFACE TO SURFACE, adjust=0.0\nPS-1, BS-1\n')
+
+        # Closure: the centred bolt is moved across the clearance into bearing
+        # under stabilised contact, so Loading does not start by cutting back
+        # on the gap; the output requests carry over to Loading
+        myGapClosure = Gap_Closure(myInputs)
+        if myGapClosure:
+            f.write('** ----------------------------------------------------------------\n**\n** STEP: Closure\n**\n')
+            f.write('*Step, name=Closure, nlgeom=YES, inc=%d\n*Static\n%g, 1., %g, 1.\n'
+                % (myClosureMaxNumInc, myClosureInitialInc, myInputs['myMinInc']))
+            f.write('**\n** CONTACT CONTROLS\n**\n*Contact Controls, stabilize\n')
+            f.write(Boundary_Text(-Closure_Displacement(myInputs)))
+            f.write('**\n** OUTPUT REQUESTS\n**\n')
+            f.write(''.join(line + '\n' for line in Output_Request_Lines(output, myInputs['myTimeInterval'])))
+            f.write('*End Step\n')
+        f.write('** ----------------------------------------------------------------\n**\n** STEP: Loading\n**\n')
+        if myExplicit:
+            f.write('*Step, name=Loading, nlgeom=YES\n*Dynamic, Explicit\n, %g\n*Bulk Viscosity\n0.06, 1.2\n' % myInputs['myExplicitTime'])
+            f.write('** Mass Scaling: Semi-Automatic\n**               Whole Model\n')
+            f.write('*Fixed Mass Scaling, dt=%g, type=below min\n' % myInputs['myTargetStableInc'])
+        else:
+            f.write('*Step, name=Loading, nlgeom=YES, inc=%d\n' % int(myInputs['myMaxNumInc']))
+            f.write('*Dynamic, application=QUASI-STATIC, initial=NO\n%g, 1., %g, %g\n' % (myInputs['myInitialInc'], myInputs['myMinInc'], myInputs['myMaxInc']))
+        if myGapClosure:
+            f.write('**\n** CONTACT CONTROLS\n**\n*Contact Controls, reset\n')
+        f.write(Boundary_Text(-myInputs['myDisplacement'], 'Smooth' if myExplicit else None))
+        if myExplicit:
+            f.write('**\n** INTERACTIONS\n**\n** Interaction: Int-1\n')
+            f.write('*Contact Pair, interaction=Intprop-1, mechanical constraint=PENALTY, cpset=Int-1\nPS-1, BS-1\n')
+        myRestartFrequency = int(myInputs['myRestartFrequency'])
+        if myExplicit:
+            # restart data at myRestartFrequency intervals of the step (one at the end if 0)
+            f.write('**\n** OUTPUT REQUESTS\n**\n*Restart, write, number interval=%d, time marks=NO%s\n'
+                % (max(myRestartFrequency, 1), ', overlay' if myRestartFrequency else ''))
+        else:
+            f.write('**\n** OUTPUT REQUESTS\n**\n*Restart, write, %sfrequency=%d\n' % ('overlay, ' if myRestartFrequency else '', myRestartFrequency))
+        if not myGapClosure:
+            f.write(''.join(line + '\n' for line in Output_Request_Lines(output, myInputs['myTimeInterval'])))
+        if not myExplicit:
+            f.write(''.join(line + '\n' for line in Print_Request_Lines(output)))
+        if myExplicit and not any(r['variables'] == 'PRESELECT' for r in output['history']):
+            # energies for the quasi-static check (explicit_check.py)
+            f.write('** HISTORY OUTPUT: H-Energy\n*Output, history, time interval=%g\n*Energy Output\n%s\n'
+                % (myInputs['myTimeInterval'], ', '.join(sorted(myEnergyVariables))))
+        f.write('*End Step\n')
+    return parts
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    myInputs = Default_Inputs()
+    Material_Library_From_Argv(argv)
+    myInputs.update(Material_From_Argv(argv))
+    mySweepFile = Sweep_File_From_Argv(argv)
+    myCacheDir = Cache_Dir_From_Argv(argv)
+    myCacheMaxBytes = Cache_Max_Bytes_From_Argv(argv)
+    myMeshRecord = Mesh_Record_From_Argv(argv)
+    myProfileLog = Profile_From_Argv(argv)
+    myOutputProfile = Output_Profile_From_Argv(argv)
+    # deck_patch.py imports this module for Material_Text
+    from deck_patch import Patch_From_Argv, Template_Key, Write_Deck_From_Template
+    myTemplates = {} if Patch_From_Argv(argv) else None
+    if myProfileLog:
+        for myStage in ('Write_Native_Inp', 'Build_Native_Mesh', 'Plate_Tables', 'Write_Part'):
+            globals()[myStage] = Profiled(globals()[myStage])
+    myNames, myRows = [], []
+    for myIndex, myRow in enumerate([{}] if mySweepFile is None else Read_Sweep_Spec(mySweepFile)):
+        myRowInputs = dict(myInputs)
+        myRowInputs.update(myRow)
+        myRowInputs.pop('name', None)
+        myRowInputs = Resolve_Material(myRowInputs)
+        myRowInputs.update(Converged_Mesh(myMeshRecord, myRowInputs))
+        myNames.append(myJobmodelname if mySweepFile is None else Sweep_Model_Name(myJobmodelname, myIndex, myRow))
+        myRows.append(myRowInputs)
+    if mySweepFile is not None:
+        myNames, myRows = Prescreen_Sweep(Prescreen_From_Argv(argv), myNames, myRows, myJobmodelname + '_prescreen.csv')
+    myRows = Tune_Sweep(Step_Record_From_Argv(argv), myRows)
+    for myName, myRowInputs in zip(myNames, myRows):
+        if myProfileLog:
+            Start_Model_Profile(myProfileLog, myName)
+        myParts = []
+        myWrite = lambda: Write_Cached_Deck(myCacheDir, Deck_Key(myRowInputs, 'native', myOutputProfile), myName + '.inp',
+            lambda: myParts.append(Write_Native_Inp(myName + '.inp', myName, myRowInputs, output=myOutputProfile)), myCacheMaxBytes)
+        if myTemplates is None:
+            myWrite()
+        else:
+            Write_Deck_From_Template(myTemplates, Template_Key(myRowInputs, 'native', myOutputProfile), myName + '.inp',
+                myName, myRowInputs, myWrite)
+        End_Model_Profile(sum(len(p['elements']) for p in myParts[0].values()) if myParts else None,
+            sum(len(p['nodes']) for p in myParts[0].values()) if myParts else None, myName + '.inp')
+    if mySweepFile is not None:
+        Write_Sweep_Manifest(myJobmodelname + '_sweep_manifest.csv', myNames, myRows)
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    Main(sys.argv)
@@ -0,0 +1,170 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+odb_extract.py — Stream the RP-1 load–displacement curve out of P1 ODBs
+
+Reads U1 and RF1 of the RP-1 reference point, and optionally the maximum and
+mean PEEQ over Element_ElementSet_1, one frame at a time, and writes them as
+float32 columns to <job>_rp1.npz plus a small <job>_rp1.json metadata record.
+Only the subsets of each frame are touched, so memory does not grow with the
+size of the ODB. When the ODB has RP-1 history output (the lean output
+profile), the curve is read from it instead of the field frames; PEEQ then
+comes from the field frames with its own PEEQ_time column. The curve covers
+every step (a Closure step, then Loading) and the metadata records the slip
+offset: the bolt travel before the load reaches mySlipLoadFraction of its
+peak.
+
+The extractor only uses the ODB object model (odb.steps[...].frames,
+frame.fieldOutputs[...].getSubset(region=...).values / .bulkDataBlocks,
+odb.rootAssembly.nodeSets / elementSets), so any object that provides those
+attributes can stand in for an ODB opened with odbAccess.
+
+Run with:
+abaqus python odb_extract.py P1 [P1_00002 ...] [--peeq]
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+#------------------------------------------------------------------------------
+
+myCurveColumns = ('time', 'U1', 'RF1')
+myPeeqColumns = ('PEEQ_max', 'PEEQ_mean')
+mySlipLoadFraction = 0.01   #load, of the peak, that marks the start of bearing
+
+#------------------------------------------------------------------------------
+
+def Open_Odb(odb_path):
+    from odbAccess import openOdb
+    return openOdb(path=odb_path, readOnly=True)
+
+#------------------------------------------------------------------------------
+
+def Read_Rp_Frames(odb, rp_set='RP-1', element_set='Element_ElementSet_1', peeq=False, steps=None, rp_values=True):
+    # Yields one dict per frame: time (total), U1, RF1 and optionally PEEQ_max / PEEQ_mean
+    a = odb.rootAssembly
+    rp = a.nodeSets[rp_set.upper()]
+    elset = a.elementSets[element_set.upper()] if peeq else None
+    for step_name in (steps or odb.steps.keys()):
+        step = odb.steps[step_name]
+        for frame in step.frames:
+            record = {'time': step.totalTime + frame.frameValue}
+            if rp_values:
+                record['U1'] = frame.fieldOutputs['U'].getSubset(region=rp).values[0].data[0]
+                record['RF1'] = frame.fieldOutputs['RF'].getSubset(region=rp).values[0].data[0]
+            if peeq:
+                blocks = frame.fieldOutputs['PEEQ'].getSubset(region=elset).bulkDataBlocks
+                data = np.concatenate([np.asarray(b.data, dtype=float).ravel() for b in blocks])
+                record['PEEQ_max'] = data.max() if data.size else 0.0
+                record['PEEQ_mean'] = data.mean() if data.size else 0.0
+            yield record
+
+#------------------------------------------------------------------------------
+
+def Read_Rp_History(odb, rp_set='RP-1', steps=None):
+    # {time, U1, RF1} lists from the RP history output, None without it
+    node = odb.rootAssembly.nodeSets[rp_set.upper()].nodes[0][0]
+    region = 'Node %s.%d' % (node.instanceName or 'ASSEMBLY', node.label)
+    columns = dict((n, []) for n in myCurveColumns)
+    for step_name in (steps or odb.steps.keys()):
+        step = odb.steps[step_name]
+        if region not in step.historyRegions.keys():
+            return None
+        outputs = step.historyRegions[region].historyOutputs
+        if 'U1' not in outputs.keys() or 'RF1' not in outputs.keys():
+            return None
+        u = np.asarray(outputs['U1'].data, dtype=float)
+        rf = np.asarray(outputs['RF1'].data, dtype=float)
+        columns['time'].extend(step.totalTime + u[:, 0])
+        columns['U1'].extend(u[:, 1])
+        columns['RF1'].extend(rf[:, 1])
+    return columns
+
+#------------------------------------------------------------------------------
+
+def Write_Curve(curve_path, columns, metadata):
+    # columns: {name: 1-D sequence}; stored as float32 in <name>.npz + <name>.json
+    base = os.path.splitext(curve_path)[0]
+    arrays = dict((k, np.asarray(v, dtype=np.float32)) for k, v in columns.items())
+    np.savez_compressed(base + '.npz', **arrays)
+    metadata = dict(metadata)
+    metadata['columns'] = sorted(arrays)
+    metadata['frames'] = int(len(arrays['time'])) if 'time' in arrays else 0
+    with open(base + '.json', 'w') as f:
+        json.dump(metadata, f, indent=1, sort_keys=True)
+
+#------------------------------------------------------------------------------
+
+def Read_Curve(curve_path):
+    base = os.path.splitext(curve_path)[0]
+    with np.load(base + '.npz') as data:
+        columns = dict((k, data[k]) for k in data.files)
+    with open(base + '.json') as f:
+        metadata = json.load(f)
+    return columns, metadata
+
+#------------------------------------------------------------------------------
+
+def Load_Displacement(columns):
+    # The bolt is pulled towards -x, so flip the signs for a positive curve
+    return -columns['U1'], -columns['RF1']
+
+#------------------------------------------------------------------------------
+
+def Slip_Offset(columns, fraction=mySlipLoadFraction):
+    # Bolt travel before the load first reaches fraction of its peak: the
+    # clearance taken up before bearing (with or without a Closure step)
+    d, p = Load_Displacement(columns)
+    d, p = np.asarray(d, dtype=float), np.asarray(p, dtype=float)
+    if not len(p) or p.max() <= 0:
+        return None
+    return float(d[np.argmax(p >= fraction*p.max())])
+
+#------------------------------------------------------------------------------
+
+def Extract_Curve(odb, curve_path, job, peeq=False, steps=None, metadata=None):
+    history = Read_Rp_History(odb, steps=steps)
+    if history is None:
+        names = myCurveColumns + (myPeeqColumns if peeq else ())
+        columns = dict((n, []) for n in names)
+        for record in Read_Rp_Frames(odb, peeq=peeq, steps=steps):
+            for n in names:
+                columns[n].append(record[n])
+    else:
+        columns = history
+        if peeq:
+            columns.update(dict((n, []) for n in ('PEEQ_time',) + myPeeqColumns))
+            for record in Read_Rp_Frames(odb, peeq=True, steps=steps, rp_values=False):
+                columns['PEEQ_time'].append(record['time'])
+                for n in myPeeqColumns:
+                    columns[n].append(record[n])
+    record = {'job': job, 'rp_set': 'RP-1', 'steps': list(steps or odb.steps.keys()),
+        'source': 'field' if history is None else 'history'}
+    if peeq:
+        record['element_set'] = 'Element_ElementSet_1'
+    record['slip_offset'] = Slip_Offset(dict((n, np.asarray(columns[n])) for n in ('U1', 'RF1')))
+    record.update(metadata or {})
+    Write_Curve(curve_path, columns, record)
+    return columns
+
+#------------------------------------------------------------------------------
+
+def Extract_Job(job, directory='.', peeq=False):
+    odb_path = os.path.join(directory, job + '.odb')
+    odb = Open_Odb(odb_path)
+    try:
+        return Extract_Curve(odb, os.path.join(directory, job + '_rp1'), job, peeq,
+            metadata={'odb': os.path.abspath(odb_path), 'odb_bytes': os.path.getsize(odb_path)})
+    finally:
+        odb.close()
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    myPeeq = '--peeq' in sys.argv
+    for myJob in [a for a in sys.argv[1:] if not a.startswith('--')]:
+        myColumns = Extract_Job(myJob, peeq=myPeeq)
+        print('%s: slip offset %s' % (myJob, Slip_Offset(dict((n, np.asarray(myColumns[n])) for n in ('U1', 'RF1')))))
@@ -0,0 +1,121 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+output_profile.py — Field and history output profiles for the Loading step
+
+A profile is a dict of output requests:
+
+  {"name": "lean",
+   "field":   [{"region": "Element_ElementSet_1", "variables": ["S", "PEEQ"], "interval": 0.1}, ...],
+   "history": [{"region": "RP-1", "variables": ["U1", "RF1"], "interval": 0.005}],
+   "print":   [{"region": "RP-1", "variables": ["U1", "RF1"], "frequency": 1}]}
+
+A request without "region" covers the whole model; without "interval" it
+uses myTimeInterval. "PRESELECT" as the variables asks for Abaqus' default
+set. "print" requests (optional, Abaqus/Standard only) write node values to
+the .dat file every "frequency" increments, where they can be read while the
+job runs. Built in:
+
+  full  every field variable of the original script over the whole model and
+        the preselected history output, every myTimeInterval
+  lean  RF1/U1 of RP-1 as history output at a fine interval, stress and PEEQ
+        on Element_ElementSet_1 and U on Element_NodeSet_1 at a coarse
+        interval; odb_extract.py reads the curve from the RP-1 history
+  monitor  lean, with U1/RF1 of RP-1 printed every increment for
+           job_monitor.py
+
+Any other profile is read from a JSON file of the form above.
+
+Run with:
+abaqus cae noGUI=P1.py -- --sweep sweep.csv --output-profile lean
+python native_inp.py --output-profile my_profile.json
+"""
+
+import json
+
+#------------------------------------------------------------------------------
+
+myOutputProfiles = {
+    'full': {'name': 'full',
+        'field': [{'variables': ['S', 'PE', 'PEEQ', 'PEMAG', 'LE', 'U', 'V', 'A', 'RF', 'CF', 'CSTRESS', 'CDISP', 'EVOL']}],
+        'history': [{'variables': 'PRESELECT'}]},
+    'lean': {'name': 'lean',
+        'field': [{'region': 'Element_ElementSet_1', 'variables': ['S', 'PEEQ'], 'interval': 0.1},
+            {'region': 'Element_NodeSet_1', 'variables': ['U'], 'interval': 0.1}],
+        'history': [{'region': 'RP-1', 'variables': ['U1', 'RF1'], 'interval': 0.005}]},
+}
+# 'print' is a keyword in Python 2.7, so not a keyword argument
+myOutputProfiles['monitor'] = dict(myOutputProfiles['lean'], **{'name': 'monitor',
+    'print': [{'region': 'RP-1', 'variables': ['U1', 'RF1'], 'frequency': 1}]})
+
+# Output keyword each variable belongs to in a deck
+myNodeVariables = ('U', 'V', 'A', 'RF', 'CF', 'RT', 'UR', 'COORD',
+    'U1', 'U2', 'U3', 'RF1', 'RF2', 'RF3', 'UR1', 'UR2', 'UR3', 'RM1', 'RM2', 'RM3')
+myContactVariables = ('CSTRESS', 'CDISP', 'CFORCE', 'CNAREA', 'CSTATUS', 'COPEN', 'CSLIP')
+
+#------------------------------------------------------------------------------
+
+def Read_Output_Profile(name_or_path):
+    if name_or_path in myOutputProfiles:
+        return myOutputProfiles[name_or_path]
+    with open(name_or_path) as f:
+        profile = json.load(f)
+    profile.setdefault('name', name_or_path)
+    for kind in ('field', 'history'):
+        for request in profile.setdefault(kind, []):
+            if request['variables'] != 'PRESELECT' and not request['variables']:
+                raise ValueError("Output request without variables in %s" % name_or_path)
+    return profile
+
+#------------------------------------------------------------------------------
+
+def Output_Profile_From_Argv(argv):
+    # --output-profile full|lean|<file.json>; full by default
+    if '--output-profile' in argv:
+        return Read_Output_Profile(argv[argv.index('--output-profile') + 1])
+    return myOutputProfiles['full']
+
+#------------------------------------------------------------------------------
+
+def Split_Variables(variables):
+    # (node, element, contact) variables of a request, each sorted
+    node = sorted(v for v in variables if v in myNodeVariables)
+    contact = sorted(v for v in variables if v in myContactVariables)
+    element = sorted(v for v in variables if v not in myNodeVariables and v not in myContactVariables)
+    return node, element, contact
+
+#------------------------------------------------------------------------------
+
+def Output_Request_Lines(profile, time_interval):
+    # Keyword lines of the profile's requests for an .inp step
+    lines = []
+    for kind in ('field', 'history'):
+        for k, request in enumerate(profile[kind]):
+            interval = request.get('interval') or time_interval
+            lines.append('** %s OUTPUT: %s-Output-%d' % (kind.upper(), kind[0].upper(), k + 1))
+            if request['variables'] == 'PRESELECT':
+                lines.append('*Output, %s, variable=PRESELECT, time interval=%g' % (kind, interval))
+                continue
+            lines.append('*Output, %s, time interval=%g' % (kind, interval))
+            node, element, contact = Split_Variables(request['variables'])
+            region = request.get('region')
+            if node:
+                lines.append('*Node Output' + (', nset=%s' % region if region else ''))
+                lines.append(', '.join(node))
+            if element:
+                lines.append('*Element Output' + (', elset=%s' % region if region else '') + ', directions=YES')
+                lines.append(', '.join(element))
+            if contact:
+                lines.append('*Contact Output')
+                lines.append(', '.join(contact))
+    return lines
+
+#------------------------------------------------------------------------------
+
+def Print_Request_Lines(profile):
+    # *Node Print lines of the profile's print requests (Abaqus/Standard)
+    lines = []
+    for request in profile.get('print', []):
+        lines.append('*Node Print, nset=%s, frequency=%d' % (request['region'], request.get('frequency', 1)))
+        lines.append(', '.join(request['variables']))
+    return lines
@@ -0,0 +1,780 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+p1_abaqus.py — Abaqus/CAE adapter of the P1 model: geometry, mesh, steps and job
+
+The CAE functions of P1.py and Build_Model(), which builds one model and its
+job from a dict of the inputs in p1_core.py. The Abaqus modules are imported
+by Load_Abaqus() on the first build, not when this module is imported, so the
+module loads in plain CPython; building a model still needs Abaqus/CAE.
+
+Run with:
+abaqus cae noGUI=P1.py
+"""
+
+import importlib
+import os
+import sys
+
+from material_library import Bolt_Tables, Plate_Tables
+from geometry_index import Arcs_On_Cylinder, Build_Edge_Index, Build_Face_Index, Faces_On_Cylinder, Faces_On_Plane
+from stage_profile import Profiled
+from output_profile import Print_Request_Lines
+from p1_core import Bolt_Offset, Bolt_Records, Closure_Displacement, Gap_Closure, Model_Holes, myArcX, myArcY, myClosureInitialInc, myClosureMaxNumInc, myMaterialName_1, myMaterialName_2, myPart_1, myPart_2
+
+#------------------------------------------------------------------------------
+
+# Kernel modules a CAE replay file imports
+myAbaqusModules = ('section', 'regionToolset', 'displayGroupMdbToolset', 'part', 'material', 'assembly', 'step',
+    'interaction', 'load', 'mesh', 'optimization', 'job', 'sketch', 'visualization', 'xyPlot',
+    'displayGroupOdbToolset', 'connectorBehavior')
+
+#------------------------------------------------------------------------------
+
+# from abaqus import * and from abaqusConstants import * into this module,
+# once, on the first call
+def Load_Abaqus():
+    if 'mdb' in globals():
+        return
+    try:
+        import abaqus
+        import abaqusConstants
+    except ImportError:
+        raise ImportError("P1 models are built in Abaqus/CAE (abaqus cae noGUI=P1.py); "
+            "use native_inp.py to write decks without it")
+    for module in (abaqus, abaqusConstants):
+        names = getattr(module, '__all__', None) or [n for n in dir(module) if not n.startswith('_')]
+        globals().update((n, getattr(module, n)) for n in names)
+    for name in myAbaqusModules:
+        importlib.import_module(name)
+    globals()['mesh'] = sys.modules['mesh']
+
+#------------------------------------------------------------------------------
+
+#------------------------------------------------------------------------------
+
+def Cae_File_Save(savefilelocation):
+    mdb.saveAs(
+        pathName=savefilelocation)
+
+#------------------------------------------------------------------------------
+
+def Create_Inp_File(model):
+    mdb.jobs[model].writeInput(consistencyChecking=OFF)
+
+#------------------------------------------------------------------------------
+
+def Create_ARC_Point_Solid_line_Create_Plate(model,part,ax,ay,adia,endL,phalfheight,plength,pthickness):
+    s1 = mdb.models[model].ConstrainedSketch(name='__profile__', sheetSize=200.0)
+    g, v, d, c = s1.geometry, s1.vertices, s1.dimensions, s1.constraints
+    s1.setPrimaryObject(option=STANDALONE)
+    s1.ArcByCenterEnds(center=(ax, ay), point1=(-adia/2, ay), point2=(adia/2, ay),
+        direction=CLOCKWISE)
+    s1.Spot(point=(-endL, ay))
+    s1.Spot(point=(-endL, phalfheight))
+    s1.Spot(point=(plength-endL, phalfheight))
+    s1.Spot(point=(plength-endL, ay))
+    s1.Line(point1=(adia/2, ay), point2=(plength - endL, ay))
+    s1.HorizontalConstraint(entity=g[3], addUndoState=False)
+    s1.PerpendicularConstraint(entity1=g[2], entity2=g[3], addUndoState=False)
+    s1.Line(point1=(plength - endL, ay), point2=(plength - endL, phalfheight))
+    s1.VerticalConstraint(entity=g[4], addUndoState=False)
+    s1.PerpendicularConstraint(entity1=g[3], entity2=g[4], addUndoState=False)
+    s1.Line(point1=(plength - endL, phalfheight), point2=(-endL, phalfheight))
+    s1.HorizontalConstraint(entity=g[5], addUndoState=False)
+    s1.PerpendicularConstraint(entity1=g[4], entity2=g[5], addUndoState=False)
+    s1.Line(point1=(-endL, phalfheight), point2=(-endL, ay))
+    s1.VerticalConstraint(entity=g[6], addUndoState=False)
+    s1.PerpendicularConstraint(entity1=g[5], entity2=g[6], addUndoState=False)
+    s1.Line(point1=(-endL, ay), point2=(-adia/2, ay))
+    s1.HorizontalConstraint(entity=g[7], addUndoState=False)
+    s1.PerpendicularConstraint(entity1=g[6], entity2=g[7], addUndoState=False)
+    p = mdb.models[model].Part(name=part, dimensionality=THREE_D, type=DEFORMABLE_BODY)
+    p = mdb.models[model].parts[part]
+    p.BaseSolidExtrude(sketch=s1, depth=pthickness)
+    s1.unsetPrimaryObject()
+    del mdb.models[model].sketches['__profile__']
+
+#------------------------------------------------------------------------------
+
+
+def Create_Plate_With_Holes(model,part,holes,adia,endL,phalfheight,plength,pthickness,ay=0.0):
+    # Half plate with the holes of a bolt pattern: half holes on y = ay are
+    # arcs of the outline, the others full circles inside it
+    s1 = mdb.models[model].ConstrainedSketch(name='__profile__', sheetSize=200.0)
+    s1.setPrimaryObject(option=STANDALONE)
+    r = adia/2
+    x0 = -endL
+    for x in sorted(hx for hx, hy in holes if hy == ay):
+        s1.Line(point1=(x0, ay), point2=(x - r, ay))
+        s1.ArcByCenterEnds(center=(x, ay), point1=(x - r, ay), point2=(x + r, ay), direction=CLOCKWISE)
+        x0 = x + r
+    s1.Line(point1=(x0, ay), point2=(plength - endL, ay))
+    s1.Line(point1=(plength - endL, ay), point2=(plength - endL, phalfheight))
+    s1.Line(point1=(plength - endL, phalfheight), point2=(-endL, phalfheight))
+    s1.Line(point1=(-endL, phalfheight), point2=(-endL, ay))
+    for x, y in holes:
+        if y != ay:
+            s1.CircleByCenterPerimeter(center=(x, y), point1=(x + r, y))
+    p = mdb.models[model].Part(name=part, dimensionality=THREE_D, type=DEFORMABLE_BODY)
+    p = mdb.models[model].parts[part]
+    p.BaseSolidExtrude(sketch=s1, depth=pthickness)
+    s1.unsetPrimaryObject()
+    del mdb.models[model].sketches['__profile__']
+
+#------------------------------------------------------------------------------
+
+
+def Create_Bolt(model,part,ax, ay,bdia,blength):
+    s = mdb.models[model].ConstrainedSketch(name='__profile__', 
+        sheetSize=200.0)
+    g, v, d, c = s.geometry, s.vertices, s.dimensions, s.constraints
+    s.setPrimaryObject(option=STANDALONE)
+    s.CircleByCenterPerimeter(center=(ax, ay), point1=(-bdia/2, ay))
+    p = mdb.models[model].Part(name=part, dimensionality=THREE_D, 
+        type=DEFORMABLE_BODY)
+    p = mdb.models[model].parts[part]
+    p.BaseSolidExtrude(sketch=s, depth=blength)
+    s.unsetPrimaryObject()
+    del mdb.models[model].sketches['__profile__']
+
+#------------------------------------------------------------------------------
+
+
+def Plate_material(model,platematerial,density,emodulas,pratio,plastic,ductile_damage,shear_ks,shear_damage,damage_evolution=False):
+    mdb.models[model].Material(name=platematerial)
+    mdb.models[model].materials[platematerial].Density(table=((density, ), 
+        ))
+    mdb.models[model].materials[platematerial].Elastic(table=((emodulas, 
+        pratio), ))
+    mdb.models[model].materials[platematerial].Plastic(table=plastic)
+    mdb.models[model].materials[platematerial].DuctileDamageInitiation(
+        table=ductile_damage)
+    if damage_evolution:
+        mdb.models[model].materials[platematerial].ductileDamageInitiation.DamageEvolution(
+            type=DISPLACEMENT, table=((1.0, ), ))
+    mdb.models[model].materials[platematerial].ShearDamageInitiation(
+        ks=shear_ks, table=shear_damage)
+    if damage_evolution:
+        mdb.models[model].materials[platematerial].shearDamageInitiation.DamageEvolution(
+            type=DISPLACEMENT, table=((0.1, ), ))
+
+#------------------------------------------------------------------------------ 
+
+
+def Bolt_materials(model,boltmaterial,boltdensity,emodulas,pratio,plastic=None):
+    mdb.models[model].Material(name=boltmaterial)
+    mdb.models[model].materials[boltmaterial].Density(table=((boltdensity, ), 
+        ))
+    mdb.models[model].materials[boltmaterial].Elastic(table=((emodulas, 
+        pratio), ))
+    if plastic:
+        mdb.models[model].materials[boltmaterial].Plastic(table=plastic)
+
+#------------------------------------------------------------------------------
+
+
+def Create_Section(model,crosssection,material):
+    mdb.models[model].HomogeneousSolidSection(name=crosssection, material=material, thickness=None)
+
+#------------------------------------------------------------------------------
+
+# Create_Datum_Plane
+def Create_Datum_Plane(type_plane,part,model,offset_plane):
+    p = mdb.models[model].parts[part]
+    myPlane = p.DatumPlaneByPrincipalPlane(principalPlane=type_plane, offset=offset_plane)
+    myID = myPlane.id
+    return myID
+
+#------------------------------------------------------------------------------
+
+
+def Create_Partion(model,part,id_plane):
+    p = mdb.models[model].parts[part]
+    c = p.cells[:]
+    d = p.datums
+    p.PartitionCellByDatumPlane(datumPlane=d[id_plane], cells=c)
+
+#------------------------------------------------------------------------------
+
+def Section_Assignment(model,part,set_name,section_name):
+    p = mdb.models[model].parts[part]
+    c = p.cells[:]
+    region = p.Set(cells=c, name=set_name)
+    p.SectionAssignment(region=region, sectionName=section_name, offset=0.0, 
+        offsetType=MIDDLE_SURFACE, offsetField='', 
+        thicknessAssignment=FROM_SECTION)
+
+#------------------------------------------------------------------------------
+
+def Assemply(model,part,instance,x,y,z,dependent):
+    a = mdb.models[model].rootAssembly
+    p = mdb.models[model].parts[part]
+    a.Instance(name=instance, part=p, dependent=dependent)
+    p =a.instances[instance]
+    p.translate(vector=(x,y,z))
+
+#------------------------------------------------------------------------------
+
+# Face/edge index of an instance for geometric selection (see geometry_index.py);
+# index_name keeps several indexes of one instance, e.g. one per hole centre
+myGeometryIndex = {}
+myInstanceRecords = {}
+
+def Index_Instance(model,instance,cx,cy,index_name=None):
+    if (model,instance) not in myInstanceRecords:
+        a = mdb.models[model].rootAssembly
+        f1 = a.instances[instance].faces
+        e1 = a.instances[instance].edges
+        v1 = a.instances[instance].vertices
+        # getCentroid() comes back as ((x, y, z),) in some releases
+        faces = [(f.index, f.pointOn[0], f.getNormal(), f.getCentroid()) for f in f1]
+        faces = [(i, p, n, c[0] if len(c) == 1 else c) for i, p, n, c in faces]
+        edges = [(e.index, e.pointOn[0], tuple(v1[i].pointOn[0] for i in e.getVertices())) for e in e1]
+        myInstanceRecords[(model,instance)] = (faces, edges)
+    faces, edges = myInstanceRecords[(model,instance)]
+    myGeometryIndex[(model,index_name or instance)] = (Build_Face_Index(faces,(cx,cy)), Build_Edge_Index(edges,(cx,cy)))
+
+def Clear_Geometry_Index(model):
+    for d in (myGeometryIndex, myInstanceRecords):
+        for key in [k for k in d if k[0] == model]:
+            del d[key]
+
+def Face_Sequence(array,indices,what):
+    if not indices:
+        raise ValueError("No %s found" % what)
+    seq = array[indices[0]:indices[0]+1]
+    for i in indices[1:]:
+        seq = seq + array[i:i+1]
+    return seq
+
+
+#------------------------------------------------------------------------------
+
+def Create_Reference_Point(x,y,z,model,setname):
+    a = mdb.models[model].rootAssembly
+    myRP = a.ReferencePoint(point=(x, y, z))
+    r = a.referencePoints
+    myRP_Position = r.findAt((x, y, z),)    
+    refPoints1=(myRP_Position, )
+    a.Set(referencePoints=refPoints1, name=setname)
+    return myRP,myRP_Position
+#------------------------------------------------------------------------------
+
+def Create_Interaction_Coupling(model,instance,rp_name,bolt_set,rigidbody_name):
+    a = mdb.models[model].rootAssembly
+    region1=a.sets[rp_name]
+    region2=a.instances[instance].sets[bolt_set]
+    mdb.models[model].RigidBody(name=rigidbody_name, refPointRegion=region1, bodyRegion=region2)
+#------------------------------------------------------------------------------
+
+
+
+def Create_Step(model,pre_step_name,step_name,nlg_on_off,max_num_inc,initial_inc,min_inc,max_inc):
+    a = mdb.models[model].ImplicitDynamicsStep(name=step_name, previous=pre_step_name, application=QUASI_STATIC, nohaf=OFF, amplitude=RAMP, alpha=DEFAULT, initialConditions=OFF, nlgeom=nlg_on_off)
+    a = mdb.models[model].steps[step_name].setValues(maxNumInc=max_num_inc, initialInc=initial_inc, minInc=min_inc, maxInc=max_inc)
+
+#------------------------------------------------------------------------------
+
+# Closure step: static, moves the bolts into bearing before Loading
+def Create_Closure_Step(model,pre_step_name,step_name,max_num_inc,initial_inc,min_inc):
+    mdb.models[model].StaticStep(name=step_name, previous=pre_step_name, nlgeom=ON, maxNumInc=max_num_inc, initialInc=initial_inc, minInc=min_inc, maxInc=1.0)
+
+# Automatic contact stabilisation of the interactions in the Closure step only
+def Create_Closure_Contact_Controls(model,interactions,closure_step,next_step):
+    mdb.models[model].StdContactControl(name='Closure-Stabilize', stabilizeChoice=AUTOMATIC)
+    for name in interactions:
+        mdb.models[model].interactions[name].setValuesInStep(stepName=closure_step, contactControls='Closure-Stabilize')
+        mdb.models[model].interactions[name].setValuesInStep(stepName=next_step, contactControls='')
+
+#------------------------------------------------------------------------------
+
+# Explicit Loading step: semi-automatic mass scaling to the target stable
+# increment at the start, displacement applied with a smooth step
+def Create_Explicit_Step(model,pre_step_name,step_name,time_period,target_inc):
+    mdb.models[model].ExplicitDynamicsStep(name=step_name, previous=pre_step_name, timePeriod=time_period, massScaling=((SEMI_AUTOMATIC, MODEL, AT_BEGINNING, 0.0, target_inc, BELOW_MIN, 0, 0, 0.0, 0.0, 0, None), ), improvedDtMethod=ON)
+    mdb.models[model].SmoothStepAmplitude(name='Smooth', timeSpan=STEP, data=((0.0, 0.0), (time_period, 1.0)))
+
+#------------------------------------------------------------------------------
+
+# Keep restart data of the step every frequency increments (only the latest);
+# Explicit steps write it at frequency intervals instead
+def Create_Restart(model,step_name,frequency,explicit=False):
+    if explicit:
+        mdb.models[model].steps[step_name].Restart(numberIntervals=frequency, overlay=ON, timeMarks=OFF)
+    else:
+        mdb.models[model].steps[step_name].Restart(frequency=frequency, numberIntervals=0, overlay=ON, timeMarks=OFF)
+
+#------------------------------------------------------------------------------
+
+
+def Fieldoutput_History_Output_Request(model,fieldoutput,historyoutput,timeintervel):
+    a = mdb.models[model].fieldOutputRequests[fieldoutput].setValues(variables=('S', 'PE', 'PEEQ', 'PEMAG', 'LE', 'U', 'V', 'A', 'RF', 'CF', 'CSTRESS', 'CDISP', 'EVOL'), timeInterval=timeintervel, timeMarks=OFF)
+    a = mdb.models[model].historyOutputRequests[historyoutput].setValues(timeInterval=timeintervel, timeMarks=OFF)
+
+#------------------------------------------------------------------------------
+
+# Replace the default requests by those of an output profile (see output_profile.py)
+def Create_Output_Profile(model,step_name,profile,timeintervel):
+    a = mdb.models[model].rootAssembly
+    for name in mdb.models[model].fieldOutputRequests.keys():
+        del mdb.models[model].fieldOutputRequests[name]
+    for name in mdb.models[model].historyOutputRequests.keys():
+        del mdb.models[model].historyOutputRequests[name]
+    for k, r in enumerate(profile['field']):
+        region = a.sets[r['region']] if r.get('region') else MODEL
+        variables = PRESELECT if r['variables'] == 'PRESELECT' else tuple(r['variables'])
+        mdb.models[model].FieldOutputRequest(name='F-Output-%d' % (k+1), createStepName=step_name, variables=variables, region=region, timeInterval=r.get('interval') or timeintervel, timeMarks=OFF)
+    for k, r in enumerate(profile['history']):
+        region = a.sets[r['region']] if r.get('region') else MODEL
+        variables = PRESELECT if r['variables'] == 'PRESELECT' else tuple(r['variables'])
+        mdb.models[model].HistoryOutputRequest(name='H-Output-%d' % (k+1), createStepName=step_name, variables=variables, region=region, timeInterval=r.get('interval') or timeintervel, timeMarks=OFF)
+
+# Whole-model energies for the quasi-static check of Explicit runs
+def Create_Energy_Output(model,step_name,timeintervel):
+    mdb.models[model].HistoryOutputRequest(name='H-Energy', createStepName=step_name, variables=('ALLAE', 'ALLIE', 'ALLKE', 'ALLMW', 'ALLPD', 'ALLSE', 'ALLWK', 'ETOTAL'), timeInterval=timeintervel, timeMarks=OFF)
+
+# *Node Print lines (no CAE request exists for them) before the last *End Step
+def Create_Print_Requests(model,lines):
+    kb = mdb.models[model].keywordBlock
+    kb.synchVersions(storeNodesAndElements=False)
+    myEndStep = [i for i, block in enumerate(kb.sieBlocks) if block.lower().startswith('*end step')][-1]
+    kb.insert(myEndStep - 1, '\n'.join(lines))
+
+#------------------------------------------------------------------------------
+
+
+def Contact_Property(model,contactprop,frictionfactor):
+    mdb.models[model].ContactProperty(contactprop)
+    mdb.models[model].interactionProperties[contactprop].NormalBehavior(pressureOverclosure=HARD, allowSeparation=ON, constraintEnforcementMethod=DEFAULT)
+    mdb.models[model].interactionProperties[contactprop].TangentialBehavior(formulation=PENALTY, directionality=ISOTROPIC, slipRateDependency=OFF, pressureDependency=OFF, temperatureDependency=OFF, dependencies=0, table=((frictionfactor, ), ), shearStressLimit=None, maximumElasticSlip=FRACTION, fraction=0.005, elasticSlipStiffness=None)
+
+#------------------------------------------------------------------------------
+
+
+def Bolt_Plate_Surface(model,instance1,instance2,boltsurface1,platesurface1,boltradius,holeradius,hole_index=None):
+    a = mdb.models[model].rootAssembly
+    s1 = a.instances[instance1].faces
+    side1Faces1 = Face_Sequence(s1, Faces_On_Cylinder(myGeometryIndex[(model,instance1)][0], boltradius), 'bolt shank face')
+    a.Surface(side1Faces=side1Faces1, name=boltsurface1)
+    s2 = a.instances[instance2].faces
+    side2Faces1 = Face_Sequence(s2, Faces_On_Cylinder(myGeometryIndex[(model,hole_index or instance2)][0], holeradius), 'hole face')
+    a.Surface(side1Faces=side2Faces1, name=platesurface1)
+
+#------------------------------------------------------------------------------
+
+
+
+def Create_Contact_BP_Surface(model,boltsurface1,platesurface1,bpcontact,step,contactprop):
+    a = mdb.models[model].rootAssembly
+    region1=a.surfaces[boltsurface1]
+    region2=a.surfaces[platesurface1]
+    mdb.models[model].SurfaceToSurfaceContactStd(name=bpcontact,createStepName=step, main=region1, secondary=region2, sliding=FINITE,thickness=ON, interactionProperty=contactprop, adjustMethod=OVERCLOSED,initialClearance=OMIT, datumAxis=None, clearanceRegion=None, tied=OFF)
+
+
+def Create_Contact_BP_Surface_Explicit(model,boltsurface1,platesurface1,bpcontact,step,contactprop):
+    a = mdb.models[model].rootAssembly
+    region1=a.surfaces[boltsurface1]
+    region2=a.surfaces[platesurface1]
+    mdb.models[model].SurfaceToSurfaceContactExp(name=bpcontact, createStepName=step, main=region1, secondary=region2, mechanicalConstraint=PENALTY, sliding=FINITE, interactionProperty=contactprop, initialClearance=OMIT, datumAxis=None, clearanceRegion=None)
+
+
+#------------------------------------------------------------------------------
+
+
+def Bolt_Displacement_Boundary_Conditions(model,set_name,bc_name,step_name,ux,uy,uz,urx,ury,urz,amplitude):
+    a = mdb.models[model].rootAssembly
+    region = a.sets[set_name]
+    mdb.models[model].DisplacementBC(name=bc_name, createStepName=step_name, region=region, u1=ux, u2=uy, u3=uz, ur1=urx, ur2=ury, ur3=urz, amplitude=amplitude, fixed=OFF,  distributionType=UNIFORM, fieldName='', localCsys=None)
+
+def Modify_Bolt_Displacement(model,bc_name,step_name,ux):
+    mdb.models[model].boundaryConditions[bc_name].setValuesInStep(stepName=step_name, u1=ux)
+
+#------------------------------------------------------------------------------
+
+
+def Create_Surface(model,part,x,y,z,surface_name):
+    a = mdb.models[model].rootAssembly
+    s1 = a.instances[part].faces
+    side1Faces1 = s1.findAt(((x,y,z), ))
+    a.Surface(side1Faces=side1Faces1, name=surface_name)
+
+#------------------------------------------------------------------------------
+
+
+def Create_BC_Plate_Edge_Fixed(model,instance,plateedge,bc_name,step_name,x_edge):
+    a = mdb.models[model].rootAssembly
+    f1 = a.instances[instance].faces
+    faces1 = Face_Sequence(f1, Faces_On_Plane(myGeometryIndex[(model,instance)][0], 0, x_edge), 'fixed edge face')
+    region = a.Set(faces=faces1, name=plateedge)
+    mdb.models[model].EncastreBC(name=bc_name, 
+        createStepName=step_name, region=region, localCsys=None)
+
+#------------------------------------------------------------------------------
+
+def Create_Extra_BC_For_Thin_Plate_Edge_Zaxis_Fixed(model,instance,surface_set_name,bc_name,x,y,z):
+    a = mdb.models[model].rootAssembly
+    f1 = a.instances[instance].faces
+    faces1 = f1.findAt(((x,y,z), ))
+    region = a.Set(faces=faces1, name=surface_set_name)
+    mdb.models[model].DisplacementBC(name=bc_name,createStepName='Loading', region=region, u1=UNSET, u2=UNSET, u3=0.0,ur1=UNSET, ur2=UNSET, ur3=UNSET, amplitude=UNSET, fixed=OFF,distributionType=UNIFORM, fieldName='', localCsys=None)
+
+#------------------------------------------------------------------------------
+
+def Create_Symmetry(model,instance,platebottom,sym,step_name):
+    a = mdb.models[model].rootAssembly
+    f1 = a.instances[instance].faces
+    faces1 = Face_Sequence(f1, Faces_On_Plane(myGeometryIndex[(model,instance)][0], 1, 0.0), 'y symmetry face')
+    region = a.Set(faces=faces1, name=platebottom)
+    mdb.models[model].YsymmBC(name=sym, createStepName=step_name, region=region, localCsys=None)
+
+#------------------------------------------------------------------------------
+
+#------------------------------------------------------------------------------
+def Create_Z_Symmetry(model,instances,set_name,sym_name,step_name='Loading'):
+    a = mdb.models[model].rootAssembly
+    faces1 = None
+    for instance in instances:
+        f1 = a.instances[instance].faces
+        f2 = Face_Sequence(f1, Faces_On_Plane(myGeometryIndex[(model,instance)][0], 2, 0.0), 'z symmetry face')
+        faces1 = f2 if faces1 is None else faces1 + f2
+    region = a.Set(faces=faces1, name=set_name)
+    mdb.models[model].ZsymmBC(name=sym_name, 
+        createStepName=step_name, region=region, localCsys=None)
+    
+
+#------------------------------------------------------------------------------
+
+
+#Create Mesh: the plate on its instance, the bolt once on its part (all
+#bolt instances are dependent and share that mesh)
+def Create_Mesh(model,instance_1,part_2,mesh_size,edge_size_1,hole_radius,hole_indexes):
+    a = mdb.models[model].rootAssembly
+    partInstances =(a.instances[instance_1], )
+    e1 = a.instances[instance_1].edges
+    myEdges = sorted(set(i for h in hole_indexes for i in Arcs_On_Cylinder(myGeometryIndex[(model,h)][1], hole_radius)))
+    pickedEdges = Face_Sequence(e1, myEdges, 'hole edge')
+    a.seedEdgeBySize(edges=pickedEdges, size=edge_size_1, deviationFactor=0.1, 
+        minSizeFactor=0.1, constraint=FINER)
+    a.seedPartInstance(regions=partInstances, size=mesh_size, deviationFactor=0.1, minSizeFactor=0.1)
+    a.generateMesh(regions=partInstances)
+    p = mdb.models[model].parts[part_2]
+    p.seedPart(size=mesh_size, deviationFactor=0.1, minSizeFactor=0.1)
+    p.generateMesh()
+
+
+#------------------------------------------------------------------------------
+
+
+def Select_Element_Type(model,instance_1,part_2,element_del,maxdeg,library,hourglass):
+    elemType1 = mesh.ElemType(elemCode=C3D8R, elemLibrary=library, kinematicSplit=AVERAGE_STRAIN, secondOrderAccuracy=OFF, hourglassControl=hourglass, distortionControl=DEFAULT, elemDeletion=element_del, maxDegradation=maxdeg)
+    elemType2 = mesh.ElemType(elemCode=C3D6, elemLibrary=library)
+    elemType3 = mesh.ElemType(elemCode=C3D4, elemLibrary=library)
+    a = mdb.models[model].rootAssembly
+    c1 = a.instances[instance_1].cells
+    a.setElementType(regions=(c1, ), elemTypes=(elemType1, elemType2, elemType3))
+    p = mdb.models[model].parts[part_2]
+    p.setElementType(regions=(p.cells, ), elemTypes=(elemType1, elemType2, elemType3))
+
+
+#------------------------------------------------------------------------------
+
+def Create_Node_Set_ByBoundingBox(model,instance,x1,y1,z1,x2,y2,z2,set_name):
+    a = mdb.models[model].rootAssembly
+    n1 = a.instances[instance].nodes
+    nodes1 = n1.getByBoundingBox(x1,y1,z1,x2,y2,z2)
+    a.Set(nodes=nodes1, name=set_name)
+
+      
+#----------------------------------------------------------------------------
+
+def Create_Element_Set_ByBoundingBox(model,instance,x1,y1,z1,x2,y2,z2,set_name):
+    a = mdb.models[model].rootAssembly
+    e1 = a.instances[instance].elements
+    elements1 = e1.getByBoundingBox(x1,y1,z1,x2,y2,z2)
+    a.Set(elements=elements1, name=set_name)
+
+#----------------------------------------------------------------------------
+
+def Create_Job(model,job_name, cpu):
+    a = mdb.models[model].rootAssembly
+    mdb.Job(name=job_name, model=model, description='', type=ANALYSIS, atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=90, memoryUnits=PERCENTAGE, getMemoryFromAnalysis=True, explicitPrecision=SINGLE, nodalOutputPrecision=SINGLE, echoPrint=OFF, modelPrint=OFF, contactPrint=OFF, historyPrint=OFF, userSubroutine='', scratch='', resultsFormat=ODB, multiprocessingMode=DEFAULT, numCpus=cpu, numGPUs=0)
+
+#------------------------------------------------------------------------------
+
+#Job submit
+def Job_Submit(myJobName,myDirectory):
+    os.chdir(myDirectory)
+    mdb.jobs[myJobName].submit(consistencyChecking=OFF)
+
+#------------------------------------------------------------------------------
+
+# Build one model (and its job) named myString from a dict of the inputs in p1_core.py
+def Build_Model(myString,myInputs,myOutputProfile=None):
+    myPlateLength = myInputs['myPlateLength']
+    myBoltDia = myInputs['myBoltDia']
+    myEndLength = myInputs['myEndLength']
+    myPlateHalfHeight = myInputs['myPlateHalfHeight']
+    myPlateThickness = myInputs['myPlateThickness']
+    myBoltHalfLength = myInputs['myBoltHalfLength']
+    myClearance = myInputs['myClearance']
+    myDisplacement = myInputs['myDisplacement']
+    myDensity = myInputs['myDensity']
+    myE = myInputs['myE']
+    myPoisonRatio = myInputs['myPoisonRatio']
+    myFriction = myInputs['myFriction']
+    myMeshSize = myInputs['myMeshSize']
+    myEdgeSize = myInputs['myEdgeSize']
+    myMaxNumInc = int(myInputs['myMaxNumInc'])
+    myInitialInc = myInputs['myInitialInc']
+    myMinInc = myInputs['myMinInc']
+    myMaxInc = myInputs['myMaxInc']
+    myTimeInterval = myInputs['myTimeInterval']
+    myRestartFrequency = int(myInputs['myRestartFrequency'])
+    myExplicit = int(myInputs['myExplicit'])
+    myExplicitTime = myInputs['myExplicitTime']
+    myTargetStableInc = myInputs['myTargetStableInc']
+    myPlateHalfThickness = myPlateThickness/2
+    myArcDia = myBoltDia + myClearance
+    #Closure step before Loading (Abaqus/Standard only); contact and BCs start in the first step
+    myGapClosure = Gap_Closure(myInputs)
+    #bolts against the bearing side of their holes, or centred for the Closure step
+    myBoltOffset = Bolt_Offset(myInputs)
+    myFirstStep = 'Closure' if myGapClosure else 'Loading'
+
+    Load_Abaqus()
+    mdb.Model(name=myString)
+
+    #Plastic and damage tables: from the plate grade (material_library.py) or
+    #the Ramberg-Osgood curve of the inputs
+    myPlastic, myDuctileDamage, myShearKs, myShearDamage = Plate_Tables(myInputs)
+    myBoltDensity, myBoltE, myBoltNu, myBoltPlastic = Bolt_Tables(myInputs)
+
+    #------------------------------------------------------------------------------
+
+    #Create ARC Point Solid line Of Plate
+
+    myHoles = Model_Holes(myInputs)
+    if myHoles == [(myArcX,myArcY)]:
+        Create_ARC_Point_Solid_line_Create_Plate(myString,myPart_1,myArcX,myArcY,myArcDia,myEndLength,myPlateHalfHeight,myPlateLength,myPlateHalfThickness)
+    else:
+        Create_Plate_With_Holes(myString,myPart_1,myHoles,myArcDia,myEndLength,myPlateHalfHeight,myPlateLength,myPlateHalfThickness,myArcY)
+
+    #One bolt per hole: instance, reference point, rigid body, surfaces and contact
+    myBolts = Bolt_Records(myHoles)
+
+    #------------------------------------------------------------------------------
+
+    #Create Bolt
+    Create_Bolt(myString,myPart_2,myArcX, myArcY,myBoltDia,myBoltHalfLength)
+
+    #------------------------------------------------------------------------------
+
+    #Plate material
+    Plate_material(myString,myMaterialName_1,myDensity,myE,myPoisonRatio,myPlastic,myDuctileDamage,myShearKs,myShearDamage,myExplicit)
+
+    #------------------------------------------------------------------------------
+
+    #Bolt materials
+    Bolt_materials(myString,myMaterialName_2,myBoltDensity,myBoltE,myBoltNu,myBoltPlastic)
+
+    #------------------------------------------------------------------------------
+
+    #Create Section
+    Create_Section(myString,"Plate CS",myMaterialName_1)
+    Create_Section(myString,"Bolt CS",myMaterialName_2)
+
+    #------------------------------------------------------------------------------
+    #Create_Datum_Plane
+    myID_0 = Create_Datum_Plane(YZPLANE,myPart_1,myString,0.0)
+    myID_1 = Create_Datum_Plane(YZPLANE,myPart_2,myString,0.0)
+    myID_2 = Create_Datum_Plane(XZPLANE,myPart_2,myString,0.0)
+
+    #------------------------------------------------------------------------------
+
+    #Create_Partion
+    Create_Partion(myString,myPart_1,myID_0)
+    Create_Partion(myString,myPart_2,myID_1)
+    Create_Partion(myString,myPart_2,myID_2)
+
+    #------------------------------------------------------------------------------
+    #Section Assignment
+    Section_Assignment(myString,myPart_1,"Plate_1","Plate CS")
+    Section_Assignment(myString,myPart_2,"Bolt_1","Bolt CS")
+
+    #------------------------------------------------------------------------------
+
+    # Assemply
+    Assemply(myString,myPart_1,"Plate",0,0,0,OFF)
+    Index_Instance(myString,"Plate",0,0)
+    for myBolt,myRP,myRigid,myBS,myPS,myInt,myBC,myHole,x,y in myBolts:
+        Assemply(myString,myPart_2,myBolt,x+myBoltOffset,y,0,dependent=ON)
+        Index_Instance(myString,myBolt,x+myBoltOffset,y)
+        Index_Instance(myString,"Plate",x,y,myHole)
+
+    #------------------------------------------------------------------------------
+    # Reference point
+    for myBolt,myRP,myRigid,myBS,myPS,myInt,myBC,myHole,x,y in myBolts:
+        Create_Reference_Point(x+myBoltOffset,y,0,myString,myRP)
+
+    #------------------------------------------------------------------------------
+
+    #RP to Bolt Rigid Body
+    for myBolt,myRP,myRigid,myBS,myPS,myInt,myBC,myHole,x,y in myBolts:
+        Create_Interaction_Coupling(myString,myBolt,myRP,"Bolt_1",myRigid)
+
+    #------------------------------------------------------------------------------
+
+    #Create Step
+    if myExplicit:
+        Create_Explicit_Step(myString,"Initial","Loading",myExplicitTime,myTargetStableInc)
+    else:
+        if myGapClosure:
+            Create_Closure_Step(myString,"Initial","Closure",myClosureMaxNumInc,myClosureInitialInc,myMinInc)
+        Create_Step(myString,"Closure" if myGapClosure else "Initial","Loading",ON,myMaxNumInc,myInitialInc,myMinInc,myMaxInc)
+    if myRestartFrequency > 0:
+        Create_Restart(myString,"Loading",myRestartFrequency,myExplicit)
+
+    #------------------------------------------------------------------------------
+
+    #FieldoutPut History Output Request
+    Fieldoutput_History_Output_Request(myString,"F-Output-1","H-Output-1",myTimeInterval)
+
+    #------------------------------------------------------------------------------
+
+    #Contact Property
+    Contact_Property(myString,"Intprop-1",myFriction)
+
+    #------------------------------------------------------------------------------
+
+    #Bolt to Plate Arc Contact surface to surface
+
+    for myBolt,myRP,myRigid,myBS,myPS,myInt,myBC,myHole,x,y in myBolts:
+        Bolt_Plate_Surface(myString,myBolt,'Plate',myBS,myPS,myBoltDia/2,myArcDia/2,myHole)
+
+    #Bp_Contact(myString,"Bolt",'B_surface',"Plate",'A_surface','Int-1',"Loading","Intprop-1")
+
+    #------------------------------------------------------------------------------
+
+    #Create Contact Plate And Bolt Surface
+
+    for myBolt,myRP,myRigid,myBS,myPS,myInt,myBC,myHole,x,y in myBolts:
+        if myExplicit:
+            Create_Contact_BP_Surface_Explicit(myString,myBS,myPS,myInt,'Loading','Intprop-1')
+        else:
+            Create_Contact_BP_Surface(myString,myBS,myPS,myInt,myFirstStep,'Intprop-1')
+    if myGapClosure:
+        Create_Closure_Contact_Controls(myString,[b[5] for b in myBolts],'Closure','Loading')
+
+    #------------------------------------------------------------------------------
+    # Bolt dsplacement boundary Conditions
+
+    for myBolt,myRP,myRigid,myBS,myPS,myInt,myBC,myHole,x,y in myBolts:
+        if myGapClosure:
+            Bolt_Displacement_Boundary_Conditions(myString,myRP,myBC,'Closure',-Closure_Displacement(myInputs),0,0,0,0,0,UNSET)
+            Modify_Bolt_Displacement(myString,myBC,'Loading',-myDisplacement)
+        else:
+            Bolt_Displacement_Boundary_Conditions(myString,myRP,myBC,'Loading',-myDisplacement,0,0,0,0,0,'Smooth' if myExplicit else UNSET)
+
+    #------------------------------------------------------------------------------
+
+    Create_Surface(myString,myPart_1,myPlateLength-myEndLength,myPlateHalfHeight,myPlateHalfThickness,"Plate_Edge")
+    Create_Surface(myString,myPart_1,myPlateLength-myEndLength,0,myPlateHalfThickness/2,"Plate_Bottom_1")
+    Create_Surface(myString,myPart_1,-myEndLength,0,myPlateHalfThickness/2,"Plate_Bottom_2")
+    Create_Surface(myString,myPart_1,-myEndLength,myPlateHalfHeight/2,myPlateHalfThickness/2,"Plate_Edge_End_length")
+
+    #------------------------------------------------------------------------------
+
+    #Rigid Boundary Fixed Edged of plate
+    Create_BC_Plate_Edge_Fixed(myString,'Plate','Plate_Edge','Plate_Edge_Fixed',myFirstStep,myPlateLength-myEndLength)
+
+    #------------------------------------------------------------------------------
+
+    #Create_Extra_BC_For_Thin_Plate_Edge_Zaxis_Fixed(myString,'Plate','Plate_Edge_Fixed_End_L','Z_axis_fixed',myPlateLength/2,myPlateHalfHeight/2,myPlateHalfThickness)
+
+    #------------------------------------------------------------------------------
+
+    #Create Symmetry
+    Create_Symmetry(myString,'Plate','Plate_B_Symmetry','BC_Symmetry','Initial')
+
+    #------------------------------------------------------------------------------
+    Create_Z_Symmetry(myString,['Plate'] + [b[0] for b in myBolts],'Z sym surf','Z Symmetry',myFirstStep)
+    #------------------------------------------------------------------------------
+    #Create Mesh
+    Create_Mesh(myString,'Plate',myPart_2,myMeshSize,myEdgeSize,myArcDia/2,[b[7] for b in myBolts])
+
+    #------------------------------------------------------------------------------
+
+    #Element Type
+    if myExplicit:
+        Select_Element_Type(myString,'Plate',myPart_2,ON,0.99,EXPLICIT,ENHANCED)
+    else:
+        Select_Element_Type(myString,'Plate',myPart_2,OFF,0.99,STANDARD,DEFAULT)
+
+    #------------------------------------------------------------------------------
+
+    Create_Node_Set_ByBoundingBox(myString,'Plate',-myEndLength,0,0,0,myPlateHalfHeight,myPlateHalfThickness,"Element_NodeSet_1")
+
+    #------------------------------------------------------------------------------
+
+    Create_Element_Set_ByBoundingBox(myString,'Plate',-myEndLength,0,0,0,myPlateHalfHeight,myPlateHalfThickness,"Element_ElementSet_1")
+
+    #------------------------------------------------------------------------------
+
+    #Output profile other than the full default (its regions are the sets above)
+    if myOutputProfile is not None and myOutputProfile['name'] != 'full':
+        Create_Output_Profile(myString,myFirstStep,myOutputProfile,myTimeInterval)
+        if myExplicit and not any(r['variables'] == 'PRESELECT' for r in myOutputProfile['history']):
+            Create_Energy_Output(myString,'Loading',myTimeInterval)
+        #U1/RF1 of RP-1 in the .dat file every increment (job_monitor.py)
+        if not myExplicit and Print_Request_Lines(myOutputProfile):
+            Create_Print_Requests(myString,Print_Request_Lines(myOutputProfile))
+
+    #------------------------------------------------------------------------------
+
+    Create_Job(myString,myString,1)
+
+#------------------------------------------------------------------------------
+
+#------------------------------------------------------------------------------
+
+# Build the model and write its .inp
+def Build_Deck(myString,myInputs,myOutputProfile=None):
+    Build_Model(myString,myInputs,myOutputProfile)
+    Create_Inp_File(myString)
+
+#------------------------------------------------------------------------------
+
+# Element and node counts of a built model (None after a cache hit)
+def Mesh_Counts(model):
+    Load_Abaqus()
+    if model not in mdb.models.keys():
+        return None, None
+    myInstances = mdb.models[model].rootAssembly.instances.values()
+    return sum(len(i.elements) for i in myInstances), sum(len(i.nodes) for i in myInstances)
+
+#------------------------------------------------------------------------------
+
+# Drop a model, its job and its geometry index so memory stays flat in a sweep
+def Delete_Model(model):
+    Load_Abaqus()
+    if model in mdb.jobs.keys():
+        del mdb.jobs[model]
+    if model in mdb.models.keys():
+        del mdb.models[model]
+    Clear_Geometry_Index(model)
+
+#------------------------------------------------------------------------------
+
+#Time every pipeline stage (see stage_profile.py)
+myProfiledStages = ('Plate_Tables', 'Create_ARC_Point_Solid_line_Create_Plate', 'Create_Plate_With_Holes',
+    'Create_Bolt', 'Plate_material', 'Bolt_materials', 'Create_Section', 'Create_Datum_Plane', 'Create_Partion',
+    'Section_Assignment', 'Assemply', 'Index_Instance', 'Create_Reference_Point', 'Create_Interaction_Coupling',
+    'Create_Step', 'Create_Closure_Step', 'Create_Explicit_Step', 'Create_Restart', 'Fieldoutput_History_Output_Request', 'Create_Output_Profile', 'Contact_Property', 'Bolt_Plate_Surface',
+    'Create_Contact_BP_Surface', 'Create_Contact_BP_Surface_Explicit', 'Bolt_Displacement_Boundary_Conditions', 'Create_Surface',
+    'Create_BC_Plate_Edge_Fixed', 'Create_Symmetry', 'Create_Z_Symmetry', 'Create_Mesh', 'Select_Element_Type',
+    'Create_Node_Set_ByBoundingBox', 'Create_Element_Set_ByBoundingBox', 'Create_Job', 'Create_Inp_File')
+
+def Profile_Stages():
+    for myStage in myProfiledStages:
+        globals()[myStage] = Profiled(globals()[myStage])
@@ -0,0 +1,158 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+p1_core.py — Inputs, names and bolt layout of the P1 model, without Abaqus
+
+The pure-Python part of P1.py: the input block, the list of inputs a sweep
+row may override, the part/material/section names and the per-bolt instance,
+reference point, surface and interaction names of the deck. Importing it
+needs neither Abaqus nor NumPy, so CAE-free tools (native_inp.py, sweep.py,
+surrogate.py, plain CPython worker pools) share the defaults and the deck
+names with the CAE build in p1_abaqus.py. The material curves are in
+material_curve.py.
+
+Run with:
+python p1_core.py
+"""
+
+from bolt_pattern import Bolt_Pattern, Check_Bolt_Pattern
+
+#------------------------------------------------------------------------------
+
+#Instructions
+#Input your data in this portions of the code
+
+myJobmodelname = "P1"
+
+myPlateLength = 340.0
+myBoltDia = 15.58  #Blot dia
+myEndLength =  79.95
+myPlateHalfHeight = 50
+myPlateThickness =  2.989
+myPlateHalfThickness = myPlateThickness/2
+myBoltHalfLength = 10.0
+
+
+myArcX = 0.0      #arc center
+myArcY = 0.0
+myClearance = 2.12          #Clearance between bolt and plate arc dia
+myArcDia = myBoltDia + myClearance   #arc dia
+Sh = myBoltHalfLength-myPlateHalfThickness
+
+
+myDisplacement = 20.0
+
+myDensity = 7.8e-06   #Density
+myE = 200000.0  #young modulas
+myPoisonRatio = 0.3     #poison ratio
+MyFtu = 431.0   #Ultimate strength, Ftu (Mpa)
+MyFty = 343.0    #Yield strength, Fty (Mpa)
+MySr = 10.7     #Strain at rupture, Ɛr (%)
+MyScu = 100      #Ultimate compressive strain
+
+myFriction = 0.3      #Bolt-plate friction coefficient
+myMeshSize = 1.0      #Global seed size
+myEdgeSize = 0.75     #Seed size along the hole edges
+myMaxNumInc = 1500    #Loading step increments
+myInitialInc = 0.01
+myMinInc = 1E-15
+myMaxInc = 0.02
+myTimeInterval = 0.02   #Field/history output interval
+
+myGapClosure = 0               #1: Closure step before Loading that brings the bolt into bearing (Abaqus/Standard)
+myClosureDisplacement = 0.05   #RP-1 travel past first contact in the Closure step (after myClearance/2)
+myClosureMaxNumInc = 100       #Closure step increments
+myClosureInitialInc = 0.1
+
+myBoltRows = 1        #Bolt rows along the load direction
+myBoltGauges = 1      #Bolt gauge lines across the plate (see bolt_pattern.py)
+myPitch = 50.0        #Row spacing
+myGauge = 40.0        #Gauge line spacing
+
+myRestartFrequency = 0   #Write restart data every N increments (0: off, see restart.py); Explicit: N intervals
+
+myExplicit = 0              #1: Abaqus/Explicit Loading step with mass scaling and element deletion
+myExplicitTime = 1.0        #Explicit step time
+myTargetStableInc = 1e-05   #Explicit target stable time increment (see explicit_check.py)
+
+myDamageLocus = 0     #Damage initiation tables: 0 fixed/grade tables, 1 Johnson-Cook, 2 Rice-Tracey (see damage_locus.py)
+myDamagePoints = 8    #Rows of the generated damage tables
+
+#------------------------------------------------------------------------------
+
+# Inputs a sweep row may override (all numeric)
+myInputNames = (
+    'myPlateLength', 'myBoltDia', 'myEndLength', 'myPlateHalfHeight',
+    'myPlateThickness', 'myBoltHalfLength', 'myClearance', 'myDisplacement',
+    'myDensity', 'myE', 'myPoisonRatio', 'MyFtu', 'MyFty', 'MySr', 'MyScu',
+    'myFriction', 'myMeshSize', 'myEdgeSize', 'myMaxNumInc', 'myInitialInc',
+    'myMinInc', 'myMaxInc', 'myTimeInterval', 'myBoltRows', 'myBoltGauges',
+    'myPitch', 'myGauge', 'myRestartFrequency', 'myExplicit',
+    'myExplicitTime', 'myTargetStableInc', 'myDamageLocus', 'myDamagePoints',
+    'myGapClosure', 'myClosureDisplacement')
+
+myPart_1 = "Plate"
+myPart_2 = "Bolt"
+myMaterialName_1 = "Plate"
+myMaterialName_2 = "Bolt"
+myPlateCs = "Plate CS"
+myBoltCs = "Bolt CS"
+
+#------------------------------------------------------------------------------
+
+def Default_Inputs():
+    return dict((n, globals()[n]) for n in myInputNames)
+
+#------------------------------------------------------------------------------
+
+def Model_Holes(myInputs):
+    # Hole centres of the bolt pattern, checked against the plate
+    myHoles = Bolt_Pattern(int(myInputs['myBoltRows']), int(myInputs['myBoltGauges']), myInputs['myPitch'],
+        myInputs['myGauge'], myArcX, myArcY)
+    Check_Bolt_Pattern(myHoles, myInputs['myBoltDia'] + myInputs['myClearance'], myInputs['myEndLength'],
+        myInputs['myPlateHalfHeight'], myInputs['myPlateLength'], myArcY)
+    return myHoles
+
+#------------------------------------------------------------------------------
+
+def Gap_Closure(myInputs):
+    # Closure step before Loading (Abaqus/Standard only)
+    return bool(int(float(myInputs['myGapClosure']))) and not int(float(myInputs['myExplicit']))
+
+#------------------------------------------------------------------------------
+
+def Bolt_Offset(myInputs):
+    # Bolt centre from its hole centre along x: against the bearing side of
+    # the hole, or centred when a Closure step takes up the clearance
+    return 0.0 if Gap_Closure(myInputs) else -myInputs['myClearance']/2.0
+
+#------------------------------------------------------------------------------
+
+def Closure_Displacement(myInputs):
+    # RP-1 travel of the Closure step: the clearance on the bearing side of
+    # the centred bolt, then myClosureDisplacement into bearing
+    return myInputs['myClearance']/2.0 + myInputs['myClosureDisplacement']
+
+#------------------------------------------------------------------------------
+
+def Bolt_Records(holes):
+    # (instance, reference point, rigid body, bolt surface, plate surface,
+    # interaction, displacement BC, hole index name, x, y) per hole; the
+    # first bolt keeps the names of the single-bolt model
+    myBolts = []
+    for k, (x, y) in enumerate(holes):
+        if k == 0:
+            myBolts.append(("Bolt","RP-1","RP_to_Bolt",'BS-1','PS-1','Int-1','Bolt_Displacement',"Plate-hole-1",x,y))
+        else:
+            myBolts.append(("Bolt-%d" % (k+1),"RP-%d" % (k+1),"RP_to_Bolt-%d" % (k+1),'BS-%d' % (k+1),'PS-%d' % (k+1),
+                'Int-%d' % (k+1),'Bolt_Displacement-%d' % (k+1),"Plate-hole-%d" % (k+1),x,y))
+    return myBolts
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    myInputs = Default_Inputs()
+    for myName in myInputNames:
+        print('%s = %r' % (myName, myInputs[myName]))
+    for myBolt in Bolt_Records(Model_Holes(myInputs)):
+        print('%s at (%g, %g): %s, %s, %s' % (myBolt[0], myBolt[8], myBolt[9], myBolt[1], myBolt[3], myBolt[5]))
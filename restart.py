@@ -0,0 +1,231 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+restart.py — Resume an aborted P1 job or extend its bolt displacement from restart data
+
+Jobs written with myRestartFrequency > 0 keep restart data (overlaid, so
+only the latest) every myRestartFrequency increments. From that data:
+
+  resume  continues the step that was running when the job died, from the
+          last increment that wrote restart data (read from <job>.sta)
+  extend  adds a step after the last completed one that drives every bolt
+          reference point (RP-1, RP-2, ...) a further --displacement in the
+          load direction, with the original step's controls and outputs
+
+Both write <job>_r<k>.inp (the next free k) and can run it with the solver
+command, whose {job} and {oldjob} placeholders are the new and old job names.
+The new ODB holds the frames after the restart point only. A <job>_r<k>
+deck can itself be resumed or extended: the restart requests of each step
+are followed back through the "** Resume of" / "** Extension of" header
+lines to the original deck.
+
+Only the steps that request restart data can be resumed (with a Closure
+step, Loading does and Closure does not). Abaqus/Explicit decks, which
+write restart data by time interval rather than by increment, are not
+supported.
+
+Run with:
+python restart.py resume P1 --run
+python restart.py extend P1 --displacement 10 --run
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+#------------------------------------------------------------------------------
+
+myRestartCommand = 'abaqus job={job} oldjob={oldjob} input={input} cpus={cpus} interactive'
+
+#------------------------------------------------------------------------------
+
+def Read_Deck(inp_path):
+    with open(inp_path) as f:
+        return f.read().splitlines()
+
+#------------------------------------------------------------------------------
+
+def Keyword(line):
+    # '*Restart, read, step=1' -> 'restart'
+    return line[1:].split(',')[0].strip().lower() if line.startswith('*') and not line.startswith('**') else None
+
+#------------------------------------------------------------------------------
+
+def Steps_Done(lines):
+    # Steps of the whole analysis up to the end of this deck: steps read
+    # back from an older job plus the steps defined here
+    before = 0
+    for line in lines:
+        if Keyword(line) == 'restart' and 'read' in line.lower():
+            m = re.search(r'step\s*=\s*(\d+)', line, re.I)
+            before = int(m.group(1)) if m else 0
+    return before + sum(1 for line in lines if Keyword(line) == 'step')
+
+#------------------------------------------------------------------------------
+
+def Last_Step_Block(lines):
+    # Lines from the last *Step to its *End Step
+    starts = [i for i, line in enumerate(lines) if Keyword(line) == 'step']
+    if not starts:
+        raise ValueError("No step to extend in the deck")
+    ends = [i for i, line in enumerate(lines) if Keyword(line) == 'end step' and i > starts[-1]]
+    return lines[starts[-1]:(ends[0] + 1 if ends else len(lines))]
+
+#------------------------------------------------------------------------------
+
+def Last_Sta_Step(sta_path):
+    # Step of the last increment line of a .sta file: the step the job was
+    # in when it stopped (a Closure step makes this differ from the last
+    # step of the deck)
+    step = None
+    with open(sta_path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) > 3 and fields[0].isdigit() and fields[1].isdigit():
+                step = int(fields[0])
+    if step is None:
+        raise ValueError("No increment in %s" % sta_path)
+    return step
+
+#------------------------------------------------------------------------------
+
+def Last_Restart_Increment(sta_path, step, frequency):
+    # Largest converged increment of the step that wrote restart data
+    # (every frequency increments; cut-back attempts end in 'U')
+    last = None
+    with open(sta_path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) > 3 and fields[0].isdigit() and fields[1].isdigit() and fields[2].isdigit():
+                if int(fields[0]) == step and int(fields[1]) % frequency == 0:
+                    last = int(fields[1])
+    if last is None:
+        raise ValueError("No restart data written in step %d of %s" % (step, sta_path))
+    return last
+
+#------------------------------------------------------------------------------
+
+def Old_Job(lines):
+    # Job a <job>_r<k> deck restarts from, None for an original deck
+    for line in lines:
+        m = re.match(r'\*\* (?:Resume|Extension) of (\S+) ', line)
+        if m:
+            return m.group(1)
+    return None
+
+#------------------------------------------------------------------------------
+
+def Check_Standard(lines, job):
+    for line in lines:
+        low = line.lower()
+        if (Keyword(line) == 'dynamic' and 'explicit' in low) or (Keyword(line) == 'restart' and 'number interval' in low):
+            raise ValueError("%s is an Abaqus/Explicit deck: restart.py resumes and extends Abaqus/Standard jobs only"
+                % job)
+
+#------------------------------------------------------------------------------
+
+def Restart_Frequencies(directory, job):
+    # {step: restart write frequency (0: none)} of every step up to the end
+    # of the job's deck; a *Restart, write stays in effect for later steps
+    lines = Read_Deck(os.path.join(directory, job + '.inp'))
+    Check_Standard(lines, job)
+    old = Old_Job(lines)
+    frequencies = Restart_Frequencies(directory, old) if old else {}
+    step = 0
+    for line in lines:
+        if Keyword(line) == 'restart' and 'read' in line.lower():
+            m = re.search(r'step\s*=\s*(\d+)', line, re.I)
+            step = int(m.group(1)) if m else 0
+    frequency = frequencies.get(step, 0)
+    for line in lines:
+        if Keyword(line) == 'step':
+            step += 1
+            frequencies[step] = frequency
+        elif Keyword(line) == 'restart' and 'write' in line.lower():
+            m = re.search(r'frequency\s*=\s*(\d+)', line, re.I)
+            frequency = int(m.group(1)) if m else 0
+            if step:
+                frequencies[step] = frequency
+    return frequencies
+
+#------------------------------------------------------------------------------
+
+def Write_Resume_Inp(path, oldjob, step, inc):
+    with open(path, 'w') as f:
+        f.write('*Heading\n** Resume of %s from step %d increment %d\n' % (oldjob, step, inc))
+        f.write('*Restart, read, step=%d, inc=%d\n' % (step, inc))
+
+#------------------------------------------------------------------------------
+
+def Write_Extension_Inp(path, oldjob, lines, displacement):
+    # *Restart, read at the end of the last step, then the same step again
+    # with every RP-k load-direction displacement moved on by displacement
+    block = Last_Step_Block(lines)
+    steps = Steps_Done(lines)
+    out = ['*Heading', '** Extension of %s by %g' % (oldjob, displacement),
+        '*Restart, read, step=%d, end step' % steps]
+    for line in block:
+        key = Keyword(line)
+        if key == 'step':
+            line = re.sub(r'name\s*=\s*[^,]+', 'name=Extension-%d' % steps, line, flags=re.I)
+            if 'amplitude' not in line.lower():
+                line += ', amplitude=RAMP'
+        m = re.match(r'\s*(RP-\d+)\s*,\s*1\s*,\s*1\s*,\s*(\S+)\s*$', line)
+        if m:
+            value = float(m.group(2))
+            line = '%s, 1, 1, %.9g' % (m.group(1), value + (displacement if value >= 0 else -displacement))
+        out.append(line)
+    with open(path, 'w') as f:
+        f.write('\n'.join(out) + '\n')
+
+#------------------------------------------------------------------------------
+
+def Next_Job_Name(directory, job):
+    base = re.sub(r'_r\d+$', '', job)
+    k = 1
+    while os.path.exists(os.path.join(directory, '%s_r%d.inp' % (base, k))):
+        k += 1
+    return '%s_r%d' % (base, k)
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Resume or extend a P1 job from its restart data.')
+    parser.add_argument('mode', choices=('resume', 'extend'))
+    parser.add_argument('job')
+    parser.add_argument('--directory', default='.')
+    parser.add_argument('--displacement', type=float, default=10.0)
+    parser.add_argument('--run', action='store_true')
+    parser.add_argument('--command', default=myRestartCommand)
+    parser.add_argument('--cpus', type=int, default=1)
+    args = parser.parse_args(argv[1:])
+
+    lines = Read_Deck(os.path.join(args.directory, args.job + '.inp'))
+    frequencies = Restart_Frequencies(args.directory, args.job)
+    if args.mode == 'resume':
+        sta_path = os.path.join(args.directory, args.job + '.sta')
+        step = Last_Sta_Step(sta_path)
+    else:
+        step = Steps_Done(lines)
+    if not frequencies.get(step):
+        raise ValueError("Step %d of %s requests no restart data (myRestartFrequency = 0, or a Closure step)"
+            % (step, args.job))
+    job = Next_Job_Name(args.directory, args.job)
+    path = os.path.join(args.directory, job + '.inp')
+    if args.mode == 'resume':
+        inc = Last_Restart_Increment(sta_path, step, frequencies[step])
+        Write_Resume_Inp(path, args.job, step, inc)
+    else:
+        Write_Extension_Inp(path, args.job, lines, args.displacement)
+    print(path)
+    if args.run:
+        cmd = args.command.format(job=job, oldjob=args.job, input=job + '.inp', cpus=args.cpus)
+        return subprocess.call(cmd, shell=True, cwd=args.directory)
+    return 0
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
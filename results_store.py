@@ -0,0 +1,202 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+results_store.py — Memory-mapped store of sweep load–displacement curves
+
+A store is a directory of three files:
+
+  store.json  the layout: curve columns and the input names of the index
+  curves.f32  every run's (time, U1, RF1) rows as float32, appended run by run
+  index.bin   one fixed-size record per run: name, material grade, row
+              offset and frame count in curves.f32, and every input of the
+              run (sweep.myInputNames) as float64
+
+Both binary files are only appended to (curve rows first, then the index
+record, so the index never points past the data) and are opened with
+np.memmap: opening a 50k-curve store reads nothing, a query is a vectorized
+mask over the index and each curve comes back as a view of curves.f32
+without a copy. Queries take ranges of any input or of the ratios in
+myDerivedColumns (end_ratio = myEndLength/(myBoltDia + myClearance), ...).
+
+Run with:
+python results_store.py add results P1_sweep_manifest.csv --directory .
+python results_store.py query results --range end_ratio 1.5 2.0 --range MyFty 300 400
+python results_store.py info results
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from odb_extract import myCurveColumns, Read_Curve
+from sweep import myInputNames, Read_Parameter_Table
+
+#------------------------------------------------------------------------------
+
+myStoreVersion = 1
+myHeaderFile, myCurveFile, myIndexFile = 'store.json', 'curves.f32', 'index.bin'
+
+# Ratios to the hole diameter, as in sweep.Geometry_Class
+myDerivedColumns = {
+    'end_ratio': lambda x: x['myEndLength']/(x['myBoltDia'] + x['myClearance']),
+    'height_ratio': lambda x: x['myPlateHalfHeight']/(x['myBoltDia'] + x['myClearance']),
+    'thickness_ratio': lambda x: x['myPlateThickness']/(x['myBoltDia'] + x['myClearance']),
+    'clearance_ratio': lambda x: x['myClearance']/(x['myBoltDia'] + x['myClearance']),
+    'strength_ratio': lambda x: x['MyFtu']/x['MyFty']}
+
+#------------------------------------------------------------------------------
+
+def Index_Dtype(inputs):
+    return np.dtype([('name', 'S48'), ('material', 'S32'), ('offset', '<i8'), ('frames', '<i8')]
+        + [(str(n), '<f8') for n in inputs])
+
+#------------------------------------------------------------------------------
+
+def Read_Header(directory):
+    path = os.path.join(directory, myHeaderFile)
+    if not os.path.isfile(path):
+        header = {'version': myStoreVersion, 'columns': list(myCurveColumns), 'inputs': list(myInputNames)}
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as f:
+            json.dump(header, f, indent=1)
+    with open(path) as f:
+        return json.load(f)
+
+#------------------------------------------------------------------------------
+
+def Map_File(path, dtype, shape_tail=()):
+    # Read-only memmap of a whole file of records, empty if there is none
+    itemsize = np.dtype(dtype).itemsize*int(np.prod(shape_tail or (1,)))
+    size = os.path.getsize(path) if os.path.isfile(path) else 0
+    count = size//itemsize
+    if count == 0:
+        return np.zeros((0,) + tuple(shape_tail), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,) + tuple(shape_tail))
+
+#------------------------------------------------------------------------------
+
+def Open_Store(directory):
+    header = Read_Header(directory)
+    return {'directory': directory, 'header': header,
+        'index': Map_File(os.path.join(directory, myIndexFile), Index_Dtype(header['inputs'])),
+        'curves': Map_File(os.path.join(directory, myCurveFile), np.float32, (len(header['columns']),))}
+
+#------------------------------------------------------------------------------
+
+def Append_Runs(directory, runs):
+    # runs: [(name, inputs dict, {column: 1-D array})]; names already in the
+    # store are skipped. Returns the number of runs added.
+    header = Read_Header(directory)
+    dtype = Index_Dtype(header['inputs'])
+    known = set(Map_File(os.path.join(directory, myIndexFile), dtype)['name'])
+    curve_path = os.path.join(directory, myCurveFile)
+    offset = (os.path.getsize(curve_path) if os.path.isfile(curve_path) else 0)//(4*len(header['columns']))
+    added = 0
+    with open(curve_path, 'ab') as curves, open(os.path.join(directory, myIndexFile), 'ab') as index:
+        for name, inputs, columns in runs:
+            if name.encode('utf-8') in known:
+                continue
+            data = np.column_stack([np.asarray(columns[c], dtype='<f4') for c in header['columns']])
+            curves.write(data.tobytes())
+            curves.flush()
+            record = np.zeros(1, dtype=dtype)
+            record['name'] = name.encode('utf-8')
+            record['material'] = str(inputs.get('material') or '').encode('utf-8')
+            record['offset'] = offset
+            record['frames'] = len(data)
+            for n in header['inputs']:
+                record[n] = float(inputs.get(n, np.nan))
+            index.write(record.tobytes())
+            index.flush()
+            known.add(name.encode('utf-8'))
+            offset += len(data)
+            added += 1
+    return added
+
+#------------------------------------------------------------------------------
+
+def Sweep_Runs(manifest_path, curve_directory):
+    # (name, inputs, columns) of the manifest rows whose <name>_rp1.npz exists
+    for row in Read_Parameter_Table(manifest_path):
+        curve_path = os.path.join(curve_directory, row['name'] + '_rp1.npz')
+        if os.path.isfile(curve_path):
+            yield row['name'], row, Read_Curve(curve_path)[0]
+
+#------------------------------------------------------------------------------
+
+def Column(store, name):
+    # An index column, or a derived ratio computed over the whole index
+    if name in myDerivedColumns:
+        return myDerivedColumns[name](store['index'])
+    return store['index'][name]
+
+#------------------------------------------------------------------------------
+
+def Query(store, ranges=(), material=None):
+    # Row numbers of the runs with every column within its (name, low, high)
+    # range and, if given, of the material grade
+    mask = np.ones(len(store['index']), dtype=bool)
+    for name, low, high in ranges:
+        values = Column(store, name)
+        mask &= (values >= low) & (values <= high)
+    if material is not None:
+        mask &= store['index']['material'] == material.encode('utf-8')
+    return np.nonzero(mask)[0]
+
+#------------------------------------------------------------------------------
+
+def Curve(store, row):
+    # (frames, columns) float32 view of one run's curve in curves.f32
+    record = store['index'][row]
+    return store['curves'][record['offset']:record['offset'] + record['frames']]
+
+#------------------------------------------------------------------------------
+
+def Curves(store, rows):
+    return [Curve(store, r) for r in rows]
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Memory-mapped store of P1 load-displacement curves.')
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('add')
+    p.add_argument('store')
+    p.add_argument('manifest')
+    p.add_argument('--directory', default='.')
+    p = sub.add_parser('query')
+    p.add_argument('store')
+    p.add_argument('--range', nargs=3, action='append', default=[], metavar=('COLUMN', 'LOW', 'HIGH'))
+    p.add_argument('--material')
+    p = sub.add_parser('info')
+    p.add_argument('store')
+    args = parser.parse_args(argv[1:])
+
+    if args.command == 'add':
+        print('%d runs added to %s' % (Append_Runs(args.store, Sweep_Runs(args.manifest, args.directory)), args.store))
+    elif args.command == 'query':
+        store = Open_Store(args.store)
+        rows = Query(store, [(n, float(lo), float(hi)) for n, lo, hi in args.range], args.material)
+        rf1 = store['header']['columns'].index('RF1')
+        for r in rows:
+            curve = Curve(store, r)
+            print('%-24s %6d frames  peak load %.6g' % (store['index']['name'][r].decode('utf-8'), len(curve),
+                -curve[:, rf1].min() if len(curve) else float('nan')))
+        print('%d of %d runs' % (len(rows), len(store['index'])))
+    elif args.command == 'info':
+        store = Open_Store(args.store)
+        print('%d runs, %d curve rows (%.1f MB), columns %s' % (len(store['index']), len(store['curves']),
+            store['curves'].nbytes/1024.0**2, ', '.join(store['header']['columns'])))
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
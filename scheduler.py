@@ -0,0 +1,200 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+scheduler.py — Run a directory of .inp decks on one host
+
+Starts one solver process per deck while keeping the running jobs inside a
+total core budget, a host memory budget and an Abaqus license-token limit.
+The cores per job are chosen to minimise the estimated sweep time, taking a
+job on n cores to run n**myParallelExponent times faster than on one. Failed jobs are retried; decks whose .sta already
+reports a completed analysis are skipped. One JSON line per attempt is
+appended to scheduler_log.jsonl in the deck directory. With --monitor-drop
+each running job is followed by job_monitor.py and stopped with
+--terminate-command once its load has dropped that fraction below the peak;
+such a job counts as completed.
+
+The solver is a command template with {job}, {input}, {cpus} and
+{memory_mb} placeholders, run in the deck directory, so a stand-in
+(standin_solver.py) can replace Abaqus.
+
+Run with:
+python scheduler.py decks --cpus 64 --memory-gb 256 --tokens 120
+python scheduler.py decks --cpus 8 --command "python /path/to/standin_solver.py {job}"
+python scheduler.py decks --cpus 8 --monitor-drop 0.2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+#------------------------------------------------------------------------------
+
+myAbaqusCommand = 'abaqus job={job} input={input} cpus={cpus} memory="{memory_mb} mb" interactive'
+myStaCompleted = 'THE ANALYSIS HAS COMPLETED SUCCESSFULLY'
+myStaFailed = 'THE ANALYSIS HAS NOT BEEN COMPLETED'
+myParallelExponent = 0.8    #assumed parallel scaling of one job
+
+#------------------------------------------------------------------------------
+
+def License_Tokens(cpus):
+    # Abaqus analysis tokens for a job on the given number of cores
+    return int(5*cpus**0.422)
+
+#------------------------------------------------------------------------------
+
+def Concurrent_Jobs(cpus, total_cpus, memory_mb, memory_per_job_mb, token_limit):
+    k = total_cpus//cpus
+    k = min(k, int(memory_mb//memory_per_job_mb))
+    if token_limit is not None:
+        k = min(k, token_limit//License_Tokens(cpus))
+    return k
+
+#------------------------------------------------------------------------------
+
+def Choose_Cpus(num_jobs, total_cpus, memory_mb, memory_per_job_mb, token_limit=None, max_cpus_per_job=None):
+    best, best_time = None, None
+    for n in range(1, (max_cpus_per_job or total_cpus) + 1):
+        k = min(num_jobs, Concurrent_Jobs(n, total_cpus, memory_mb, memory_per_job_mb, token_limit))
+        if k < 1:
+            continue
+        waves = -(-num_jobs//k)
+        t = waves/float(n)**myParallelExponent
+        if best_time is None or t < best_time:
+            best, best_time = n, t
+    if best is None:
+        raise ValueError("No job fits the core, memory and token budgets")
+    return best
+
+#------------------------------------------------------------------------------
+
+def Monitor_Status(directory, job):
+    # 'captured', 'stalled' or None: why job_monitor.py stopped the job
+    path = os.path.join(directory, job + '_monitor.json')
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get('status')
+
+#------------------------------------------------------------------------------
+
+def Sta_Status(directory, job):
+    # 'completed', 'failed' or None when there is no (finished) .sta file;
+    # a job job_monitor.py stopped after the load drop is completed
+    if Monitor_Status(directory, job) == 'captured':
+        return 'completed'
+    path = os.path.join(directory, job + '.sta')
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        text = f.read()
+    if myStaCompleted in text:
+        return 'completed'
+    if myStaFailed in text:
+        return 'failed'
+    return None
+
+#------------------------------------------------------------------------------
+
+def Host_Memory_MB():
+    try:
+        return os.sysconf('SC_PAGE_SIZE')*os.sysconf('SC_PHYS_PAGES')//1024**2
+    except (AttributeError, ValueError, OSError):
+        raise ValueError("Cannot read the host memory here; pass --memory-gb")
+
+#------------------------------------------------------------------------------
+
+def Run_Jobs(directory, total_cpus, memory_mb, memory_per_job_mb, token_limit=None,
+        max_retries=1, command=myAbaqusCommand, cpus_per_job=None, max_cpus_per_job=None,
+        poll_interval=1.0, jobs=None, monitor_drop=None, terminate_command=None):
+    if jobs is None:
+        jobs = sorted(os.path.splitext(n)[0] for n in os.listdir(directory) if n.endswith('.inp'))
+    pending = [j for j in jobs if Sta_Status(directory, j) != 'completed']
+    status = dict((j, 'completed') for j in jobs if j not in pending)
+    if not pending:
+        return status
+    cpus = cpus_per_job or Choose_Cpus(len(pending), total_cpus, memory_mb, memory_per_job_mb, token_limit, max_cpus_per_job)
+    if Concurrent_Jobs(cpus, total_cpus, memory_mb, memory_per_job_mb, token_limit) < 1:
+        raise ValueError("A %d-core job does not fit the core, memory and token budgets" % cpus)
+    attempts = dict((j, 0) for j in pending)
+    running = {}
+    monitors = {}
+    if monitor_drop is not None:
+        from job_monitor import myTerminateCommand, New_Monitor, Poll_Job, Stop_Job
+        terminate_command = terminate_command or myTerminateCommand
+    log = open(os.path.join(directory, 'scheduler_log.jsonl'), 'a')
+    try:
+        while pending or running:
+            while pending and Concurrent_Jobs(cpus, total_cpus - cpus*len(running),
+                    memory_mb - memory_per_job_mb*len(running),
+                    memory_per_job_mb, None if token_limit is None else token_limit - License_Tokens(cpus)*len(running)) >= 1:
+                job = pending.pop(0)
+                attempts[job] += 1
+                for suffix in ('.lck', '_monitor.json'):
+                    if os.path.exists(os.path.join(directory, job + suffix)):
+                        os.remove(os.path.join(directory, job + suffix))
+                if monitor_drop is not None:
+                    monitors[job] = New_Monitor()
+                cmd = command.format(job=job, input=job + '.inp', cpus=cpus, memory_mb=int(memory_per_job_mb))
+                running[job] = (subprocess.Popen(cmd, shell=True, cwd=directory), time.time())
+            time.sleep(poll_interval)
+            for job in list(running):
+                if monitors.get(job) is not None and running[job][0].poll() is None:
+                    stop = Poll_Job(monitors[job], directory, job, monitor_drop)
+                    if stop is not None:
+                        Stop_Job(directory, job, monitors[job], stop, terminate_command)
+                        monitors[job] = None
+            for job in list(running):
+                proc, start = running[job]
+                if proc.poll() is None:
+                    continue
+                del running[job]
+                ok = (proc.returncode == 0 and Sta_Status(directory, job) != 'failed') or Monitor_Status(directory, job) == 'captured'
+                if ok:
+                    status[job] = 'completed'
+                elif attempts[job] <= max_retries:
+                    status[job] = 'retrying'
+                    pending.append(job)
+                else:
+                    status[job] = 'failed'
+                log.write(json.dumps({'job': job, 'attempt': attempts[job], 'cpus': cpus,
+                    'memory_mb': int(memory_per_job_mb), 'returncode': proc.returncode,
+                    'status': status[job], 'wall_time': round(time.time() - start, 3)}) + '\n')
+                log.flush()
+    finally:
+        for proc, start in running.values():
+            proc.kill()
+        log.close()
+    return status
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Run a directory of .inp decks on one host.')
+    parser.add_argument('directory')
+    parser.add_argument('--cpus', type=int, required=True, help='total core budget')
+    parser.add_argument('--memory-gb', type=float, help='host memory budget (default: 80%% of RAM)')
+    parser.add_argument('--memory-per-job-gb', type=float, default=4.0)
+    parser.add_argument('--tokens', type=int, help='license token limit')
+    parser.add_argument('--cpus-per-job', type=int)
+    parser.add_argument('--max-cpus-per-job', type=int)
+    parser.add_argument('--retries', type=int, default=1)
+    parser.add_argument('--command', default=myAbaqusCommand)
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--monitor-drop', type=float, help='stop jobs this fraction below the peak load (job_monitor.py)')
+    parser.add_argument('--terminate-command')
+    args = parser.parse_args(argv[1:])
+    memory_mb = args.memory_gb*1024 if args.memory_gb else 0.8*Host_Memory_MB()
+    status = Run_Jobs(args.directory, args.cpus, memory_mb, args.memory_per_job_gb*1024,
+        args.tokens, args.retries, args.command, args.cpus_per_job, args.max_cpus_per_job,
+        args.poll_interval, monitor_drop=args.monitor_drop, terminate_command=args.terminate_command)
+    failed = sorted(j for j, s in status.items() if s != 'completed')
+    print('%d completed, %d failed %s' % (len(status) - len(failed), len(failed), ' '.join(failed)))
+    return 1 if failed else 0
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
@@ -0,0 +1,195 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+stage_profile.py — Per-stage wall time, CPU time and peak memory of model builds
+
+Pipeline functions (Create_Partion, Create_Mesh, Select_Element_Type,
+Create_Inp_File, ...) are wrapped with Profiled(); every call appends one JSON
+line to the log:
+
+  {"model": "P1_00003", "stage": "Create_Mesh", "wall_s": ..., "cpu_s": ...,
+   "peak_rss_mb": ..., "rss_growth_mb": ...}
+
+and End_Model_Profile() appends a "total" line with the model's wall/CPU
+time, the time spent outside the profiled stages, element and node counts and
+the deck size. Peak RSS is the process high-water mark after the stage
+(resource on Linux/macOS, GetProcessMemoryInfo on Windows).
+
+The summary aggregates one or more logs by stage across a sweep.
+
+Run with:
+abaqus cae noGUI=P1.py -- --sweep sweep.csv --profile profile.jsonl
+python native_inp.py --sweep sweep.csv --profile profile.jsonl
+python stage_profile.py profile.jsonl [more.jsonl ...]
+"""
+
+import json
+import os
+import sys
+import time
+
+#------------------------------------------------------------------------------
+
+myProfile = {'log': None, 'model': None, 'start': None, 'stages': 0.0, 'depth': 0}
+
+#------------------------------------------------------------------------------
+
+def Cpu_Seconds():
+    t = os.times()
+    return t[0] + t[1]
+
+#------------------------------------------------------------------------------
+
+def Windows_Peak_Rss_Mb():
+    import ctypes
+    from ctypes import wintypes
+
+    class Counters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [(n, ctypes.c_size_t) for n in (
+            'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+            'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+    c = Counters()
+    c.cb = ctypes.sizeof(c)
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(c), c.cb):
+        return None
+    return c.PeakWorkingSetSize/1024.0**2
+
+#------------------------------------------------------------------------------
+
+def Peak_Rss_Mb():
+    try:
+        import resource
+    except ImportError:
+        try:
+            return Windows_Peak_Rss_Mb()
+        except Exception:
+            return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return rss/1024.0**2 if sys.platform == 'darwin' else rss/1024.0
+
+#------------------------------------------------------------------------------
+
+def Profile_From_Argv(argv):
+    # --profile <log.jsonl>
+    if '--profile' in argv:
+        return argv[argv.index('--profile') + 1]
+    return None
+
+#------------------------------------------------------------------------------
+
+def Append_Record(record):
+    with open(myProfile['log'], 'a') as f:
+        f.write(json.dumps(record, sort_keys=True) + '\n')
+
+#------------------------------------------------------------------------------
+
+def Start_Model_Profile(log_path, model):
+    myProfile.update({'log': log_path, 'model': model, 'stages': 0.0, 'depth': 0,
+        'start': (time.time(), Cpu_Seconds())})
+
+#------------------------------------------------------------------------------
+
+def Profiled(func, stage=None):
+    # Wrap a pipeline function; records nothing unless a model profile is open.
+    # Stages called from other stages are logged with their depth and only
+    # top-level stages count towards the profiled time.
+    stage = stage or func.__name__
+
+    def wrapper(*args, **kwargs):
+        if myProfile['start'] is None:
+            return func(*args, **kwargs)
+        rss0 = Peak_Rss_Mb()
+        depth = myProfile['depth']
+        myProfile['depth'] = depth + 1
+        wall0, cpu0 = time.time(), Cpu_Seconds()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall = time.time() - wall0
+            rss = Peak_Rss_Mb()
+            myProfile['depth'] = depth
+            if depth == 0:
+                myProfile['stages'] += wall
+            Append_Record({'model': myProfile['model'], 'stage': stage, 'depth': depth, 'wall_s': wall,
+                'cpu_s': Cpu_Seconds() - cpu0, 'peak_rss_mb': rss,
+                'rss_growth_mb': None if rss is None else rss - rss0})
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+#------------------------------------------------------------------------------
+
+def End_Model_Profile(elements=None, nodes=None, deck_path=None):
+    if myProfile['start'] is None:
+        return
+    wall0, cpu0 = myProfile['start']
+    wall = time.time() - wall0
+    Append_Record({'model': myProfile['model'], 'stage': 'total', 'wall_s': wall,
+        'cpu_s': Cpu_Seconds() - cpu0, 'unprofiled_s': wall - myProfile['stages'],
+        'peak_rss_mb': Peak_Rss_Mb(), 'elements': elements, 'nodes': nodes,
+        'deck_bytes': os.path.getsize(deck_path) if deck_path and os.path.isfile(deck_path) else None})
+    myProfile['start'] = None
+
+#------------------------------------------------------------------------------
+
+def Read_Profile_Logs(paths):
+    records = []
+    for path in paths:
+        with open(path) as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+#------------------------------------------------------------------------------
+
+def Summarize(records):
+    # one row per stage: calls, wall/CPU totals, mean and max wall, share of
+    # the total build wall time and the largest peak RSS seen after it
+    # (shares of nested stages overlap their caller's)
+    totals = [r for r in records if r['stage'] == 'total']
+    build_wall = sum(r['wall_s'] for r in totals) or 1.0
+    stages = {}
+    for r in records:
+        s = stages.setdefault(r['stage'], {'stage': r['stage'], 'calls': 0, 'wall_s': 0.0,
+            'cpu_s': 0.0, 'max_wall_s': 0.0, 'peak_rss_mb': None})
+        s['calls'] += 1
+        s['wall_s'] += r['wall_s']
+        s['cpu_s'] += r['cpu_s']
+        s['max_wall_s'] = max(s['max_wall_s'], r['wall_s'])
+        if r.get('peak_rss_mb') is not None:
+            s['peak_rss_mb'] = max(s['peak_rss_mb'] or 0.0, r['peak_rss_mb'])
+    if totals:
+        s = stages['total']
+        s['wall_s'] = build_wall
+        stages['unprofiled'] = {'stage': 'unprofiled', 'calls': len(totals), 'cpu_s': 0.0,
+            'wall_s': sum(r['unprofiled_s'] for r in totals),
+            'max_wall_s': max(r['unprofiled_s'] for r in totals), 'peak_rss_mb': None}
+    rows = sorted(stages.values(), key=lambda s: -s['wall_s'])
+    for s in rows:
+        s['mean_wall_s'] = s['wall_s']/s['calls']
+        s['share'] = s['wall_s']/build_wall
+    return rows, totals
+
+#------------------------------------------------------------------------------
+
+def Print_Summary(rows, totals, out=sys.stdout):
+    out.write('%-36s %7s %11s %11s %11s %11s %7s %10s\n' % ('stage', 'calls', 'wall_s', 'cpu_s',
+        'mean_s', 'max_s', 'share', 'peak_mb'))
+    for s in rows:
+        out.write('%-36s %7d %11.3f %11.3f %11.4f %11.4f %6.1f%% %10s\n' % (s['stage'], s['calls'],
+            s['wall_s'], s['cpu_s'], s['mean_wall_s'], s['max_wall_s'], 100.0*s['share'],
+            '-' if s['peak_rss_mb'] is None else '%.0f' % s['peak_rss_mb']))
+    elements = sum(r.get('elements') or 0 for r in totals)
+    deck_bytes = sum(r.get('deck_bytes') or 0 for r in totals)
+    wall = sum(r['wall_s'] for r in totals)
+    if totals and wall > 0:
+        out.write('%d models, %d elements, %.1f MB of decks in %.1f s: %.3g models/h, %.3g elements/s\n' % (
+            len(totals), elements, deck_bytes/1024.0**2, wall, 3600.0*len(totals)/wall, elements/wall))
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    myRows, myTotals = Summarize(Read_Profile_Logs(sys.argv[1:]))
+    Print_Summary(myRows, myTotals)
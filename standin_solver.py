@@ -0,0 +1,121 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+standin_solver.py — Stand-in for the Abaqus solver when testing the tooling
+
+Reads <job>.inp from the current directory, waits a little and writes a
+<job>.sta file that ends like a finished Abaqus run, so scheduling and
+post-processing can be exercised without an Abaqus licence.
+
+With --curve it also writes a synthetic RP-1 curve (<job>_rp1.npz, as
+odb_extract.py would) whose ultimate load and stiffness fall towards a
+limit as the deck's element count grows, like a converging mesh.
+
+With --stream the run is spread over the curve's increments: each one
+appends a line to <job>.sta and the RP-1 U1/RF1 table to <job>.dat, as
+Abaqus/Standard does with the "monitor" output profile, so job_monitor.py
+can follow it. 'standin_solver.py <job> --terminate' stops a streaming run
+after its current increment, as 'abaqus terminate' stops a real one.
+
+Run with:
+python standin_solver.py P1 --seconds 2 --fail-rate 0.1
+python standin_solver.py P1 --curve
+python standin_solver.py P1 --curve --stream --seconds 10
+python standin_solver.py P1 --terminate
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+#------------------------------------------------------------------------------
+
+def Count_Elements(inp_path):
+    count, inside = 0, False
+    with open(inp_path) as f:
+        for line in f:
+            if line.startswith('*'):
+                inside = line.lower().startswith('*element,')
+            elif inside:
+                count += 1
+    return count
+
+#------------------------------------------------------------------------------
+
+def Synthetic_Curve(elements, displacement=20.0, frames=200):
+    import numpy as np
+    ultimate = 60000.0*(1.0 + 20.0/elements**0.5)
+    stiffness = 50000.0*(1.0 + 10.0/elements**0.5)
+    d = np.linspace(0.0, displacement, frames + 1)
+    p = ultimate*np.tanh(stiffness*d/ultimate)*np.exp(-np.maximum(d - 8.0, 0.0)/4.0)
+    return d, p
+
+#------------------------------------------------------------------------------
+
+def Stream_Run(job, d, p, seconds, failed):
+    # Write the increments one by one; returns how many were written before
+    # the end, a failure half way or a stop file
+    frames = len(d) - 1 if not failed else (len(d) - 1)//2
+    with open(job + '.sta', 'w') as sta, open(job + '.dat', 'w') as dat:
+        sta.write(' SUMMARY OF JOB INFORMATION:\n STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF       DOF    IF\n')
+        for i in range(1, frames + 1):
+            if os.path.exists(job + '.stop'):
+                return i - 1
+            time.sleep(seconds/float(len(d) - 1))
+            t, dt = i/float(len(d) - 1), 1.0/float(len(d) - 1)
+            sta.write('  1 %5d   1     0     3     3  %-10.4g %-10.4g %-10.4g\n' % (i, t, t, dt))
+            dat.write('\n                                INCREMENT %5d SUMMARY\n\n\n'
+                ' TIME INCREMENT COMPLETED  %.3E,  FRACTION OF STEP COMPLETED  %.4g\n'
+                ' STEP TIME COMPLETED       %.4g    ,  TOTAL TIME COMPLETED        %.4g\n\n'
+                '  THE FOLLOWING TABLE IS PRINTED FOR NODES BELONGING TO NODE SET ASSEMBLY_RP-1\n\n'
+                '    NODE FOOT-    U1             RF1\n         NOTE\n\n'
+                '         1      %.4E   %.4E\n\n' % (i, dt, t, t, t, -d[i], -p[i]))
+            sta.flush()
+            dat.flush()
+    return frames
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Stand-in for the Abaqus solver.')
+    parser.add_argument('job')
+    parser.add_argument('--seconds', type=float, default=1.0)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--curve', action='store_true')
+    parser.add_argument('--stream', action='store_true')
+    parser.add_argument('--terminate', action='store_true')
+    args = parser.parse_args(argv[1:])
+    if args.terminate:
+        open(args.job + '.stop', 'w').close()
+        return 0
+    if os.path.exists(args.job + '.stop'):
+        os.remove(args.job + '.stop')
+    with open(args.job + '.inp') as f:
+        f.readline()
+    failed = random.random() < args.fail_rate
+    frames = None
+    if args.stream:
+        d, p = Synthetic_Curve(Count_Elements(args.job + '.inp'))
+        frames = Stream_Run(args.job, d, p, args.seconds, failed)
+        stopped = frames < len(d) - 1 and not failed
+    else:
+        time.sleep(args.seconds)
+        stopped = False
+    if args.curve and not failed:
+        from odb_extract import Write_Curve
+        d, p = Synthetic_Curve(Count_Elements(args.job + '.inp'))
+        n = len(d) if frames is None else frames + 1
+        Write_Curve(args.job + '_rp1', {'time': d[:n]/d[-1], 'U1': -d[:n], 'RF1': -p[:n]},
+            {'job': args.job, 'rp_set': 'RP-1', 'steps': ['Loading'], 'solver': 'standin_solver.py'})
+    with open(args.job + '.sta', 'a' if args.stream else 'w') as f:
+        if not args.stream:
+            f.write(' SUMMARY OF JOB INFORMATION:\n')
+        f.write(' THE ANALYSIS HAS NOT BEEN COMPLETED\n' if failed or stopped else ' THE ANALYSIS HAS COMPLETED SUCCESSFULLY\n')
+    return 1 if failed or stopped else 0
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
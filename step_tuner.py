@@ -0,0 +1,350 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+step_tuner.py — Loading-step increment settings from the convergence of earlier runs
+
+Parses the Abaqus/Standard status and message files of finished runs line by
+line (a file may still be growing; only complete lines are read, from a byte
+offset):
+
+  <job>.sta  one line per attempt: step, increment, attempt (a 'U' marks a
+             cut-back), severe discontinuity, equilibrium and total
+             iterations, total, step and increment time
+  <job>.msg  severe discontinuities and contact status changes
+             ("n POINTS CHANGED FROM OPEN TO CLOSED", ...) and warnings
+
+and reduces each run to one record of solver_record.jsonl with its inputs
+and statistics: converged increments, cut-backs, iterations per increment,
+contact changes, the increment sizes it took and the step time it reached.
+A run job_monitor.py stopped after the load drop is recorded as "captured"
+and, like a completed run, is learnt from.
+
+Records count the Loading step only: with a Closure step (myGapClosure = 1)
+that is step 2, and the Closure increments are left out.
+
+For a new row, the tuner takes the completed runs nearest to it in the
+dimensionless inputs (end distance, half height, thickness and clearance
+over the hole diameter, Ftu/Fty, friction, displacement over the hole
+diameter) and proposes myInitialInc, myMaxInc, myMinInc and myMaxNumInc:
+
+  myMaxInc     doubled (up to myMaxIncLimit) if the neighbours were held at
+               their maxInc and hardly cut back; the 75th percentile of the
+               increments they took if they cut back often; else unchanged
+  myInitialInc the median of their first converged increments
+  myMinInc     lowered to myMinIncFraction of the smallest increment they
+               needed, never raised: a row may need a deeper cut-back than
+               its neighbours
+  myMaxNumInc  myIncrementSafety times the increments they needed for the
+               whole step, scaled to the new myMaxInc
+
+Rows without enough completed neighbours keep their settings. P1.py and
+native_inp.py apply the proposals with '--step-record <file>'; Explicit rows
+(myExplicit = 1) are never tuned.
+
+Run with:
+python step_tuner.py stats P1
+python step_tuner.py record P1_sweep_manifest.csv --directory .
+python step_tuner.py propose sweep.csv
+python native_inp.py --sweep sweep.csv --step-record solver_record.jsonl
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import re
+import sys
+
+import numpy as np
+
+from scheduler import Monitor_Status, myStaCompleted, myStaFailed
+from sweep import myTextInputNames, Read_Parameter_Table, Read_Sweep_Spec
+
+#------------------------------------------------------------------------------
+
+myStepRecordFile = 'solver_record.jsonl'
+myStepInputs = ('myInitialInc', 'myMaxInc', 'myMinInc', 'myMaxNumInc')
+
+myNeighbours = 3             #completed runs a proposal is based on
+myCutbackLow = 0.05          #cut-backs per increment below which maxInc may grow
+myCutbackHigh = 0.2          #above which maxInc drops to what converged
+myAtMaxFraction = 0.5        #increments at maxInc for it to count as the limit
+myMaxIncLimit = 0.1
+myIncrementSafety = 2.0
+myMinIncFraction = 1e-3     #of the smallest increment the neighbours needed
+
+myContactChange = re.compile(r'(\d+)\s+POINTS?\s+CHANGED\s+FROM\s+(\w+)\s+TO\s+(\w+)', re.I)
+mySevereDiscontinuities = re.compile(r'(\d+)\s+SEVERE\s+DISCONTINUIT', re.I)
+myMsgStep = re.compile(r'S T E P\s+(\d+)')
+
+#------------------------------------------------------------------------------
+
+def Read_New_Lines(path, offset=0):
+    # (complete lines from offset on, offset after the last of them)
+    if not os.path.isfile(path):
+        return [], offset
+    with io.open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    return data[:end].decode('latin-1').splitlines(), offset + end
+
+#------------------------------------------------------------------------------
+
+def Sta_Increment(line):
+    # dict of one attempt line of a .sta file, or None for any other line
+    fields = line.split()
+    if len(fields) < 9 or not (fields[0].isdigit() and fields[1].isdigit()):
+        return None
+    attempt = fields[2].rstrip('Uu')
+    if not attempt.isdigit():
+        return None
+    try:
+        values = [float(v) for v in fields[3:9]]
+    except ValueError:
+        return None
+    return {'step': int(fields[0]), 'increment': int(fields[1]), 'attempt': int(attempt),
+        'cutback': fields[2][-1] in 'Uu', 'severe': int(values[0]), 'equilibrium': int(values[1]),
+        'iterations': int(values[2]), 'total_time': values[3], 'step_time': values[4], 'inc_time': values[5]}
+
+#------------------------------------------------------------------------------
+
+def New_Stats(only_step=None):
+    # only_step: count the increments and messages of that step alone
+    return {'increments': 0, 'attempts': 0, 'cutbacks': 0, 'severe_iterations': 0,
+        'equilibrium_iterations': 0, 'iterations': 0, 'step': None, 'step_time': 0.0,
+        'total_time': 0.0, 'inc_sizes': [], 'status': None, 'sta_offset': 0,
+        'msg_offset': 0, 'contact_changes': {}, 'severe_discontinuities': 0, 'warnings': 0,
+        'only_step': only_step, 'msg_step': None}
+
+#------------------------------------------------------------------------------
+
+def Loading_Step(myInputs):
+    # Step number of Loading: 2 after a Closure step (Abaqus/Standard only)
+    closure = int(float(myInputs.get('myGapClosure') or 0)) and not int(float(myInputs.get('myExplicit') or 0))
+    return 2 if closure else 1
+
+#------------------------------------------------------------------------------
+
+def Update_Sta_Stats(stats, lines):
+    # Add .sta lines to the stats; returns the new converged increments
+    new = []
+    for line in lines:
+        if myStaCompleted in line:
+            stats['status'] = 'completed'
+        elif myStaFailed in line:
+            stats['status'] = 'failed'
+        inc = Sta_Increment(line)
+        if inc is None or stats['only_step'] not in (None, inc['step']):
+            continue
+        stats['attempts'] += 1
+        stats['severe_iterations'] += inc['severe']
+        stats['equilibrium_iterations'] += inc['equilibrium']
+        stats['iterations'] += inc['iterations']
+        if inc['cutback']:
+            stats['cutbacks'] += 1
+            continue
+        stats['increments'] += 1
+        stats['step'] = inc['step']
+        stats['step_time'] = inc['step_time']
+        stats['total_time'] = inc['total_time']
+        stats['inc_sizes'].append(inc['inc_time'])
+        new.append(inc)
+    return new
+
+#------------------------------------------------------------------------------
+
+def Update_Msg_Stats(stats, lines):
+    for line in lines:
+        m = myMsgStep.search(line)
+        if m:
+            stats['msg_step'] = int(m.group(1))
+            continue
+        if stats['only_step'] not in (None, stats['msg_step']):
+            continue
+        m = myContactChange.search(line)
+        if m:
+            kind = '%s_to_%s' % (m.group(2).lower(), m.group(3).lower())
+            stats['contact_changes'][kind] = stats['contact_changes'].get(kind, 0) + int(m.group(1))
+            continue
+        m = mySevereDiscontinuities.search(line)
+        if m:
+            stats['severe_discontinuities'] += int(m.group(1))
+        elif '***WARNING' in line:
+            stats['warnings'] += 1
+
+#------------------------------------------------------------------------------
+
+def Poll_Run_Stats(stats, directory, job):
+    # Read what the .sta and .msg gained since the last call
+    lines, stats['sta_offset'] = Read_New_Lines(os.path.join(directory, job + '.sta'), stats['sta_offset'])
+    new = Update_Sta_Stats(stats, lines)
+    lines, stats['msg_offset'] = Read_New_Lines(os.path.join(directory, job + '.msg'), stats['msg_offset'])
+    Update_Msg_Stats(stats, lines)
+    return new
+
+#------------------------------------------------------------------------------
+
+def Run_Record(stats, job, myInputs):
+    # One solver_record.jsonl line of a finished run
+    sizes = np.asarray(stats['inc_sizes'], dtype=float)
+    record = {'job': job, 'status': stats['status'], 'increments': stats['increments'],
+        'cutbacks': stats['cutbacks'], 'iterations': stats['iterations'],
+        'severe_iterations': stats['severe_iterations'], 'step_time': stats['step_time'],
+        'contact_changes': stats['contact_changes'], 'warnings': stats['warnings'],
+        'inputs': dict((n, v) for n, v in myInputs.items() if n not in myTextInputNames)}
+    if len(sizes):
+        record['inc_sizes'] = dict(zip(('min', 'p25', 'median', 'p75', 'max'),
+            [float(v) for v in np.percentile(sizes, [0, 25, 50, 75, 100])]))
+        record['first_inc'] = float(np.median(sizes[:5]))
+        record['at_max_inc'] = float(np.mean(sizes >= 0.999*myInputs['myMaxInc'])) if 'myMaxInc' in myInputs else None
+    return record
+
+#------------------------------------------------------------------------------
+
+def Record_Runs(manifest_path, directory, record_path=myStepRecordFile):
+    # Append the records of the manifest's finished runs; returns their count
+    count = 0
+    with open(record_path, 'a') as f:
+        for row in Read_Parameter_Table(manifest_path):
+            stats = New_Stats(Loading_Step(row))
+            Poll_Run_Stats(stats, directory, row['name'])
+            # terminated by job_monitor.py: the .sta says not completed
+            if Monitor_Status(directory, row['name']) == 'captured':
+                stats['status'] = 'captured'
+            if stats['status'] is None:
+                continue
+            f.write(json.dumps(Run_Record(stats, row['name'], row), sort_keys=True) + '\n')
+            count += 1
+    return count
+
+#------------------------------------------------------------------------------
+
+def Read_Step_Record(record_path):
+    # Completed (or captured) implicit runs of a solver_record.jsonl, latest
+    # record per job
+    records = {}
+    if os.path.isfile(record_path):
+        with open(record_path) as f:
+            for line in f:
+                if line.strip():
+                    r = json.loads(line)
+                    records[r['job']] = r
+    return [r for r in records.values() if r['status'] in ('completed', 'captured') and r.get('inc_sizes')
+        and not r['inputs'].get('myExplicit')]
+
+#------------------------------------------------------------------------------
+
+def Step_Features(rows):
+    # Dimensionless inputs the convergence depends on, one row per input row
+    x = dict((n, np.array([float(r[n]) for r in rows])) for n in ('myBoltDia', 'myClearance', 'myEndLength',
+        'myPlateHalfHeight', 'myPlateThickness', 'MyFtu', 'MyFty', 'myFriction', 'myDisplacement'))
+    d0 = x['myBoltDia'] + x['myClearance']
+    return np.column_stack([x['myEndLength']/d0, x['myPlateHalfHeight']/d0, x['myPlateThickness']/d0,
+        x['myClearance']/d0, x['MyFtu']/x['MyFty'], x['myFriction'], x['myDisplacement']/d0])
+
+#------------------------------------------------------------------------------
+
+def Propose_Step(neighbours, myInputs):
+    # Step settings for a row from its neighbours' records
+    cutback_rate = sum(r['cutbacks'] for r in neighbours)/float(max(1, sum(r['increments'] for r in neighbours)))
+    at_max = np.median([r.get('at_max_inc') or 0.0 for r in neighbours])
+    max_inc = myInputs['myMaxInc']
+    if cutback_rate <= myCutbackLow and at_max >= myAtMaxFraction:
+        max_inc = min(myMaxIncLimit, 2.0*max_inc)
+    elif cutback_rate >= myCutbackHigh:
+        max_inc = min(max_inc, float(np.median([r['inc_sizes']['p75'] for r in neighbours])))
+    # increments each neighbour would need for the whole step at the new maxInc
+    needed = max(r['increments']/max(r['step_time'], 1e-12)
+        *min(1.0, r['inputs'].get('myMaxInc', max_inc)/max_inc) for r in neighbours)
+    return {'myMaxInc': max_inc,
+        'myInitialInc': min(max_inc, float(np.median([r['first_inc'] for r in neighbours]))),
+        'myMinInc': min(myInputs['myMinInc'], myMinIncFraction*min(r['inc_sizes']['min'] for r in neighbours)),
+        'myMaxNumInc': int(max(math.ceil(myIncrementSafety*needed), math.ceil(1.0/max_inc)))}
+
+#------------------------------------------------------------------------------
+
+def Tuned_Steps(records, rows, k=myNeighbours):
+    # [{input: value} overrides] for the rows, {} where there is nothing to learn from
+    if len(records) < k or not rows:
+        return [{} for r in rows]
+    known = Step_Features([r['inputs'] for r in records])
+    scale = known.std(axis=0)
+    scale[scale == 0] = 1.0
+    query = Step_Features(rows)
+    overrides = []
+    for row, x in zip(rows, query):
+        if row.get('myExplicit'):
+            overrides.append({})
+            continue
+        nearest = np.argsort((((known - x)/scale)**2).sum(axis=1))[:k]
+        overrides.append(Propose_Step([records[i] for i in nearest], row))
+    return overrides
+
+#------------------------------------------------------------------------------
+
+def Step_Record_From_Argv(argv):
+    # --step-record <file>
+    if '--step-record' in argv:
+        return Read_Step_Record(argv[argv.index('--step-record') + 1])
+    return None
+
+#------------------------------------------------------------------------------
+
+def Tune_Sweep(records, rows):
+    # The rows with their proposed step settings (records None: unchanged)
+    if records is None:
+        return rows
+    tuned = []
+    for row, override in zip(rows, Tuned_Steps(records, rows)):
+        row = dict(row)
+        row.update(override)
+        tuned.append(row)
+    return tuned
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Convergence statistics and step settings of P1 runs.')
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('stats')
+    p.add_argument('jobs', nargs='+')
+    p.add_argument('--directory', default='.')
+    p = sub.add_parser('record')
+    p.add_argument('manifest')
+    p.add_argument('--directory', default='.')
+    p.add_argument('--out', default=myStepRecordFile)
+    p = sub.add_parser('propose')
+    p.add_argument('sweep')
+    p.add_argument('--record', default=myStepRecordFile)
+    args = parser.parse_args(argv[1:])
+
+    if args.command == 'stats':
+        for job in args.jobs:
+            stats = New_Stats()
+            Poll_Run_Stats(stats, args.directory, job)
+            print('%s: %s, %d increments, %d cut-backs, %d iterations, step time %g, contact changes %s' % (job,
+                stats['status'] or 'running', stats['increments'], stats['cutbacks'], stats['iterations'],
+                stats['step_time'], json.dumps(stats['contact_changes'], sort_keys=True)))
+    elif args.command == 'record':
+        print('%d runs recorded in %s' % (Record_Runs(args.manifest, args.directory, args.out), args.out))
+    elif args.command == 'propose':
+        from p1_core import Default_Inputs
+        rows = []
+        for row in Read_Sweep_Spec(args.sweep):
+            myRowInputs = Default_Inputs()
+            myRowInputs.update(row)
+            rows.append(myRowInputs)
+        for i, override in enumerate(Tuned_Steps(Read_Step_Record(args.record), rows)):
+            print('%5d  %s' % (i + 1, ', '.join('%s %g' % (n, override[n]) for n in myStepInputs if n in override)
+                or 'unchanged'))
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(Main(sys.argv))
@@ -0,0 +1,372 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+surrogate.py — Gaussian-process surrogate of the ultimate load, with active learning
+
+Learns the ultimate load of completed P1 runs over
+
+  myEndLength/myArcDia, myPlateThickness, myClearance, MyFtu/MyFty
+
+and predicts it with a standard deviation for any input row. The target is
+the dimensionless ultimate_load/(MyFtu*myBoltDia*myPlateThickness), so rows
+with other strengths or bolt diameters share one model. The GP uses a
+squared-exponential kernel with one length scale per feature; length scales
+and noise are chosen by maximising the log marginal likelihood (random search
+plus local refinement, NumPy only). Accuracy is the closed-form
+leave-one-out relative error.
+
+Active learning draws Latin-hypercube candidates over the given input ranges
+and adds, one at a time, the candidate with the largest predicted relative
+standard deviation (the variance is updated as if it had been run, so a batch
+does not cluster). 'loop' repeats write deck -> solve -> fit -> pick until the
+leave-one-out error reaches the target.
+
+Training tables are CSV files with input columns plus ultimate_load.
+
+Run with:
+python surrogate.py collect P1_sweep_manifest.csv --out training.csv
+python surrogate.py fit training.csv --model surrogate.npz
+python surrogate.py predict surrogate.npz rows.csv
+python surrogate.py next training.csv --ranges ranges.json --count 8 --out next_sweep.csv
+python surrogate.py loop --ranges ranges.json --command "python /path/to/standin_solver.py {job} --curve"
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from sweep import Converged_Mesh, Latin_Hypercube, Mesh_Record_From_Argv, myInputNames, Read_Parameter_Table, Read_Sweep_Spec
+from p1_core import Default_Inputs
+
+#------------------------------------------------------------------------------
+
+myFeatureNames = ('end_ratio', 'myPlateThickness', 'myClearance', 'strength_ratio')
+myTargetName = 'ultimate_load'
+
+myLengthScaleRange = (-1.0, 1.0)   #log10, on features scaled to [0, 1]
+myNoiseRange = (-6.0, -1.0)        #log10, relative to the target variance
+
+#------------------------------------------------------------------------------
+
+def Features(rows):
+    return np.array([[r['myEndLength']/(r['myBoltDia'] + r['myClearance']), r['myPlateThickness'],
+        r['myClearance'], r['MyFtu']/r['MyFty']] for r in rows], dtype=float).reshape(-1, len(myFeatureNames))
+
+#------------------------------------------------------------------------------
+
+def Load_Scale(rows):
+    # ultimate_load = Load_Scale * dimensionless target
+    return np.array([r['MyFtu']*r['myBoltDia']*r['myPlateThickness'] for r in rows], dtype=float)
+
+#------------------------------------------------------------------------------
+
+def Kernel(A, B, length_scales):
+    A = A/length_scales
+    B = B/length_scales
+    d2 = (A*A).sum(1)[:, np.newaxis] + (B*B).sum(1)[np.newaxis, :] - 2.0*A.dot(B.T)
+    return np.exp(-0.5*np.maximum(d2, 0.0))
+
+#------------------------------------------------------------------------------
+
+def Log_Likelihood(Xn, t, length_scales, noise):
+    K = Kernel(Xn, Xn, length_scales) + noise*np.eye(len(t))
+    try:
+        L = np.linalg.cholesky(K)
+    except np.linalg.LinAlgError:
+        return -np.inf
+    alpha = np.linalg.solve(L.T, np.linalg.solve(L, t))
+    return -0.5*t.dot(alpha) - np.log(np.diag(L)).sum() - 0.5*len(t)*np.log(2.0*np.pi)
+
+#------------------------------------------------------------------------------
+
+def Factorize(model):
+    K = Kernel(model['Xn'], model['Xn'], model['length_scales']) + model['noise']*np.eye(len(model['t']))
+    model['L'] = np.linalg.cholesky(K)
+    Linv = np.linalg.solve(model['L'], np.eye(len(K)))
+    model['Kinv'] = Linv.T.dot(Linv)
+    model['alpha'] = model['Kinv'].dot(model['t'])
+    return model
+
+#------------------------------------------------------------------------------
+
+def Fit_Gp(X, y, trials=200, refine=100, seed=0):
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    lo, hi = X.min(0), X.max(0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    Xn = (X - lo)/span
+    ym, ys = y.mean(), (y.std() if y.std() > 0 else 1.0)
+    t = (y - ym)/ys
+
+    rng = np.random.RandomState(seed)
+    d = X.shape[1]
+    best = (-np.inf, None)
+    for k in range(trials + refine):
+        if k < trials or best[1] is None:
+            p = np.concatenate([rng.uniform(myLengthScaleRange[0], myLengthScaleRange[1], d),
+                rng.uniform(myNoiseRange[0], myNoiseRange[1], 1)])
+        else:
+            p = np.clip(best[1] + rng.normal(0.0, 0.1, d + 1),
+                [myLengthScaleRange[0]]*d + [myNoiseRange[0]], [myLengthScaleRange[1]]*d + [myNoiseRange[1]])
+        lml = Log_Likelihood(Xn, t, 10.0**p[:d], 10.0**p[d])
+        if lml > best[0]:
+            best = (lml, p)
+    p = best[1]
+    model = {'X': X, 'y': y, 'lo': lo, 'span': span, 'Xn': Xn, 'ym': ym, 'ys': ys, 't': t,
+        'length_scales': 10.0**p[:d], 'noise': 10.0**p[d], 'log_likelihood': best[0]}
+    return Factorize(model)
+
+#------------------------------------------------------------------------------
+
+def Predict_Gp(model, X):
+    # mean and standard deviation of the target at X (m, d)
+    Xn = (np.asarray(X, dtype=float).reshape(-1, model['Xn'].shape[1]) - model['lo'])/model['span']
+    Ks = Kernel(Xn, model['Xn'], model['length_scales'])
+    var = np.maximum(1.0 - (Ks.dot(model['Kinv'])*Ks).sum(1), 0.0)
+    return model['ym'] + model['ys']*Ks.dot(model['alpha']), model['ys']*np.sqrt(var)
+
+#------------------------------------------------------------------------------
+
+def Loo_Error(model):
+    # leave-one-out relative errors, from the factorised kernel in closed form
+    residual = model['alpha']/np.diag(model['Kinv'])*model['ys']
+    return np.abs(residual)/np.maximum(np.abs(model['y']), 1e-12)
+
+#------------------------------------------------------------------------------
+
+def Next_Batch(model, C, count):
+    # greedy batch of candidate rows C (m, d) with the largest relative std;
+    # each pick joins the training points before the next one is chosen, as
+    # a rank-one update of the candidates' posterior covariance (the
+    # training factor L is not refactorised)
+    Cn = (np.asarray(C, dtype=float) - model['lo'])/model['span']
+    Ks = Kernel(Cn, model['Xn'], model['length_scales'])
+    mean = np.abs(model['ym'] + model['ys']*Ks.dot(model['alpha']))
+    # posterior covariance of the candidates: Kernel(Cn, Cn) - V.T V - sum of u u.T
+    V = np.linalg.solve(model['L'], Ks.T)
+    var = 1.0 - (V*V).sum(0)
+    updates = []
+    picked = []
+    for k in range(min(count, len(Cn))):
+        score = np.sqrt(np.maximum(var, 0.0))*model['ys']/np.maximum(mean, 1e-12)
+        score[picked] = -np.inf
+        j = int(np.argmax(score))
+        picked.append(j)
+        cov = Kernel(Cn, Cn[j:j + 1], model['length_scales'])[:, 0] - V.T.dot(V[:, j])
+        for u in updates:
+            cov -= u*u[j]
+        u = cov/np.sqrt(max(cov[j], 0.0) + model['noise'])
+        updates.append(u)
+        var = var - u*u
+    return picked
+
+#------------------------------------------------------------------------------
+
+def Save_Model(path, model):
+    np.savez(path, X=model['X'], y=model['y'], length_scales=model['length_scales'],
+        noise=model['noise'], features=np.array(myFeatureNames))
+
+#------------------------------------------------------------------------------
+
+def Load_Model(path):
+    with np.load(path) as data:
+        X, y = data['X'], data['y']
+        model = {'length_scales': data['length_scales'], 'noise': float(data['noise'])}
+    lo, hi = X.min(0), X.max(0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    ym, ys = y.mean(), (y.std() if y.std() > 0 else 1.0)
+    model.update({'X': X, 'y': y, 'lo': lo, 'span': span, 'Xn': (X - lo)/span, 'ym': ym, 'ys': ys, 't': (y - ym)/ys})
+    return Factorize(model)
+
+#------------------------------------------------------------------------------
+
+def Row_Inputs(myDefaults, rows):
+    myRows = []
+    for row in rows:
+        myRow = dict(myDefaults)
+        myRow.update(row)
+        myRows.append(myRow)
+    return myRows
+
+#------------------------------------------------------------------------------
+
+def Read_Training_Table(path, myDefaults):
+    with open(path) as f:
+        table = list(csv.DictReader(f))
+    rows = Row_Inputs(myDefaults, [dict((k, float(v)) for k, v in r.items()
+        if k in myInputNames and v != '') for r in table])
+    loads = np.array([float(r[myTargetName]) for r in table])
+    return rows, loads, [r.get('name', '') for r in table]
+
+#------------------------------------------------------------------------------
+
+def Write_Training_Table(path, names, rows, loads):
+    columns = [n for n in myInputNames if any(n in r for r in rows)]
+    with open(path, 'w') as f:
+        w = csv.writer(f, lineterminator='\n')
+        w.writerow(['name'] + columns + [myTargetName])
+        for name, row, load in zip(names, rows, loads):
+            w.writerow([name] + [row.get(c, '') for c in columns] + ['%.9g' % load])
+
+#------------------------------------------------------------------------------
+
+def Collect_Training(manifest_path, directory):
+    # rows of a sweep manifest whose <name>_rp1.npz exists, with their ultimate load
+    from curve_capacity import Curve_Capacity, Pad_Curves
+    from odb_extract import Load_Displacement, Read_Curve
+    names, rows, curves = [], [], []
+    for row in Read_Parameter_Table(manifest_path):
+        curve_path = os.path.join(directory, row['name'] + '_rp1.npz')
+        if os.path.isfile(curve_path):
+            names.append(row.pop('name'))
+            rows.append(row)
+            curves.append(Load_Displacement(Read_Curve(curve_path)[0]))
+    loads = Curve_Capacity(*Pad_Curves(curves))[myTargetName] if curves else np.zeros(0)
+    return names, rows, loads
+
+#------------------------------------------------------------------------------
+
+def Fit_Rows(rows, loads, seed=0):
+    return Fit_Gp(Features(rows), np.asarray(loads)/Load_Scale(rows), seed=seed)
+
+#------------------------------------------------------------------------------
+
+def Predict_Rows(model, rows):
+    # ultimate load and its standard deviation for full input rows
+    mean, std = Predict_Gp(model, Features(rows))
+    scale = Load_Scale(rows)
+    return mean*scale, std*scale
+
+#------------------------------------------------------------------------------
+
+def Candidate_Rows(ranges, candidates, seed=None):
+    return Latin_Hypercube(ranges, candidates, seed)
+
+#------------------------------------------------------------------------------
+
+def Active_Learning(directory, myDefaults, ranges, command, target=0.02, initial=8, batch=4,
+        max_runs=100, candidates=2000, seed=0, record=None, training_path=None):
+    from mesh_convergence import Run_Level
+    training_path = training_path or os.path.join(directory, 'surrogate_training.csv')
+    if os.path.isfile(training_path):
+        rows, loads, names = Read_Training_Table(training_path, myDefaults)
+        loads = list(loads)
+    else:
+        rows, loads, names = [], [], []
+    pending = Latin_Hypercube(ranges, initial, seed) if len(rows) < initial else []
+    model, error = None, np.inf
+    round_ = 0
+    while True:
+        for row in pending:
+            if len(rows) >= max_runs:
+                break
+            myRow = Row_Inputs(myDefaults, [row])[0]
+            myRow.update(Converged_Mesh(record or {}, myRow))
+            name = 'AL_%05d' % (len(rows) + 1)
+            ultimate, stiffness, elements = Run_Level(directory, name, myRow, command)
+            rows.append(myRow)
+            loads.append(ultimate)
+            names.append(name)
+            Write_Training_Table(training_path, names, rows, loads)
+        model = Fit_Rows(rows, loads, seed)
+        error = float(np.sqrt(np.mean(Loo_Error(model)**2)))
+        print('round %d: %d runs, leave-one-out relative error %.4g' % (round_, len(rows), error))
+        if error <= target or len(rows) >= max_runs:
+            return model, error, len(rows)
+        pool = Row_Inputs(myDefaults, Candidate_Rows(ranges, candidates, seed + round_ + 1))
+        pending = [dict((k, pool[j][k]) for k in ranges) for j in Next_Batch(model, Features(pool), batch)]
+        round_ += 1
+
+#------------------------------------------------------------------------------
+
+def Read_Ranges(path):
+    # {"ranges": {...}} as in a latin_hypercube sweep spec, or the bare ranges
+    with open(path) as f:
+        spec = json.load(f)
+    return spec.get('ranges', spec)
+
+#------------------------------------------------------------------------------
+
+def Main(argv):
+    parser = argparse.ArgumentParser(description='Gaussian-process surrogate of the P1 ultimate load.')
+    sub = parser.add_subparsers(dest='command_name')
+    p = sub.add_parser('collect')
+    p.add_argument('manifest')
+    p.add_argument('--directory', default='.')
+    p.add_argument('--out', default='training.csv')
+    p = sub.add_parser('fit')
+    p.add_argument('training')
+    p.add_argument('--model', default='surrogate.npz')
+    p = sub.add_parser('predict')
+    p.add_argument('model')
+    p.add_argument('rows')
+    p = sub.add_parser('next')
+    p.add_argument('training')
+    p.add_argument('--ranges', required=True)
+    p.add_argument('--count', type=int, default=8)
+    p.add_argument('--candidates', type=int, default=2000)
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--out', default='next_sweep.csv')
+    p = sub.add_parser('loop')
+    p.add_argument('--ranges', required=True)
+    p.add_argument('--command', required=True)
+    p.add_argument('--directory', default='surrogate')
+    p.add_argument('--target', type=float, default=0.02)
+    p.add_argument('--initial', type=int, default=8)
+    p.add_argument('--batch', type=int, default=4)
+    p.add_argument('--max-runs', type=int, default=100)
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--model', default='surrogate.npz')
+    p.add_argument('--mesh-record')
+    args = parser.parse_args(argv[1:])
+
+    myDefaults = Default_Inputs()
+    if args.command_name == 'collect':
+        names, rows, loads = Collect_Training(args.manifest, args.directory)
+        Write_Training_Table(args.out, names, rows, loads)
+    elif args.command_name == 'fit':
+        rows, loads, names = Read_Training_Table(args.training, myDefaults)
+        model = Fit_Rows(rows, loads)
+        Save_Model(args.model, model)
+        errors = Loo_Error(model)
+        print('%d runs, leave-one-out relative error rms %.4g, max %.4g' % (len(rows),
+            np.sqrt(np.mean(errors**2)), errors.max()))
+    elif args.command_name == 'predict':
+        model = Load_Model(args.model)
+        rows = Read_Sweep_Spec(args.rows)
+        mean, std = Predict_Rows(model, Row_Inputs(myDefaults, [dict((k, v) for k, v in r.items() if k != 'name') for r in rows]))
+        w = csv.writer(sys.stdout, lineterminator='\n')
+        w.writerow(['row', myTargetName, 'std'])
+        for i, row in enumerate(rows):
+            w.writerow([row.get('name', i + 1), '%.6g' % mean[i], '%.6g' % std[i]])
+    elif args.command_name == 'next':
+        rows, loads, names = Read_Training_Table(args.training, myDefaults)
+        model = Fit_Rows(rows, loads, args.seed)
+        ranges = Read_Ranges(args.ranges)
+        pool = Row_Inputs(myDefaults, Candidate_Rows(ranges, args.candidates, args.seed))
+        picked = [dict((k, pool[j][k]) for k in sorted(ranges)) for j in Next_Batch(model, Features(pool), args.count)]
+        with open(args.out, 'w') as f:
+            w = csv.writer(f, lineterminator='\n')
+            w.writerow(['name'] + sorted(ranges))
+            for i, row in enumerate(picked):
+                w.writerow(['AL_%05d' % (len(rows) + i + 1)] + [row[k] for k in sorted(ranges)])
+    elif args.command_name == 'loop':
+        if not os.path.isdir(args.directory):
+            os.makedirs(args.directory)
+        record = Mesh_Record_From_Argv(['--mesh-record', args.mesh_record]) if args.mesh_record else {}
+        model, error, runs = Active_Learning(args.directory, myDefaults, Read_Ranges(args.ranges), args.command,
+            args.target, args.initial, args.batch, args.max_runs, seed=args.seed, record=record)
+        Save_Model(args.model, model)
+        print('%s after %d runs: leave-one-out relative error %.4g' % ('converged' if error <= args.target
+            else 'stopped', runs, error))
+    else:
+        parser.print_help()
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    Main(sys.argv)
@@ -0,0 +1,160 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+sweep.py — Parameter tables for running many P1 models in one CAE session
+
+A sweep is a list of rows; each row is a dict keyed by the input names at the
+top of p1_core.py (myPlateLength, myBoltDia, myEndLength, myClearance,
+myPlateThickness, MyFty, ...) and only overrides the names it contains.
+
+Supported specs:
+  *.csv  -- one row per case, header = input names (optional "name" column,
+            and "material" / "bolt_material" grades of material_library.py)
+  *.json -- {"type": "full_factorial", "levels": {"myClearance": [1.0, 2.12]}}
+            {"type": "latin_hypercube", "samples": 500, "seed": 1,
+             "ranges": {"myEndLength": [40.0, 90.0], "MyFty": [250.0, 460.0]}}
+
+Run with:
+abaqus cae noGUI=P1.py -- --sweep sweep.csv
+"""
+
+import csv
+import itertools
+import json
+import os
+import re
+
+import numpy as np
+
+from p1_core import myInputNames
+
+#------------------------------------------------------------------------------
+
+myMeshRecordFile = 'mesh_convergence.json'   #written by mesh_convergence.py
+myTextInputNames = ('name', 'material', 'bolt_material')   #kept as strings
+myModelNamePattern = re.compile(r'^[A-Za-z0-9_]+$')          #CAE model/job names
+
+#------------------------------------------------------------------------------
+
+def Check_Input_Names(names):
+    unknown = [n for n in names if n not in myInputNames and n not in myTextInputNames]
+    if unknown:
+        raise ValueError("Unknown sweep input(s): %s" % ', '.join(unknown))
+
+#------------------------------------------------------------------------------
+
+def Read_Parameter_Table(csv_path):
+    with open(csv_path) as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames:
+            raise ValueError("Parameter table %s is empty (no header row)" % csv_path)
+        Check_Input_Names(reader.fieldnames)
+        rows = []
+        for r in reader:
+            row = dict((k, float(v)) for k, v in r.items() if k not in myTextInputNames and v != '')
+            row.update((k, v) for k, v in r.items() if k in myTextInputNames and v)
+            rows.append(row)
+    return rows
+
+#------------------------------------------------------------------------------
+
+def Full_Factorial(levels):
+    names = sorted(levels)
+    Check_Input_Names(names)
+    return [dict(zip(names, [v if n in myTextInputNames else float(v) for n, v in zip(names, combo)]))
+        for combo in itertools.product(*[levels[n] for n in names])]
+
+#------------------------------------------------------------------------------
+
+def Latin_Hypercube(ranges, samples, seed=None):
+    names = sorted(ranges)
+    Check_Input_Names(names)
+    rng = np.random.RandomState(seed)
+    lo = np.array([ranges[n][0] for n in names], dtype=float)
+    hi = np.array([ranges[n][1] for n in names], dtype=float)
+    # one stratum per sample in every dimension, shuffled independently
+    u = (np.argsort(rng.rand(samples, len(names)), axis=0) + rng.rand(samples, len(names)))/samples
+    x = lo + u*(hi - lo)
+    return [dict(zip(names, [float(v) for v in row])) for row in x]
+
+#------------------------------------------------------------------------------
+
+def Read_Sweep_Spec(path):
+    if os.path.splitext(path)[1].lower() == '.csv':
+        return Read_Parameter_Table(path)
+    with open(path) as f:
+        spec = json.load(f)
+    if spec['type'] == 'full_factorial':
+        return Full_Factorial(spec['levels'])
+    if spec['type'] == 'latin_hypercube':
+        return Latin_Hypercube(spec['ranges'], int(spec['samples']), spec.get('seed'))
+    raise ValueError("Unknown sweep type: %r" % spec['type'])
+
+#------------------------------------------------------------------------------
+
+def Sweep_File_From_Argv(argv):
+    # abaqus cae noGUI=P1.py -- --sweep <file>
+    if '--sweep' in argv:
+        return argv[argv.index('--sweep') + 1]
+    return None
+
+#------------------------------------------------------------------------------
+
+def Sweep_Model_Name(prefix, index, row):
+    # CAE model/job names: letters, digits and underscores only
+    if row.get('name'):
+        name = str(row['name'])
+        if not myModelNamePattern.match(name):
+            raise ValueError("Sweep row %d: model name %r may only contain letters, digits and underscores"
+                % (index + 1, name))
+        return name
+    return '%s_%05d' % (prefix, index + 1)
+
+#------------------------------------------------------------------------------
+
+def Write_Sweep_Manifest(path, names, rows):
+    columns = [n for n in myInputNames + myTextInputNames[1:] if any(n in r for r in rows)]
+    with open(path, 'w') as f:
+        w = csv.writer(f, lineterminator='\n')
+        w.writerow(['name'] + columns)
+        for name, row in zip(names, rows):
+            w.writerow([name] + [row.get(c, '') for c in columns])
+
+#------------------------------------------------------------------------------
+
+def Geometry_Class(myInputs):
+    myArcDia = myInputs['myBoltDia'] + myInputs['myClearance']
+    return 'e%.1f_h%.1f_t%.2f_c%.2f' % (myInputs['myEndLength']/myArcDia,
+        myInputs['myPlateHalfHeight']/myArcDia, myInputs['myPlateThickness']/myArcDia,
+        myInputs['myClearance']/myArcDia)
+
+#------------------------------------------------------------------------------
+
+def Read_Mesh_Record(record_path):
+    if not os.path.isfile(record_path):
+        return {}
+    with open(record_path) as f:
+        return json.load(f)
+
+#------------------------------------------------------------------------------
+
+def Converged_Mesh(record, myInputs):
+    # {'myMeshSize': ..., 'myEdgeSize': ...} for the geometry class, or {}
+    # when there is none (mesh_convergence.py studies native_inp.py meshes,
+    # so only native_inp.py decks use the record)
+    entry = record.get(Geometry_Class(myInputs))
+    if entry is None or entry.get('writer', 'native') != 'native':
+        return {}
+    myArcDia = myInputs['myBoltDia'] + myInputs['myClearance']
+    return {'myMeshSize': entry['mesh_size_ratio']*myArcDia,
+        'myEdgeSize': entry['edge_size_ratio']*myArcDia}
+
+#------------------------------------------------------------------------------
+
+def Mesh_Record_From_Argv(argv):
+    # --mesh-record <file>
+    if '--mesh-record' in argv:
+        return Read_Mesh_Record(argv[argv.index('--mesh-record') + 1])
+    return {}
+
+#------------------------------------------------------------------------------
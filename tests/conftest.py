@@ -0,0 +1,13 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+conftest.py — Make the modules at the repository root importable by the tests
+
+Run with:
+python -m pytest -q
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
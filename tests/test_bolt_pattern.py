@@ -0,0 +1,54 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_bolt_pattern.py — Hole centres, checks and bolt names of an N-bolt pattern
+
+Run with:
+python -m pytest -q tests/test_bolt_pattern.py
+"""
+
+import pytest
+
+import native_inp
+from bolt_pattern import Bolt_Pattern, Check_Bolt_Pattern
+from p1_core import Bolt_Records, Default_Inputs, Model_Holes
+
+#------------------------------------------------------------------------------
+
+def test_hole_centres():
+    # odd gauge count: a line on the symmetry plane; even: lines at +-gauge/2
+    assert Bolt_Pattern(2, 3, 50.0, 40.0) == [(0.0, 0.0), (0.0, 40.0), (50.0, 0.0), (50.0, 40.0)]
+    assert Bolt_Pattern(1, 2, 50.0, 40.0, 5.0, 1.0) == [(5.0, 21.0)]
+    assert Bolt_Pattern(1, 1, 50.0, 40.0) == [(0.0, 0.0)]
+    with pytest.raises(ValueError):
+        Bolt_Pattern(0, 1, 50.0, 40.0)
+
+#------------------------------------------------------------------------------
+
+def test_pattern_checks():
+    # hole dia 20 in a plate 340 long, 50 high (half), the first row 80 from the loaded end
+    Check_Bolt_Pattern([(0.0, 0.0), (50.0, 0.0), (0.0, 25.0)], 20.0, 80.0, 50.0, 340.0)
+    for holes, message in (([(0.0, 45.0)], 'does not fit'), ([(-75.0, 0.0)], 'does not fit'),
+            ([(0.0, 8.0)], 'cuts the symmetry plane'), ([(0.0, 0.0), (15.0, 0.0)], 'overlap')):
+        with pytest.raises(ValueError, match=message):
+            Check_Bolt_Pattern(holes, 20.0, 80.0, 50.0, 340.0)
+
+#------------------------------------------------------------------------------
+
+def test_bolt_records():
+    # The first bolt keeps the single-bolt names
+    myInputs = Default_Inputs()
+    myInputs.update({'myBoltRows': 2, 'myBoltGauges': 1, 'myPitch': 50.0})
+    bolts = Bolt_Records(Model_Holes(myInputs))
+    assert [b[:8] for b in bolts] == [
+        ('Bolt', 'RP-1', 'RP_to_Bolt', 'BS-1', 'PS-1', 'Int-1', 'Bolt_Displacement', 'Plate-hole-1'),
+        ('Bolt-2', 'RP-2', 'RP_to_Bolt-2', 'BS-2', 'PS-2', 'Int-2', 'Bolt_Displacement-2', 'Plate-hole-2')]
+    assert [b[8:] for b in bolts] == [(0.0, 0.0), (50.0, 0.0)]
+
+#------------------------------------------------------------------------------
+
+def test_native_writer_rejects_patterns(tmp_path):
+    myInputs = Default_Inputs()
+    myInputs.update({'myBoltRows': 2})
+    with pytest.raises(ValueError, match='single-bolt'):
+        native_inp.Write_Native_Inp(str(tmp_path / 'P1.inp'), 'P1', myInputs)
@@ -0,0 +1,83 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_damage_locus.py — Table values of damage_locus.py against the locus formulas
+
+For Ɛr = 20 % the uniaxial-tension fracture strain is ln 1.2. The
+Johnson–Cook parameters are those of myJohnsonCook; the Hooputra locus has
+ε+ = ε- = 1, f = 4.5 and ks = 0.3, so θ+ = 1.6 and θ- = 2.4.
+
+Run with:
+python -m pytest -q tests/test_damage_locus.py
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+import damage_locus
+from p1_core import Default_Inputs
+
+#------------------------------------------------------------------------------
+
+myLevel = math.log(1.2)   #fracture strain in uniaxial tension
+
+#------------------------------------------------------------------------------
+
+def Johnson_Cook(eta):
+    d1, d2, d3 = damage_locus.myJohnsonCook
+    return d1 + d2*math.exp(d3*eta)
+
+#------------------------------------------------------------------------------
+
+def Hooputra(theta):
+    return (math.sinh(4.5*(theta - 2.4)) + math.sinh(4.5*(1.6 - theta)))/math.sinh(4.5*(1.6 - 2.4))
+
+#------------------------------------------------------------------------------
+
+def test_johnson_cook_table():
+    ductile, ks, shear = damage_locus.Damage_Tables(20.0, 'johnson_cook', 4)
+    eta = [-1.0/3.0, 1.0/9.0, 5.0/9.0, 1.0]
+    assert np.allclose(ductile[:, 1], eta)
+    assert np.allclose(ductile[:, 0], [myLevel*Johnson_Cook(e)/Johnson_Cook(1.0/3.0) for e in eta])
+    assert np.all(ductile[:, 2] == 0.0)
+
+#------------------------------------------------------------------------------
+
+def test_rice_tracey_table():
+    ductile, ks, shear = damage_locus.Damage_Tables(20.0, 'rice_tracey', 3)
+    assert np.allclose(ductile[:, 0], [myLevel*math.exp(1.0), myLevel, myLevel*math.exp(-1.0)])
+
+#------------------------------------------------------------------------------
+
+def test_shear_table():
+    # Scaled so that pure shear (θs = √3) fails at the ductile strain at η = 0
+    ductile, ks, shear = damage_locus.Damage_Tables(20.0, 'johnson_cook', 4)
+    assert float(ks) == 0.3
+    theta = [1.6, 1.6 + 0.8/3.0, 1.6 + 1.6/3.0, 2.4]
+    level_0 = myLevel*Johnson_Cook(0.0)/Johnson_Cook(1.0/3.0)
+    assert np.allclose(shear[:, 1], theta)
+    assert np.allclose(shear[:, 0], [level_0*Hooputra(t)/Hooputra(math.sqrt(3.0)) for t in theta])
+
+#------------------------------------------------------------------------------
+
+def test_batch_of_materials():
+    ductile, ks, shear = damage_locus.Damage_Tables([10.0, 20.0, 30.0], 'johnson_cook', 5)
+    assert ductile.shape == (3, 5, 3) and shear.shape == (3, 5, 3)
+    single, ks, single_shear = damage_locus.Damage_Tables(20.0, 'johnson_cook', 5)
+    assert np.allclose(ductile[1], single) and np.allclose(shear[1], single_shear)
+
+#------------------------------------------------------------------------------
+
+def test_model_damage_tables():
+    myInputs = Default_Inputs()
+    myInputs.update({'MySr': 20.0, 'myDamageLocus': 0})
+    assert damage_locus.Model_Damage_Tables(myInputs) is None
+    myInputs.update({'myDamageLocus': 2, 'myDamagePoints': 3})
+    ductile, ks, shear = damage_locus.Model_Damage_Tables(myInputs)
+    assert ductile[1] == (round(myLevel, 9), round(1.0/3.0, 9), 0.0)
+    assert len(shear) == 3 and ks == 0.3
+    myInputs['myDamageLocus'] = 3
+    with pytest.raises(ValueError, match='myDamageLocus 3'):
+        damage_locus.Model_Damage_Tables(myInputs)
@@ -0,0 +1,80 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_deck_cache.py — index.log bookkeeping of deck_cache.py across processes
+
+A second process is stood in for by a second index dict read from the same
+log.
+
+Run with:
+python -m pytest -q tests/test_deck_cache.py
+"""
+
+import os
+
+import pytest
+
+import deck_cache
+
+#------------------------------------------------------------------------------
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(deck_cache, 'myCacheIndexes', {})
+    deck = tmp_path / 'deck.inp'
+    deck.write_text(u'*Heading\n' + u'x'*90 + u'\n')
+    cache_dir = str(tmp_path / 'cache')
+    os.makedirs(cache_dir)
+    for key in ('aa01', 'bb02', 'cc03'):
+        deck_cache.Cache_Store(cache_dir, key, str(deck))
+    return cache_dir, str(deck)
+
+#------------------------------------------------------------------------------
+
+def Other_Process_Index(cache_dir):
+    index = {'entries': {}, 'total': 0, 'heap': [], 'offset': 0, 'lines': 0, 'header': None}
+    deck_cache.Read_Index_Lines(index, os.path.join(cache_dir, deck_cache.myCacheIndexFile))
+    return index
+
+#------------------------------------------------------------------------------
+
+def test_appended_lines(cache):
+    cache_dir, deck = cache
+    other = Other_Process_Index(cache_dir)
+    assert sorted(other['entries']) == ['aa01', 'bb02', 'cc03']
+    deck_cache.Cache_Store(cache_dir, 'dd04', deck)
+    deck_cache.Read_Index_Lines(other, os.path.join(cache_dir, deck_cache.myCacheIndexFile))
+    assert sorted(other['entries']) == ['aa01', 'bb02', 'cc03', 'dd04']
+    assert other['total'] == 4*os.path.getsize(deck)
+
+#------------------------------------------------------------------------------
+
+def test_eviction(cache):
+    cache_dir, deck = cache
+    size = os.path.getsize(deck)
+    deck_cache.Cache_Fetch(cache_dir, 'aa01', deck)   #aa01 is now the most recent
+    deck_cache.Cache_Evict(cache_dir, 2*size)
+    assert sorted(deck_cache.Cache_Index(cache_dir)['entries']) == ['aa01', 'cc03']
+    assert not os.path.exists(deck_cache.Cache_Path(cache_dir, 'bb02'))
+    assert sorted(Other_Process_Index(cache_dir)['entries']) == ['aa01', 'cc03']
+
+#------------------------------------------------------------------------------
+
+def test_rewritten_log_is_replayed(cache):
+    # Another process compacts the log to fewer bytes than this one has read,
+    # then appends past that offset again: both are replayed from the start
+    cache_dir, deck = cache
+    path = os.path.join(cache_dir, deck_cache.myCacheIndexFile)
+    index = Other_Process_Index(cache_dir)
+    size = os.path.getsize(deck)
+    deck_cache.Write_Index(cache_dir, [(1.0, size, 'cc03')])
+    assert os.path.getsize(path) < index['offset']
+    deck_cache.Read_Index_Lines(index, path)
+    assert sorted(index['entries']) == ['cc03'] and index['total'] == size
+    deck_cache.Write_Index(cache_dir, [(1.0, size, 'bb02')])
+    with open(path, 'a') as f:
+        f.writelines('%.6f %d ee%02d\n' % (2.0 + i, size, i) for i in range(20))
+    assert os.path.getsize(path) > index['offset']
+    deck_cache.Read_Index_Lines(index, path)
+    assert 'cc03' not in index['entries'] and 'bb02' in index['entries']
+    assert len(index['entries']) == 21 and index['total'] == 21*size
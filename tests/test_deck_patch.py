@@ -0,0 +1,68 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_deck_patch.py — Patched sweep variants of deck_patch.py against freshly written decks
+
+Run with:
+python -m pytest -q tests/test_deck_patch.py
+"""
+
+import os
+
+import pytest
+
+import deck_patch
+import native_inp
+from p1_core import Default_Inputs
+
+#------------------------------------------------------------------------------
+
+def Coarse_Inputs(**kwargs):
+    myInputs = Default_Inputs()
+    myInputs.update({'myMeshSize': 4.0, 'myEdgeSize': 3.0})
+    myInputs.update(kwargs)
+    return myInputs
+
+#------------------------------------------------------------------------------
+
+def Read_Bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+#------------------------------------------------------------------------------
+
+@pytest.mark.parametrize('closure', [0, 1])
+def test_patched_variant_matches_fresh_deck(tmp_path, closure):
+    template = Coarse_Inputs(myGapClosure=closure)
+    variant = Coarse_Inputs(myGapClosure=closure, MyFty=287.5, MyFtu=401.25, MySr=13.0,
+        myFriction=0.123456789, myDisplacement=17.0000001, myDamageLocus=1)
+    key = deck_patch.Template_Key(template, 'native')
+    assert deck_patch.Template_Key(variant, 'native') == key
+    templates = {}
+    write = lambda path, model, myInputs: lambda: native_inp.Write_Native_Inp(path, model, myInputs)
+    a, b, fresh = [str(tmp_path / (n + '.inp')) for n in ('A', 'B', 'Fresh')]
+    assert not deck_patch.Write_Deck_From_Template(templates, key, a, 'A', template, write(a, 'A', template))
+    assert deck_patch.Write_Deck_From_Template(templates, key, b, 'B', variant, write(b, 'B', variant))
+    native_inp.Write_Native_Inp(fresh, 'B', variant)
+    assert Read_Bytes(b) == Read_Bytes(fresh)
+    assert b'0.123456789,\n' in Read_Bytes(b)
+    assert b'RP-1, 1, 1, -17.0000001\n' in Read_Bytes(b)
+
+#------------------------------------------------------------------------------
+
+def test_template_index(tmp_path):
+    path = str(tmp_path / 'A.inp')
+    native_inp.Write_Native_Inp(path, 'A', Coarse_Inputs(myGapClosure=1))
+    index = deck_patch.Template_Index(path)
+    assert [kind for start, end, kind, line in index] == ['heading', 'materials', 'friction', 'displacement']
+    # the Closure step's RP-1 line is left as it is
+    text = Read_Bytes(path)
+    start, end = index[-1][:2]
+    assert text.index(b'*Step, name=Loading') < start
+    assert text.count(b'RP-1, 1, 1, ') == 2
+
+#------------------------------------------------------------------------------
+
+def test_mesh_inputs_need_a_new_template():
+    assert deck_patch.Template_Key(Coarse_Inputs(), 'native') != deck_patch.Template_Key(Coarse_Inputs(myClearance=2.0), 'native')
+    assert deck_patch.Template_Key(Coarse_Inputs(), 'native') != deck_patch.Template_Key(Coarse_Inputs(), 'cae')
@@ -0,0 +1,75 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_design_capacity.py — Capacities, governing mode and margin of design_capacity.py on hand-computed rows
+
+One bolt of d = 20 in a d0 = 22 hole, t = 10, Ftu = 500, Fty = 350:
+
+  short end (e1 = 30)      block shear 350 (2 (30 - 11) 10)/√3 = 76,789.6
+                           before tear-out 1.5 (30 - 11) 10 500 = 142,500
+  long end (e1 = 100)      bearing 3 20 10 500 = 300,000
+                           before block shear 350 (2 (100 - 11) 10)/√3 = 359,690
+  narrow (e1 = 100, h = 25) net section 500 (50 - 22) 10 = 140,000
+                           before bearing
+
+Run with:
+python -m pytest -q tests/test_design_capacity.py
+"""
+
+import math
+
+import numpy as np
+
+import design_capacity
+
+#------------------------------------------------------------------------------
+
+def Row(**kwargs):
+    row = {'myBoltDia': 20.0, 'myClearance': 2.0, 'myEndLength': 30.0, 'myPlateHalfHeight': 50.0,
+        'myPlateThickness': 10.0, 'MyFtu': 500.0, 'MyFty': 350.0, 'myBoltRows': 1, 'myBoltGauges': 1,
+        'myPitch': 60.0, 'myGauge': 60.0}
+    row.update(kwargs)
+    return row
+
+myRows = [Row(), Row(myEndLength=100.0), Row(myEndLength=100.0, myPlateHalfHeight=25.0)]
+
+#------------------------------------------------------------------------------
+
+def test_capacities():
+    c = design_capacity.Capacities(design_capacity.Input_Arrays(myRows))
+    assert np.allclose(c['bearing'], [300000.0, 300000.0, 300000.0])
+    assert np.allclose(c['tear_out'], [142500.0, 667500.0, 667500.0])
+    assert np.allclose(c['net_section'], [390000.0, 390000.0, 140000.0])
+    assert np.allclose(c['block_shear'], [350.0*380.0/math.sqrt(3.0), 350.0*1780.0/math.sqrt(3.0), 350.0*1780.0/math.sqrt(3.0)])
+
+#------------------------------------------------------------------------------
+
+def test_governing_mode_and_margin():
+    mode, capacity, margin = design_capacity.Governing_Mode(design_capacity.Capacities(design_capacity.Input_Arrays(myRows)))
+    assert [design_capacity.myCapacityModes[m] for m in mode] == ['block_shear', 'bearing', 'net_section']
+    block = 350.0*380.0/math.sqrt(3.0)
+    assert np.allclose(capacity, [block, 300000.0, 140000.0])
+    assert np.allclose(margin, [142500.0/block, 350.0*1780.0/math.sqrt(3.0)/300000.0, 300000.0/140000.0])
+
+#------------------------------------------------------------------------------
+
+def test_two_bolt_rows():
+    # rows = 2, p1 = 60: lc = (30 - 11) + (60 - 22), Anv = 2 (30 + 60 - 1.5 22) t
+    row = Row(myBoltRows=2)
+    c = design_capacity.Capacities(design_capacity.Input_Arrays([row]))
+    assert np.allclose(c['bearing'], 600000.0)
+    assert np.allclose(c['tear_out'], 1.5*57.0*10.0*500.0)
+    assert np.allclose(c['block_shear'], 350.0*2.0*57.0*10.0/math.sqrt(3.0))
+
+#------------------------------------------------------------------------------
+
+def test_prescreen(tmp_path):
+    # margins 1.86, 1.20 and 2.14: only the row near a mode boundary is run
+    assert list(design_capacity.Prescreen(myRows, 1.5)) == [False, True, False]
+    names, rows = design_capacity.Prescreen_Sweep((1.5, 0.0), ['A', 'B', 'C'], myRows, str(tmp_path / 'P1_prescreen.csv'))
+    assert names == ['B']
+    with open(str(tmp_path / 'P1_prescreen.csv')) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == 'name,bearing,tear_out,net_section,block_shear,mode,margin'
+    assert [line.split(',')[0] for line in lines[1:]] == ['A', 'C']
+    assert lines[2].endswith(',net_section,2.143')
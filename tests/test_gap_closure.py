@@ -0,0 +1,68 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_gap_closure.py — The Closure step of a native P1 deck (myGapClosure = 1)
+
+Run with:
+python -m pytest -q tests/test_gap_closure.py
+"""
+
+import native_inp
+from p1_core import Bolt_Offset, Closure_Displacement, Default_Inputs, Gap_Closure, myClosureMaxNumInc
+
+#------------------------------------------------------------------------------
+
+def Deck_Text(tmp_path, **kwargs):
+    myInputs = Default_Inputs()
+    myInputs.update({'myMeshSize': 4.0, 'myEdgeSize': 3.0})
+    myInputs.update(kwargs)
+    path = str(tmp_path / 'P1.inp')
+    native_inp.Write_Native_Inp(path, 'P1', myInputs)
+    with open(path) as f:
+        return f.read()
+
+#------------------------------------------------------------------------------
+
+def Step_Text(text, name):
+    start = text.index('*Step, name=%s' % name)
+    return text[start:text.index('*End Step', start)]
+
+#------------------------------------------------------------------------------
+
+def test_closure_offsets():
+    myInputs = Default_Inputs()
+    myInputs.update({'myClearance': 2.0, 'myClosureDisplacement': 0.05})
+    assert not Gap_Closure(myInputs) and Bolt_Offset(myInputs) == -1.0
+    myInputs['myGapClosure'] = 1
+    assert Gap_Closure(myInputs) and Bolt_Offset(myInputs) == 0.0
+    assert Closure_Displacement(myInputs) == 1.05
+    myInputs['myExplicit'] = 1
+    assert not Gap_Closure(myInputs)
+
+#------------------------------------------------------------------------------
+
+def test_closure_step(tmp_path):
+    text = Deck_Text(tmp_path, myGapClosure=1, myClearance=2.0, myClosureDisplacement=0.05, myDisplacement=20.0)
+    assert text.index('*Step, name=Closure') < text.index('*Step, name=Loading')
+    # the bolt and RP-1 start centred in the hole
+    assert '*Instance, name=Bolt, part=Bolt\n0, 0., 0.\n' in text
+    closure, loading = Step_Text(text, 'Closure'), Step_Text(text, 'Loading')
+    assert closure.startswith('*Step, name=Closure, nlgeom=YES, inc=%d\n*Static\n' % myClosureMaxNumInc)
+    assert '*Contact Controls, stabilize\n' in closure
+    assert 'RP-1, 1, 1, -1.05\n' in closure
+    assert '*Contact Controls, reset\n' in loading
+    assert 'RP-1, 1, 1, -20\n' in loading
+
+#------------------------------------------------------------------------------
+
+def test_no_closure_step(tmp_path):
+    text = Deck_Text(tmp_path, myClearance=2.0)
+    assert '*Step, name=Closure' not in text and '*Contact Controls' not in text
+    assert '*Instance, name=Bolt, part=Bolt\n-1, 0., 0.\n' in text
+
+#------------------------------------------------------------------------------
+
+def test_explicit_has_no_closure_step(tmp_path):
+    text = Deck_Text(tmp_path, myGapClosure=1, myExplicit=1)
+    assert '*Step, name=Closure' not in text
+    assert '*Dynamic, Explicit' in Step_Text(text, 'Loading')
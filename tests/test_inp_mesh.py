@@ -0,0 +1,107 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_inp_mesh.py — Box and radius set queries of inp_mesh.py on a small generated deck
+
+Run with:
+python -m pytest -q tests/test_inp_mesh.py
+"""
+
+import numpy as np
+
+import inp_mesh
+
+#------------------------------------------------------------------------------
+
+def Write_Grid_Deck(path):
+    # Plate: 4 x 4 x 1 unit bricks at the origin; Bolt: one unit brick,
+    # instanced at x = 10. The first plate element is written with a
+    # continuation line. Returns the plate node coordinates by label.
+    coords = {}
+    lines = ['*Heading', '*Part, name=Plate', '*Node']
+    for k in range(2):
+        for j in range(5):
+            for i in range(5):
+                label = 1 + i + 5*j + 25*k
+                coords[label] = (float(i), float(j), float(k))
+                lines.append('%d, %g, %g, %g' % ((label,) + coords[label]))
+    lines.append('*Element, type=C3D8R')
+    label = 1
+    for j in range(4):
+        for i in range(4):
+            n = 1 + i + 5*j
+            nodes = [n, n + 1, n + 6, n + 5, n + 25, n + 26, n + 31, n + 30]
+            if label == 1:
+                lines.append('%d, %s,' % (label, ', '.join(str(v) for v in nodes[:4])))
+                lines.append(', '.join(str(v) for v in nodes[4:]))
+            else:
+                lines.append('%d, %s' % (label, ', '.join(str(v) for v in nodes)))
+            label += 1
+    lines.extend(['*End Part', '*Part, name=Bolt', '*Node'])
+    lines.extend('%d, %g, %g, %g' % (i + 1, x, y, z) for i, (x, y, z) in enumerate(
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]))
+    lines.extend(['*Element, type=C3D8R', '1, 1, 2, 3, 4, 5, 6, 7, 8', '*End Part',
+        '*Assembly, name=Assembly', '*Instance, name=Plate, part=Plate', '*End Instance',
+        '*Instance, name=Bolt, part=Bolt', '10., 0., 0.', '*End Instance',
+        '*Node', '1, 10., 0.5, 0.5', '*End Assembly', '*Material, name=Steel', '*Elastic', '200000., 0.3',
+        '*Step, name=Loading', '*Static', '*End Step'])
+    with open(str(path), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return coords
+
+#------------------------------------------------------------------------------
+
+def test_read_grid_deck(tmp_path):
+    path = tmp_path / 'grid.inp'
+    coords = Write_Grid_Deck(path)
+    mesh = inp_mesh.Read_Inp_Mesh(str(path))
+    plate = mesh['parts']['Plate']
+    assert len(plate['labels']) == 50
+    assert np.allclose(plate['coords'], [coords[v] for v in plate['labels']])
+    assert plate['elements'][0][2].shape == (16, 8)
+    assert plate['elements'][0][2][0].tolist() == [1, 2, 7, 6, 26, 27, 32, 31]
+    assert mesh['instances']['Bolt']['translation'].tolist() == [10.0, 0.0, 0.0]
+    assert len(mesh['parts']['Assembly']['labels']) == 1
+
+#------------------------------------------------------------------------------
+
+def test_box_queries(tmp_path):
+    path = tmp_path / 'grid.inp'
+    Write_Grid_Deck(path)
+    mesh = inp_mesh.Read_Inp_Mesh(str(path))
+    assert sorted(inp_mesh.Elements_In_Box(mesh, 'Plate', [0, 0, 0], [2, 1, 1])) == [1, 2]
+    assert sorted(inp_mesh.Nodes_In_Box(mesh, 'Plate', [-0.1, -0.1, -0.1], [1.1, 0.1, 0.1])) == [1, 2]
+    # assembly coordinates: the bolt sits at x = 10
+    assert sorted(inp_mesh.Nodes_In_Box(mesh, 'Bolt', [9.9, -0.1, -0.1], [10.1, 1.1, 1.1])) == [1, 4, 5, 8]
+    assert len(inp_mesh.Elements_In_Box(mesh, 'Bolt', [0, 0, 0], [1, 1, 1])) == 0
+
+#------------------------------------------------------------------------------
+
+def test_radius_queries(tmp_path):
+    path = tmp_path / 'grid.inp'
+    Write_Grid_Deck(path)
+    # each query on a freshly read mesh, before any index has been built
+    mesh = inp_mesh.Read_Inp_Mesh(str(path))
+    assert sorted(inp_mesh.Elements_In_Radius(mesh, 'Plate', [2, 2, 0.5], 0.75)) == [6, 7, 10, 11]
+    mesh = inp_mesh.Read_Inp_Mesh(str(path))
+    assert sorted(inp_mesh.Nodes_In_Radius(mesh, 'Plate', [2, 2, 0], 0.5)) == [13]
+    assert sorted(inp_mesh.Elements_In_Radius(mesh, 'Bolt', [10.5, 0.5, 0.5], 0.1)) == [1]
+
+#------------------------------------------------------------------------------
+
+def test_main_appends_sets(tmp_path):
+    path = tmp_path / 'grid.inp'
+    Write_Grid_Deck(path)
+    before = path.read_bytes()
+    assert inp_mesh.Main(['inp_mesh.py', 'elset', str(path), 'Ring', '--instance', 'Plate',
+        '--radius', '2', '2', '0.5', '0.75']) == 0
+    assert inp_mesh.Main(['inp_mesh.py', 'nset', str(path), 'Corner', '--instance', 'Plate',
+        '--box', '-0.1', '-0.1', '-0.1', '0.1', '0.1', '1.1']) == 0
+    after = path.read_bytes()
+    head, tail = before.split(b'*End Assembly')
+    assert after == head + (b'*Elset, elset=Ring, instance=Plate\n6, 7, 10, 11\n'
+        b'*Nset, nset=Corner, instance=Plate\n1, 26\n*End Assembly') + tail
+    # no match leaves the deck unchanged
+    assert inp_mesh.Main(['inp_mesh.py', 'nset', str(path), 'None', '--instance', 'Plate',
+        '--box', '50', '50', '50', '60', '60', '60']) == 1
+    assert path.read_bytes() == after
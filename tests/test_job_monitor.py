@@ -0,0 +1,71 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_job_monitor.py — The "monitor" output profile and job_monitor.py on a standin_solver.py run
+
+Run with:
+python -m pytest -q tests/test_job_monitor.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import job_monitor
+import native_inp
+from output_profile import myOutputProfiles
+from p1_core import Default_Inputs
+
+#------------------------------------------------------------------------------
+
+myRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#------------------------------------------------------------------------------
+
+def Coarse_Inputs():
+    myInputs = Default_Inputs()
+    myInputs.update({'myMeshSize': 4.0, 'myEdgeSize': 3.0})
+    return myInputs
+
+#------------------------------------------------------------------------------
+
+def test_monitor_profile_prints_rp1_in_loading(tmp_path):
+    path = str(tmp_path / 'M.inp')
+    native_inp.Write_Native_Inp(path, 'M', Coarse_Inputs(), output=myOutputProfiles['monitor'])
+    with open(path) as f:
+        text = f.read()
+    loading = text[text.index('*Step, name=Loading'):]
+    block = '*Node Print, nset=RP-1, frequency=1\nU1, RF1\n'
+    assert text.count(block) == 1
+    assert block in loading[:loading.index('*End Step')]
+
+#------------------------------------------------------------------------------
+
+def test_full_profile_has_no_print_block(tmp_path):
+    path = str(tmp_path / 'F.inp')
+    native_inp.Write_Native_Inp(path, 'F', Coarse_Inputs())
+    with open(path) as f:
+        assert '*Node Print' not in f.read()
+
+#------------------------------------------------------------------------------
+
+def test_monitor_stops_streaming_standin_run(tmp_path):
+    directory = str(tmp_path)
+    native_inp.Write_Native_Inp(os.path.join(directory, 'M.inp'), 'M', Coarse_Inputs(),
+        output=myOutputProfiles['monitor'])
+    solver = '"%s" "%s"' % (sys.executable, os.path.join(myRoot, 'standin_solver.py'))
+    run = subprocess.Popen(solver + ' M --stream --seconds 4', shell=True, cwd=directory)
+    try:
+        results = job_monitor.Monitor_Jobs(directory, ['M'], drop=0.2,
+            command=solver + ' {job} --terminate', poll_interval=0.05)
+    finally:
+        returncode = run.wait()
+    assert results['M']['status'] == 'captured'
+    assert results['M']['reason'] == 'drop'
+    assert results['M']['last_load'] <= 0.8*results['M']['peak_load']
+    with open(os.path.join(directory, 'M_monitor.json')) as f:
+        assert json.load(f)['status'] == 'captured'
+    # stopped before the end of the stand-in curve
+    assert returncode == 1
+    assert results['M']['increments'] < 200
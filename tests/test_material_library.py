@@ -0,0 +1,60 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_material_library.py — Grades and their precomputed tables in material_library.py
+
+Run with:
+python -m pytest -q tests/test_material_library.py
+"""
+
+import numpy as np
+import pytest
+
+import material_library
+from damage_locus import Damage_Tables, myDuctileDamageTable
+
+#------------------------------------------------------------------------------
+
+@pytest.fixture
+def library(tmp_path):
+    path = str(tmp_path / 'materials.db')
+    con = material_library.Connect(path)
+    records = [{'grade': 'Ductile', 'fty': 355.0, 'ftu': 510.0, 'sr': 30.0, 'scu': 0.2, 'e': 210000.0, 'nu': 0.3, 'density': 7.85e-9},
+        {'grade': 'Brittle', 'fty': 460.0, 'ftu': 540.0, 'sr': 8.0, 'scu': 0.2, 'e': 210000.0, 'nu': 0.3, 'density': 7.85e-9},
+        {'grade': 'Stored', 'fty': 300.0, 'ftu': 400.0, 'sr': 20.0, 'scu': 0.2, 'e': 70000.0, 'nu': 0.33, 'density': 2.7e-9,
+            'ductile_damage': myDuctileDamageTable}]
+    material_library.Import_Materials(con, records)
+    con.close()
+    material_library.Open_Material_Library(path)
+    yield path
+    material_library.Open_Material_Library(material_library.myMaterialLibraryFile)
+
+#------------------------------------------------------------------------------
+
+def test_damage_tables_per_grade(library):
+    ductile = material_library.Get_Material('Ductile')
+    brittle = material_library.Get_Material('Brittle')
+    assert ductile['ductile_damage'] != brittle['ductile_damage']
+    expected, ks, shear = Damage_Tables(30.0, 'johnson_cook', 8)
+    assert np.allclose(ductile['ductile_damage'], expected, atol=1e-9)
+    assert np.allclose(ductile['shear_damage'], shear, atol=1e-9)
+    assert ductile['shear_ks'] == float(ks)
+    # the uniaxial-tension row is the grade's true strain at rupture
+    eta = np.array(brittle['ductile_damage'])[:, 1]
+    strain = np.interp(1.0/3.0, eta, np.array(brittle['ductile_damage'])[:, 0])
+    assert abs(strain - np.log(1.08)) < 1e-3
+
+#------------------------------------------------------------------------------
+
+def test_stored_tables_are_kept(library):
+    stored = material_library.Get_Material('Stored')
+    assert stored['ductile_damage'] == myDuctileDamageTable
+    assert len(stored['shear_damage']) == 8
+
+#------------------------------------------------------------------------------
+
+def test_plate_tables_of_a_grade(library):
+    myInputs = {'material': 'Brittle', 'myDamageLocus': 0}
+    plastic, ductile, ks, shear = material_library.Plate_Tables(myInputs)
+    assert ductile == material_library.Get_Material('Brittle')['ductile_damage']
+    assert plastic[0][1] == 0.0
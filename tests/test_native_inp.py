@@ -0,0 +1,193 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_native_inp.py — The native P1 deck against its regression snapshot and the CAE set definitions
+
+tests/data/P1_native_snapshot.json is a regression snapshot of the deck
+native_inp.py writes for the default inputs: its keyword lines in order
+(comments and data lines left out), the node and element count of each part
+and the size of each assembly set. It was written by native_inp.py itself,
+not by CAE, so it catches changes to the native writer, not differences
+from a CAE deck (CAE meshes with its own seeding, and writes no
+'*Restart, write, frequency=0').
+
+Set membership is checked independently of the snapshot, against the
+selections P1.py makes in CAE, evaluated on the deck's own node coordinates:
+
+  Plate_Edge           faces on the plane x = myPlateLength - myEndLength
+  Plate_B_Symmetry     faces on the plane y = 0
+  Z sym surf           faces on the plane z = 0 (plate and bolt)
+  Element_NodeSet_1    nodes in the box -myEndLength <= x <= 0
+  Element_ElementSet_1 elements inside that box
+  PS-1 / BS-1          element faces on the hole / bolt cylinder
+
+After an intended change to the native writer, refresh the snapshot with:
+
+python native_inp.py
+python tests/test_native_inp.py P1.inp
+
+Run with:
+python -m pytest -q tests/test_native_inp.py
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inp_mesh
+import native_inp
+from p1_core import Bolt_Offset, Default_Inputs
+from sweep import Read_Parameter_Table
+
+#------------------------------------------------------------------------------
+
+mySnapshotFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'P1_native_snapshot.json')
+myFaceNodes = {'S3': (0, 1, 5, 4), 'S4': (1, 2, 6, 5), 'S5': (2, 3, 7, 6), 'S6': (3, 0, 4, 7)}
+
+#------------------------------------------------------------------------------
+
+def Deck_Sets(path):
+    # {(kind, name, instance): label array} of the assembly *Nset / *Elset
+    # blocks (generate ranges expanded)
+    sets, current, rows = {}, None, []
+    in_assembly = False
+    with open(path) as f:
+        for line in f:
+            if line.startswith('**'):
+                continue
+            if line.startswith('*'):
+                if current is not None:
+                    sets[current] = np.array(rows, dtype=np.int64)
+                current, rows = None, []
+                name, params = inp_mesh.Keyword_Params(line.strip().encode('latin-1'))
+                in_assembly = (in_assembly or name == 'assembly') and name != 'end assembly'
+                if in_assembly and name in ('nset', 'elset'):
+                    current = (name, params[name], params.get('instance'))
+                    generate = 'generate' in params
+            elif current is not None:
+                values = [int(v) for v in line.split(',') if v.strip()]
+                rows.extend(range(values[0], values[1] + 1, values[2] if len(values) > 2 else 1) if generate else values)
+    return sets
+
+#------------------------------------------------------------------------------
+
+def Deck_Summary(path):
+    # Keyword lines, part counts and assembly set sizes of a deck
+    with open(path) as f:
+        keywords = [line.strip() for line in f if line.startswith('*') and not line.startswith('**')]
+    mesh = inp_mesh.Read_Inp_Mesh(path)
+    parts = dict((name, {'nodes': len(part['labels']), 'elements': sum(len(e[1]) for e in part['elements'])})
+        for name, part in mesh['parts'].items())
+    sets = dict(('%s %s %s' % key, len(labels)) for key, labels in Deck_Sets(path).items())
+    return {'keywords': keywords, 'parts': parts, 'sets': sets}
+
+#------------------------------------------------------------------------------
+
+@pytest.fixture(scope='module')
+def deck(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('native') / 'P1.inp')
+    myInputs = Default_Inputs()
+    native_inp.Write_Native_Inp(path, 'P1', myInputs)
+    return path, myInputs, inp_mesh.Read_Inp_Mesh(path), Deck_Sets(path)
+
+#------------------------------------------------------------------------------
+
+@pytest.fixture(scope='module')
+def snapshot():
+    with open(mySnapshotFile) as f:
+        return json.load(f)
+
+#------------------------------------------------------------------------------
+
+def test_keyword_blocks(deck, snapshot):
+    assert Deck_Summary(deck[0])['keywords'] == snapshot['keywords']
+
+#------------------------------------------------------------------------------
+
+def test_node_and_element_counts(deck, snapshot):
+    assert Deck_Summary(deck[0])['parts'] == snapshot['parts']
+
+#------------------------------------------------------------------------------
+
+def test_set_sizes(deck, snapshot):
+    assert Deck_Summary(deck[0])['sets'] == snapshot['sets']
+
+#------------------------------------------------------------------------------
+
+def Plate_Nodes(mesh, where):
+    part = mesh['parts']['Plate']
+    return np.sort(part['labels'][where(part['coords'])])
+
+#------------------------------------------------------------------------------
+
+def test_node_set_membership(deck):
+    path, myInputs, mesh, sets = deck
+    tol = 1e-6*myInputs['myPlateLength']
+    xr = myInputs['myPlateLength'] - myInputs['myEndLength']
+    expected = {
+        'Plate_Edge': lambda c: np.abs(c[:, 0] - xr) < tol,
+        'Plate_B_Symmetry': lambda c: np.abs(c[:, 1]) < tol,
+        'Z sym surf': lambda c: np.abs(c[:, 2]) < tol,
+        'Element_NodeSet_1': lambda c: (c[:, 0] >= -myInputs['myEndLength'] - tol) & (c[:, 0] <= tol)}
+    for name, where in expected.items():
+        assert np.array_equal(np.sort(sets[('nset', name, 'Plate')]), Plate_Nodes(mesh, where)), name
+    bolt = mesh['parts']['Bolt']
+    assert np.array_equal(np.sort(sets[('nset', 'Z sym surf', 'Bolt')]),
+        np.sort(bolt['labels'][np.abs(bolt['coords'][:, 2]) < tol]))
+    # RP-1 at the bolt centre, in assembly coordinates
+    assert mesh['parts']['Assembly']['coords'][0, 0] == pytest.approx(Bolt_Offset(myInputs))
+    assert sets[('nset', 'RP-1', None)].tolist() == [1]
+
+#------------------------------------------------------------------------------
+
+def test_element_set_membership(deck):
+    path, myInputs, mesh, sets = deck
+    tol = 1e-6*myInputs['myPlateLength']
+    plate = mesh['parts']['Plate']
+    etype, labels, nodes = plate['elements'][0]
+    x = plate['coords'][np.searchsorted(plate['labels'], nodes), 0]
+    inside = ((x >= -myInputs['myEndLength'] - tol) & (x <= tol)).all(axis=1)
+    assert np.array_equal(np.sort(sets[('elset', 'Element_ElementSet_1', 'Plate')]), np.sort(labels[inside]))
+
+#------------------------------------------------------------------------------
+
+def test_contact_surfaces_on_cylinders(deck):
+    path, myInputs, mesh, sets = deck
+    tol = 1e-6*myInputs['myPlateLength']
+    radius = {'PS-1': (myInputs['myBoltDia'] + myInputs['myClearance'])/2.0, 'BS-1': myInputs['myBoltDia']/2.0}
+    for (kind, name, instance), ids in sets.items():
+        if not name.startswith('_') or name.split('_')[1] not in radius:
+            continue
+        surface, face = name.split('_')[1], name.split('_')[2]
+        part = mesh['parts'][instance]
+        etype, labels, nodes = part['elements'][0]
+        corners = nodes[np.searchsorted(labels, ids)][:, myFaceNodes[face]]
+        xy = part['coords'][np.searchsorted(part['labels'], corners)][..., :2]
+        assert np.allclose(np.hypot(xy[..., 0], xy[..., 1]), radius[surface], atol=tol), name
+    for surface in radius:
+        assert any(name.startswith('_%s_' % surface) for kind, name, instance in sets), surface
+
+#------------------------------------------------------------------------------
+
+def test_sweep_manifest(tmp_path, monkeypatch):
+    # A native sweep lists its decks like a CAE one, for step_tuner.py record
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'sweep.csv').write_text(u'name,myMeshSize,myEdgeSize,myClearance\nA_1,4,3,1.5\nB_2,4,3,2\n')
+    native_inp.Main(['native_inp.py', '--sweep', 'sweep.csv'])
+    rows = Read_Parameter_Table(str(tmp_path / 'P1_sweep_manifest.csv'))
+    assert [r['name'] for r in rows] == ['A_1', 'B_2']
+    assert [r['myClearance'] for r in rows] == [1.5, 2.0]
+    assert (tmp_path / 'A_1.inp').exists() and (tmp_path / 'B_2.inp').exists()
+
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    with open(mySnapshotFile, 'w') as f:
+        json.dump(Deck_Summary(sys.argv[1]), f, indent=1, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,90 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_odb_extract.py — RP-1 curve extraction of odb_extract.py from a fake ODB
+
+FakeOdb has only what odb_extract.py reads of an odbAccess ODB:
+steps -> frames -> fieldOutputs[...].getSubset(region=...).values /
+.bulkDataBlocks, step.historyRegions and rootAssembly.nodeSets /
+elementSets. Its job has a Closure step, in which the bolt travels 1 mm
+under almost no load, and a Loading step with a linear load to 1000 N.
+
+Run with:
+python -m pytest -q tests/test_odb_extract.py
+"""
+
+import collections
+
+import numpy as np
+
+import odb_extract
+
+#------------------------------------------------------------------------------
+
+class Record(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+#------------------------------------------------------------------------------
+
+class FakeField(object):
+    # One field output of a frame: {region name: values of its nodes/elements}
+    def __init__(self, values):
+        self.values_by_region = values
+
+    def getSubset(self, region):
+        data = self.values_by_region[region.name]
+        return Record(values=[Record(data=d) for d in data], bulkDataBlocks=[Record(data=np.asarray(data, dtype=np.float32))])
+
+#------------------------------------------------------------------------------
+
+def FakeOdb(history=False):
+    rp = Record(name='RP-1', nodes=[[Record(instanceName=None, label=1)]])
+    elset = Record(name='ELEMENT_ELEMENTSET_1')
+    steps = collections.OrderedDict()
+    for name, total, u, rf in (('Closure', 0.0, (0.0, -0.5, -1.0), (0.0, -0.2, -0.5)),
+            ('Loading', 1.0, (-1.0, -2.0, -3.0, -4.0), (-0.5, -250.0, -500.0, -1000.0))):
+        frames = []
+        for i, (u1, rf1) in enumerate(zip(u, rf)):
+            peeq = [0.0, 0.01*i*total, 0.02*i*total]
+            frames.append(Record(frameValue=i/float(len(u) - 1), fieldOutputs={
+                'U': FakeField({'RP-1': [(u1, 0.0, 0.0)]}),
+                'RF': FakeField({'RP-1': [(rf1, 0.0, 0.0)]}),
+                'PEEQ': FakeField({'ELEMENT_ELEMENTSET_1': peeq})}))
+        regions = {}
+        if history:
+            t = [f.frameValue for f in frames]
+            regions['Node ASSEMBLY.1'] = Record(historyOutputs={'U1': Record(data=list(zip(t, u))),
+                'RF1': Record(data=list(zip(t, rf)))})
+        steps[name] = Record(totalTime=total, frames=frames, historyRegions=regions)
+    return Record(steps=steps, rootAssembly=Record(nodeSets={'RP-1': rp}, elementSets={'ELEMENT_ELEMENTSET_1': elset}))
+
+#------------------------------------------------------------------------------
+
+def test_curve_from_field_frames(tmp_path):
+    path = str(tmp_path / 'P1_rp1')
+    odb_extract.Extract_Curve(FakeOdb(), path, 'P1', peeq=True)
+    columns, metadata = odb_extract.Read_Curve(path)
+    assert np.allclose(columns['time'], [0.0, 0.5, 1.0, 1.0, 4.0/3.0, 5.0/3.0, 2.0])
+    assert np.allclose(columns['U1'], [0.0, -0.5, -1.0, -1.0, -2.0, -3.0, -4.0])
+    assert np.allclose(columns['RF1'], [0.0, -0.2, -0.5, -0.5, -250.0, -500.0, -1000.0])
+    assert np.allclose(columns['PEEQ_max'], [0.0, 0.0, 0.0, 0.0, 0.02, 0.04, 0.06])
+    assert np.allclose(columns['PEEQ_mean'], [0.0, 0.0, 0.0, 0.0, 0.01, 0.02, 0.03])
+    assert columns['U1'].dtype == np.float32
+    assert metadata['source'] == 'field' and metadata['steps'] == ['Closure', 'Loading']
+    assert metadata['frames'] == 7
+    # 1% of the 1000 N peak is first reached at 2 mm, after the Closure travel
+    assert metadata['slip_offset'] == 2.0
+
+#------------------------------------------------------------------------------
+
+def test_curve_from_history_output(tmp_path):
+    path = str(tmp_path / 'P1_rp1')
+    odb_extract.Extract_Curve(FakeOdb(history=True), path, 'P1', peeq=True, steps=['Loading'])
+    columns, metadata = odb_extract.Read_Curve(path)
+    assert metadata['source'] == 'history' and metadata['steps'] == ['Loading']
+    assert np.allclose(columns['U1'], [-1.0, -2.0, -3.0, -4.0])
+    assert np.allclose(columns['time'], [1.0, 4.0/3.0, 5.0/3.0, 2.0])
+    assert np.allclose(columns['PEEQ_time'], columns['time'])
+    d, p = odb_extract.Load_Displacement(columns)
+    assert np.allclose(p, [0.5, 250.0, 500.0, 1000.0])
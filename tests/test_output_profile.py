@@ -0,0 +1,53 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_output_profile.py — Output request lines of the built-in and JSON output profiles
+
+Run with:
+python -m pytest -q tests/test_output_profile.py
+"""
+
+import json
+
+import pytest
+
+from output_profile import myOutputProfiles, Output_Profile_From_Argv, Output_Request_Lines, Read_Output_Profile
+
+#------------------------------------------------------------------------------
+
+def test_lean_profile_lines():
+    assert Output_Request_Lines(myOutputProfiles['lean'], 0.01) == [
+        '** FIELD OUTPUT: F-Output-1',
+        '*Output, field, time interval=0.1',
+        '*Element Output, elset=Element_ElementSet_1, directions=YES',
+        'PEEQ, S',
+        '** FIELD OUTPUT: F-Output-2',
+        '*Output, field, time interval=0.1',
+        '*Node Output, nset=Element_NodeSet_1',
+        'U',
+        '** HISTORY OUTPUT: H-Output-1',
+        '*Output, history, time interval=0.005',
+        '*Node Output, nset=RP-1',
+        'RF1, U1']
+
+#------------------------------------------------------------------------------
+
+def test_full_profile_lines():
+    # node, element and contact variables of one request go to their own keywords
+    lines = Output_Request_Lines(myOutputProfiles['full'], 0.01)
+    assert lines[1:7] == ['*Output, field, time interval=0.01', '*Node Output', 'A, CF, RF, U, V',
+        '*Element Output, directions=YES', 'EVOL, LE, PE, PEEQ, PEMAG, S', '*Contact Output']
+    assert lines[-1] == '*Output, history, variable=PRESELECT, time interval=0.01'
+
+#------------------------------------------------------------------------------
+
+def test_json_profile(tmp_path):
+    path = tmp_path / 'rp.json'
+    path.write_text(u'{"field": [{"region": "RP-1", "variables": ["U"]}], "history": []}')
+    profile = Output_Profile_From_Argv(['native_inp.py', '--output-profile', str(path)])
+    assert profile['name'] == str(path)
+    assert Output_Request_Lines(profile, 0.02)[1:] == ['*Output, field, time interval=0.02', '*Node Output, nset=RP-1', 'U']
+    assert Output_Profile_From_Argv(['native_inp.py']) is myOutputProfiles['full']
+    path.write_text(json.dumps({'field': [{'variables': []}]}))
+    with pytest.raises(ValueError, match='without variables'):
+        Read_Output_Profile(str(path))
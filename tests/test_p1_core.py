@@ -0,0 +1,61 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_p1_core.py — p1_core.py and p1_abaqus.py load in plain Python, without Abaqus
+
+Imports are checked in a fresh interpreter, so modules loaded by other
+tests do not hide a heavy import.
+
+Run with:
+python -m pytest -q tests/test_p1_core.py
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import p1_core
+
+#------------------------------------------------------------------------------
+
+myRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#------------------------------------------------------------------------------
+
+def Loaded_Modules(statement):
+    # Names in sys.modules after the statement, in a fresh interpreter
+    code = '%s\nimport sys\nprint(" ".join(sorted(sys.modules)))' % statement
+    return subprocess.check_output([sys.executable, '-c', code], cwd=myRoot).decode('ascii').split()
+
+#------------------------------------------------------------------------------
+
+def test_core_imports_neither_abaqus_nor_numpy():
+    loaded = Loaded_Modules('import p1_core')
+    assert 'numpy' not in loaded and 'abaqus' not in loaded
+
+#------------------------------------------------------------------------------
+
+def test_adapter_defers_abaqus():
+    loaded = Loaded_Modules('import p1_abaqus')
+    assert 'abaqus' not in loaded and 'abaqusConstants' not in loaded and 'part' not in loaded
+
+#------------------------------------------------------------------------------
+
+def test_build_outside_cae_names_the_way_out():
+    import p1_abaqus
+    if 'abaqus' in sys.modules:
+        pytest.skip('running inside Abaqus')
+    with pytest.raises(ImportError, match='native_inp.py'):
+        p1_abaqus.Load_Abaqus()
+
+#------------------------------------------------------------------------------
+
+def test_default_inputs():
+    myInputs = p1_core.Default_Inputs()
+    assert sorted(myInputs) == sorted(p1_core.myInputNames)
+    assert myInputs['myBoltDia'] == p1_core.myBoltDia
+    # a copy: changing a row leaves the module defaults alone
+    myInputs['myBoltDia'] = 1.0
+    assert p1_core.Default_Inputs()['myBoltDia'] == p1_core.myBoltDia
@@ -0,0 +1,99 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_restart.py — Resume and extension decks of restart.py from a native P1 deck
+
+The job is a coarse native deck with a Closure step and restart data every
+5 increments of Loading; its .sta files are written by hand.
+
+Run with:
+python -m pytest -q tests/test_restart.py
+"""
+
+import os
+
+import pytest
+
+import native_inp
+import restart
+from p1_core import Default_Inputs
+
+#------------------------------------------------------------------------------
+
+def Write_Job(directory, explicit=False):
+    myInputs = Default_Inputs()
+    myInputs.update({'myMeshSize': 4.0, 'myEdgeSize': 3.0, 'myRestartFrequency': 5,
+        'myGapClosure': 1, 'myExplicit': int(explicit)})
+    native_inp.Write_Native_Inp(os.path.join(directory, 'P1.inp'), 'P1', myInputs)
+
+#------------------------------------------------------------------------------
+
+def Write_Sta(path, increments):
+    # increments: [(step, increment)], all converged
+    with open(path, 'w') as f:
+        f.write(' SUMMARY OF JOB INFORMATION:\n')
+        for step, inc in increments:
+            f.write('  %d %5d   1     0     3     3  0.5        0.5        0.01\n' % (step, inc))
+        f.write(' THE ANALYSIS HAS NOT BEEN COMPLETED\n')
+
+#------------------------------------------------------------------------------
+
+def Read(path):
+    with open(path) as f:
+        return f.read()
+
+#------------------------------------------------------------------------------
+
+def test_resume_from_last_restart_increment(tmp_path):
+    directory = str(tmp_path)
+    Write_Job(directory)
+    assert restart.Restart_Frequencies(directory, 'P1') == {1: 0, 2: 5}
+    Write_Sta(os.path.join(directory, 'P1.sta'), [(1, 1), (1, 2)] + [(2, i) for i in range(1, 13)])
+    assert restart.Main(['restart.py', 'resume', 'P1', '--directory', directory]) == 0
+    assert Read(os.path.join(directory, 'P1_r1.inp')) == ('*Heading\n** Resume of P1 from step 2 increment 10\n'
+        '*Restart, read, step=2, inc=10\n')
+
+#------------------------------------------------------------------------------
+
+def test_resume_of_a_resume_deck(tmp_path):
+    directory = str(tmp_path)
+    Write_Job(directory)
+    Write_Sta(os.path.join(directory, 'P1.sta'), [(2, i) for i in range(1, 13)])
+    restart.Main(['restart.py', 'resume', 'P1', '--directory', directory])
+    Write_Sta(os.path.join(directory, 'P1_r1.sta'), [(2, i) for i in range(11, 24)])
+    restart.Main(['restart.py', 'resume', 'P1_r1', '--directory', directory])
+    assert '*Restart, read, step=2, inc=20\n' in Read(os.path.join(directory, 'P1_r2.inp'))
+
+#------------------------------------------------------------------------------
+
+def test_no_resume_from_the_closure_step(tmp_path):
+    directory = str(tmp_path)
+    Write_Job(directory)
+    Write_Sta(os.path.join(directory, 'P1.sta'), [(1, i) for i in range(1, 12)])
+    with pytest.raises(ValueError, match='Step 1 of P1'):
+        restart.Main(['restart.py', 'resume', 'P1', '--directory', directory])
+    assert not os.path.exists(os.path.join(directory, 'P1_r1.inp'))
+
+#------------------------------------------------------------------------------
+
+def test_extension_deck(tmp_path):
+    directory = str(tmp_path)
+    Write_Job(directory)
+    restart.Main(['restart.py', 'extend', 'P1', '--directory', directory, '--displacement', '7.5'])
+    lines = Read(os.path.join(directory, 'P1_r1.inp')).splitlines()
+    assert lines[:3] == ['*Heading', '** Extension of P1 by 7.5', '*Restart, read, step=2, end step']
+    assert lines[3] == '*Step, name=Extension-2, nlgeom=YES, inc=%d, amplitude=RAMP' % Default_Inputs()['myMaxNumInc']
+    assert 'RP-1, 1, 1, -27.5' in lines
+    assert '*Restart, write, overlay, frequency=5' in lines
+    assert lines[-1] == '*End Step'
+    # the extension is a step of its own, so it can be resumed in turn
+    assert restart.Restart_Frequencies(directory, 'P1_r1') == {1: 0, 2: 5, 3: 5}
+
+#------------------------------------------------------------------------------
+
+def test_explicit_deck_is_rejected(tmp_path):
+    directory = str(tmp_path)
+    Write_Job(directory, explicit=True)
+    Write_Sta(os.path.join(directory, 'P1.sta'), [(1, i) for i in range(1, 12)])
+    with pytest.raises(ValueError, match='Explicit'):
+        restart.Main(['restart.py', 'resume', 'P1', '--directory', directory])
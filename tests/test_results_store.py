@@ -0,0 +1,70 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_results_store.py — Appending, querying and curve views of results_store.py
+
+Run with:
+python -m pytest -q tests/test_results_store.py
+"""
+
+import os
+
+import numpy as np
+
+import results_store
+from odb_extract import Write_Curve
+from p1_core import Default_Inputs
+from sweep import Write_Sweep_Manifest
+
+#------------------------------------------------------------------------------
+
+def Run(name, frames, **inputs):
+    # (name, inputs, columns) of a run with a straight curve of its own slope
+    row = Default_Inputs()
+    row.update(inputs)
+    d = np.linspace(0.0, 10.0, frames)
+    return name, row, {'time': d/10.0, 'U1': -d, 'RF1': -1000.0*len(name)*d}
+
+#------------------------------------------------------------------------------
+
+def test_append_and_query(tmp_path):
+    directory = str(tmp_path / 'results')
+    runs = [Run('A', 5, myEndLength=30.0, MyFty=300.0), Run('BB', 3, myEndLength=45.0, MyFty=350.0, material='S355'),
+        Run('CCC', 4, myEndLength=60.0, MyFty=400.0)]
+    assert results_store.Append_Runs(directory, runs[:2]) == 2
+    assert results_store.Append_Runs(directory, runs) == 1   #A and BB are already stored
+    store = results_store.Open_Store(directory)
+    assert [n.decode('utf-8') for n in store['index']['name']] == ['A', 'BB', 'CCC']
+    assert list(store['index']['offset']) == [0, 5, 8] and len(store['curves']) == 12
+    # end_ratio = myEndLength/(myBoltDia + myClearance)
+    dia = runs[0][1]['myBoltDia'] + runs[0][1]['myClearance']
+    assert list(results_store.Query(store, [('end_ratio', 40.0/dia, 70.0/dia)])) == [1, 2]
+    assert list(results_store.Query(store, [('end_ratio', 40.0/dia, 70.0/dia), ('MyFty', 0.0, 360.0)])) == [1]
+    assert list(results_store.Query(store, material='S355')) == [1]
+    assert list(results_store.Query(store, [('MyFty', 500.0, 600.0)])) == []
+
+#------------------------------------------------------------------------------
+
+def test_curve_is_a_view_of_the_store(tmp_path):
+    directory = str(tmp_path / 'results')
+    results_store.Append_Runs(directory, [Run('A', 5), Run('BB', 3)])
+    store = results_store.Open_Store(directory)
+    curve = results_store.Curve(store, 1)
+    assert curve.shape == (3, 3) and curve.dtype == np.float32
+    assert np.shares_memory(curve, store['curves'])
+    rf1 = store['header']['columns'].index('RF1')
+    assert np.allclose(curve[:, rf1], [0.0, -10000.0, -20000.0])
+
+#------------------------------------------------------------------------------
+
+def test_add_sweep_manifest(tmp_path):
+    names, rows = ['A', 'BB'], [Run('A', 5)[1], Run('BB', 3)[1]]
+    Write_Sweep_Manifest(str(tmp_path / 'P1_sweep_manifest.csv'), names, rows)
+    _, _, columns = Run('A', 5)
+    Write_Curve(str(tmp_path / 'A_rp1'), columns, {'job': 'A'})   #BB has no curve yet
+    directory = str(tmp_path / 'results')
+    results_store.Main(['results_store.py', 'add', directory, str(tmp_path / 'P1_sweep_manifest.csv'),
+        '--directory', str(tmp_path)])
+    store = results_store.Open_Store(directory)
+    assert len(store['index']) == 1 and store['index']['frames'][0] == 5
+    assert os.path.getsize(os.path.join(directory, results_store.myCurveFile)) == 5*3*4
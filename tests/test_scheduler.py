@@ -0,0 +1,88 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_scheduler.py — Budgets, retries and skipped jobs of scheduler.py with standin_solver.py
+
+Run with:
+python -m pytest -q tests/test_scheduler.py
+"""
+
+import json
+import os
+import sys
+
+import scheduler
+
+#------------------------------------------------------------------------------
+
+myRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+mySolver = '"%s" "%s" {job}' % (sys.executable, os.path.join(myRoot, 'standin_solver.py'))
+# Stamp the start of every job, then run the stand-in
+myStampedSolver = ('"%s" -c "import time; open(\'{job}.start\', \'w\').write(repr(time.time()))" && '
+    % sys.executable + mySolver)
+
+#------------------------------------------------------------------------------
+
+def Write_Decks(directory, jobs):
+    for job in jobs:
+        with open(os.path.join(directory, job + '.inp'), 'w') as f:
+            f.write('*Heading\n')
+
+#------------------------------------------------------------------------------
+
+def Read_Log(directory):
+    with open(os.path.join(directory, 'scheduler_log.jsonl')) as f:
+        return [json.loads(line) for line in f]
+
+#------------------------------------------------------------------------------
+
+def test_cores_per_job_within_token_limit():
+    # 10 tokens: one 6-core job (10 tokens) beats two 1-core jobs (5 each)
+    assert scheduler.Choose_Cpus(4, 8, 1e6, 1000, 10) == 6
+    assert scheduler.Concurrent_Jobs(1, 8, 1e6, 1000, 10) == 2
+    assert scheduler.Concurrent_Jobs(1, 8, 3500, 1000, None) == 3
+
+#------------------------------------------------------------------------------
+
+def test_running_jobs_stay_inside_token_budget(tmp_path):
+    directory = str(tmp_path)
+    jobs = ['J1', 'J2', 'J3', 'J4', 'J5']
+    Write_Decks(directory, jobs)
+    status = scheduler.Run_Jobs(directory, 8, 1e6, 1000, token_limit=10, cpus_per_job=1,
+        command=myStampedSolver + ' --seconds 0.5', poll_interval=0.05)
+    assert status == dict((j, 'completed') for j in jobs)
+    spans = []
+    for job in jobs:
+        with open(os.path.join(directory, job + '.start')) as f:
+            start = float(f.read())
+        spans.append((start, os.path.getmtime(os.path.join(directory, job + '.sta'))))
+    # at most two 5-token jobs at any start, and both slots were used
+    overlaps = [sum(1 for s, e in spans if s <= start < e) for start, end in spans]
+    assert max(overlaps) == 2
+    assert [r['cpus'] for r in Read_Log(directory)] == [1]*5
+
+#------------------------------------------------------------------------------
+
+def test_failed_job_is_retried(tmp_path):
+    directory = str(tmp_path)
+    Write_Decks(directory, ['Bad'])
+    status = scheduler.Run_Jobs(directory, 2, 1e6, 1000, max_retries=2, cpus_per_job=1,
+        command=mySolver + ' --seconds 0 --fail-rate 1', poll_interval=0.05)
+    assert status == {'Bad': 'failed'}
+    assert [(r['attempt'], r['status']) for r in Read_Log(directory)] == [(1, 'retrying'), (2, 'retrying'), (3, 'failed')]
+    assert scheduler.Sta_Status(directory, 'Bad') == 'failed'
+
+#------------------------------------------------------------------------------
+
+def test_completed_jobs_are_skipped(tmp_path):
+    directory = str(tmp_path)
+    Write_Decks(directory, ['Done', 'New'])
+    with open(os.path.join(directory, 'Done.sta'), 'w') as f:
+        f.write(' SUMMARY OF JOB INFORMATION:\n %s\n' % scheduler.myStaCompleted)
+    status = scheduler.Run_Jobs(directory, 2, 1e6, 1000, cpus_per_job=1,
+        command=mySolver + ' --seconds 0', poll_interval=0.05)
+    assert status == {'Done': 'completed', 'New': 'completed'}
+    assert [r['job'] for r in Read_Log(directory)] == ['New']
+    # a second run has nothing left to do
+    assert scheduler.Run_Jobs(directory, 2, 1e6, 1000, cpus_per_job=1, command='exit 1') == status
+    assert len(Read_Log(directory)) == 1
@@ -0,0 +1,96 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_step_tuner.py — .sta/.msg parsing of step_tuner.py on synthetic files
+
+The job has a Closure step (step 1) and a Loading step (step 2); only the
+Loading step is counted.
+
+Run with:
+python -m pytest -q tests/test_step_tuner.py
+"""
+
+import json
+import os
+
+import step_tuner
+from p1_core import Default_Inputs
+from scheduler import myStaCompleted
+from sweep import Write_Sweep_Manifest
+
+#------------------------------------------------------------------------------
+
+mySta = (' SUMMARY OF JOB INFORMATION:\n'
+    ' STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF       DOF    IF\n'
+    '              DISCON ITERS ITERS  TIME/      TIME/LPF   TIME/LPF   MONITOR RIKS\n'
+    '  1     1   1     5     3     8  0.500      0.500      0.5000\n'
+    '  1     2   1     1     2     3  1.00       1.00       0.5000\n'
+    '  2     1   1U    4     6    10  1.00       0.00       0.1000\n'
+    '  2     1   2     1     3     4  1.03       0.0250     0.02500\n'
+    '  2     2   1     0     2     2  1.08       0.0750     0.05000\n')
+
+myMsg = ('                              S T E P       1     S T A T I C   A N A L Y S I S\n'
+    '     12 POINTS CHANGED FROM OPEN TO CLOSED\n'
+    ' ***WARNING: closure warning\n'
+    '                              S T E P       2     D Y N A M I C   A N A L Y S I S\n'
+    '     3 POINTS CHANGED FROM OPEN TO CLOSED\n'
+    '     2 POINTS CHANGED FROM STICKING TO SLIPPING\n'
+    '     4 SEVERE DISCONTINUITIES OCCURRED DURING THIS ITERATION.\n'
+    ' ***WARNING: loading warning\n')
+
+#------------------------------------------------------------------------------
+
+def Write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+#------------------------------------------------------------------------------
+
+def test_loading_step_statistics(tmp_path):
+    directory = str(tmp_path)
+    Write(os.path.join(directory, 'P1.sta'), mySta + '  2     3   1     0')   #last line still being written
+    Write(os.path.join(directory, 'P1.msg'), myMsg)
+    stats = step_tuner.New_Stats(step_tuner.Loading_Step({'myGapClosure': 1}))
+    new = step_tuner.Poll_Run_Stats(stats, directory, 'P1')
+    assert [(i['step'], i['increment']) for i in new] == [(2, 1), (2, 2)]
+    assert (stats['attempts'], stats['increments'], stats['cutbacks']) == (3, 2, 1)
+    assert (stats['severe_iterations'], stats['equilibrium_iterations'], stats['iterations']) == (5, 11, 16)
+    assert stats['inc_sizes'] == [0.025, 0.05] and stats['step_time'] == 0.075
+    assert stats['contact_changes'] == {'open_to_closed': 3, 'sticking_to_slipping': 2}
+    assert (stats['severe_discontinuities'], stats['warnings']) == (4, 1)
+    assert stats['status'] is None
+    # the rest of the file, read from where the last call stopped
+    with open(os.path.join(directory, 'P1.sta'), 'a') as f:
+        f.write('     1     2  1.18       0.175      0.1000\n %s\n' % myStaCompleted)
+    new = step_tuner.Poll_Run_Stats(stats, directory, 'P1')
+    assert [i['increment'] for i in new] == [3] and stats['increments'] == 3
+    assert stats['status'] == 'completed'
+
+#------------------------------------------------------------------------------
+
+def test_whole_job_without_step_filter(tmp_path):
+    directory = str(tmp_path)
+    Write(os.path.join(directory, 'P1.sta'), mySta)
+    Write(os.path.join(directory, 'P1.msg'), myMsg)
+    stats = step_tuner.New_Stats()
+    step_tuner.Poll_Run_Stats(stats, directory, 'P1')
+    assert stats['increments'] == 4 and stats['contact_changes']['open_to_closed'] == 15
+    assert stats['warnings'] == 2
+
+#------------------------------------------------------------------------------
+
+def test_record_runs(tmp_path):
+    directory = str(tmp_path)
+    row = Default_Inputs()
+    row.update({'myGapClosure': 1, 'myMaxInc': 0.05})
+    Write(os.path.join(directory, 'P1.sta'), mySta + ' %s\n' % myStaCompleted)
+    Write(os.path.join(directory, 'P1.msg'), myMsg)
+    Write_Sweep_Manifest(os.path.join(directory, 'manifest.csv'), ['P1', 'P2'], [row, row])   #P2 has not run
+    record_path = os.path.join(directory, 'solver_record.jsonl')
+    assert step_tuner.Record_Runs(os.path.join(directory, 'manifest.csv'), directory, record_path) == 1
+    with open(record_path) as f:
+        record = json.loads(f.readline())
+    assert (record['job'], record['status'], record['increments'], record['cutbacks']) == ('P1', 'completed', 2, 1)
+    assert record['inc_sizes']['min'] == 0.025 and record['inc_sizes']['max'] == 0.05
+    assert record['at_max_inc'] == 0.5
+    assert [r['job'] for r in step_tuner.Read_Step_Record(record_path)] == ['P1']
@@ -0,0 +1,52 @@
+#------------------------------------------------------------------------------
+# -*- coding: utf-8 -*-
+"""
+test_sweep.py — Parameter table reading and sweep model names of sweep.py
+
+Run with:
+python -m pytest -q tests/test_sweep.py
+"""
+
+import pytest
+
+from p1_core import Default_Inputs
+from sweep import Converged_Mesh, Geometry_Class, Read_Parameter_Table, Sweep_Model_Name
+
+#------------------------------------------------------------------------------
+
+def test_parameter_table(tmp_path):
+    path = tmp_path / 'sweep.csv'
+    path.write_text(u'name,myClearance,material\nA_1,1.5,\nB_2,,2024-T3\n')
+    rows = Read_Parameter_Table(str(path))
+    assert rows == [{'name': 'A_1', 'myClearance': 1.5}, {'name': 'B_2', 'material': '2024-T3'}]
+
+#------------------------------------------------------------------------------
+
+def test_empty_parameter_table(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text(u'')
+    with pytest.raises(ValueError, match='empty.csv'):
+        Read_Parameter_Table(str(path))
+
+#------------------------------------------------------------------------------
+
+def test_model_names():
+    assert Sweep_Model_Name('P1', 0, {}) == 'P1_00001'
+    assert Sweep_Model_Name('P1', 4, {'name': 'Run_5b'}) == 'Run_5b'
+    for bad in ('run 5', 'run-5', '../run5'):
+        with pytest.raises(ValueError, match='row 5'):
+            Sweep_Model_Name('P1', 4, {'name': bad})
+
+#------------------------------------------------------------------------------
+
+def test_converged_mesh():
+    # Seed sizes scale with the hole diameter; entries of other writers are
+    # not native_inp.py meshes and are left out
+    myInputs = Default_Inputs()
+    myArcDia = myInputs['myBoltDia'] + myInputs['myClearance']
+    entry = {'mesh_size_ratio': 0.25, 'edge_size_ratio': 0.1, 'writer': 'native'}
+    record = {Geometry_Class(myInputs): entry}
+    mesh = Converged_Mesh(record, myInputs)
+    assert abs(mesh['myMeshSize'] - 0.25*myArcDia) < 1e-12 and abs(mesh['myEdgeSize'] - 0.1*myArcDia) < 1e-12
+    assert Converged_Mesh({'other': entry}, myInputs) == {}
+    assert Converged_Mesh({Geometry_Class(myInputs): dict(entry, writer='cae')}, myInputs) == {}